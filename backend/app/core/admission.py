@@ -0,0 +1,165 @@
+import asyncio
+import math
+import threading
+import time
+from functools import lru_cache
+from starlette.responses import JSONResponse
+from app.core.config import get_settings
+
+settings = get_settings()
+
+ROUTE_CLASSES = ("upload", "auth", "admin_export", "admin_analytics", "read")
+
+# Never shed: liveness checks and metric scrapes must answer under load,
+# and event streams stay open for as long as the client is connected (they
+# would hold a slot)
+EXEMPT_PATHS = ("/health", "/metrics", "/api/admin/events")
+
+
+def route_class(method: str, path: str) -> str:
+    """Classify a request by the work it does, or None if it is not limited"""
+    if path in EXEMPT_PATHS:
+        return None
+    if path.startswith("/api/uploads") and method == "POST":
+        return "upload"
+    if path.startswith("/api/auth/") and method in ("POST", "PUT"):
+        # Login, registration and password changes all run bcrypt
+        return "auth"
+    if path.startswith("/api/admin/export/"):
+        # Streams hold their slot for the whole download
+        return "admin_export"
+    if path.startswith("/api/admin/"):
+        return "admin_analytics"
+    return "read"
+
+
+class RouteClassLimiter:
+    """Concurrency limit with a bounded wait queue for one route class"""
+
+    def __init__(self, name: str, limit: int, queue_budget_ms: float, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue_budget_ms = queue_budget_ms
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> bool:
+        """Wait for a slot for at most the queue budget; False means shed the request"""
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            self._admit(0.0)
+            return True
+
+        if self.queued >= self.max_queue:
+            with self._lock:
+                self.rejected_queue_full += 1
+            return False
+
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_budget_ms / 1000)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.rejected_timeout += 1
+            return False
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+        self._admit((time.perf_counter() - started) * 1000)
+        return True
+
+    def _admit(self, wait_ms: float):
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self.semaphore.release()
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait: one queue budget, at least 1s"""
+        return max(1, math.ceil(self.queue_budget_ms / 1000))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "queue_budget_ms": self.queue_budget_ms,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "avg_wait_ms": round(self.total_wait_ms / self.admitted, 3) if self.admitted else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+class AdmissionControlMiddleware:
+    """Per route class concurrency limits with queue-time budgets
+
+    Requests over a class's limit wait up to its queue budget for a slot and
+    are answered 503 with Retry-After when the budget runs out or the queue
+    is full, so expensive uploads and logins can't starve cheap reads.
+    """
+
+    def __init__(self, app, limiters: dict):
+        self.app = app
+        self.limiters = limiters
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters.get(route_class(scope["method"], scope["path"]))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": "Server busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+@lru_cache()
+def get_limiters() -> dict:
+    """Get this worker's limiters, one per route class"""
+    return {
+        name: RouteClassLimiter(
+            name,
+            getattr(settings, f"admission_{name}_limit"),
+            getattr(settings, f"admission_{name}_queue_ms"),
+            getattr(settings, f"admission_{name}_max_queue"),
+        ) for name in ROUTE_CLASSES
+    }
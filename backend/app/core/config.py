@@ -24,6 +24,101 @@ class Settings(BaseSettings):
     uploads_dir: str = "./uploads"
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
     
+    # Suggestion engines
+    engine_default_backend: str = "similarity"
+    engine_budget_ms: float = 50.0
+    engine_timeout_ms: float = 250.0
+    engine_breaker_failures: int = 5
+    engine_breaker_reset_seconds: float = 30.0
+    engine_workers: int = 4
+    onnx_model_path: str = ""
+    
+    # Recommendations
+    related_designs_top_n: int = 10
+    related_refresh_interval_seconds: int = 900  # 0 disables the in-app refresh
+    
+    # List endpoints whose JSON is rendered by Postgres and returned without
+    # response-model validation (comma-separated: my_uploads, upload_suggestions, admin_uploads)
+    db_json_endpoints: str = "my_uploads,upload_suggestions,admin_uploads"
+    
+    # Response compression (brotli needs the optional `brotli` package)
+    compression_minimum_size: int = 1024  # bytes; smaller bodies are sent as-is
+    compression_offload_size: int = 64 * 1024  # bytes; larger bodies compress in the threadpool
+    compression_cache_bytes: int = 4 * 1024 * 1024  # compressed bodies kept per ETag
+    
+    # Admission control, per worker: concurrent requests, how long a request
+    # may queue for a slot, and how many may queue, per route class
+    admission_upload_limit: int = 4
+    admission_upload_queue_ms: float = 2000.0
+    admission_upload_max_queue: int = 16
+    admission_auth_limit: int = 4
+    admission_auth_queue_ms: float = 1000.0
+    admission_auth_max_queue: int = 32
+    admission_admin_export_limit: int = 2
+    admission_admin_export_queue_ms: float = 1000.0
+    admission_admin_export_max_queue: int = 4
+    admission_admin_analytics_limit: int = 2
+    admission_admin_analytics_queue_ms: float = 5000.0
+    admission_admin_analytics_max_queue: int = 8
+    admission_read_limit: int = 64
+    admission_read_queue_ms: float = 500.0
+    admission_read_max_queue: int = 256
+    
+    # Search: queries up to this many characters are matched fuzzily
+    search_fuzzy_max_length: int = 4
+    
+    # Trending colors/patterns: decay half-life, weight of a save relative to a
+    # suggestion, and how often each worker folds in new rows (0 disables)
+    trending_half_life_hours: float = 72.0
+    trending_save_weight: float = 3.0
+    trending_refresh_interval_seconds: int = 30
+    
+    # Analytics sketches: how often each worker rebuilds today's and
+    # yesterday's buckets (0 disables; past days are built by jobs.py)
+    analytics_refresh_interval_seconds: int = 300
+    
+    # Admin analytics response cache, per worker: seconds a result is served
+    # as-is (0 disables), then seconds it is still served while one request
+    # recomputes it in the background
+    admin_cache_ttl_seconds: float = 30.0
+    admin_cache_stale_seconds: float = 300.0
+    
+    # Admin exports: rows fetched from the server-side cursor per streamed chunk
+    export_batch_size: int = 5000
+    
+    # Parquet analytics snapshots (need the optional `pyarrow` package):
+    # output directory, rows per server-side cursor fetch, rows per Parquet
+    # row group, snapshots kept, and how often the app writes one (0 = jobs.py only)
+    snapshot_dir: str = "./snapshots"
+    snapshot_batch_size: int = 10000
+    snapshot_row_group_size: int = 100000
+    snapshot_keep: int = 7
+    snapshot_compression: str = "zstd"
+    snapshot_interval_seconds: int = 0
+    
+    # Live admin dashboard events: milliseconds of counter deltas summed into
+    # one pushed event, seconds between keep-alive comments, and events
+    # buffered per client before it is told to resync instead
+    live_events_flush_ms: float = 250.0
+    live_events_heartbeat_seconds: float = 15.0
+    live_events_queue_size: int = 64
+    
+    # Prometheus metrics: directory shared by the worker processes (each
+    # writes its totals there every flush interval, so any worker's /metrics
+    # covers all of them; empty for a single process), and how often the
+    # event loop lag is sampled
+    metrics_dir: str = ""
+    metrics_flush_seconds: float = 1.0
+    event_loop_lag_interval_seconds: float = 0.5
+    
+    # Request tracing: fraction of requests traced (0 disables), and where
+    # their spans go: "file" (JSON lines at tracing_file) or "otlp"
+    # (OTLP/JSON posted to tracing_otlp_endpoint)
+    tracing_sample_rate: float = 0.0
+    tracing_exporter: str = "file"
+    tracing_file: str = "./traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
@@ -40,6 +135,12 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.allowed_origins.split(',') if origin.strip()]
         return self.allowed_origins if isinstance(self.allowed_origins, list) else []
 
+    
+    @property
+    def db_json_endpoints_list(self) -> List[str]:
+        """Parse comma-separated endpoint names into list"""
+        return [name.strip() for name in self.db_json_endpoints.split(',') if name.strip()]
+
 
 @lru_cache()
 def get_settings():
@@ -1,15 +1,60 @@
+import time
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from app.core.config import get_settings
+from app.core.metrics import DB_QUERY_SECONDS, sql_operation
+from app.core import tracing
 from contextlib import contextmanager
 
 settings = get_settings()
 
+# Searchable text of a suggestion row, a catalog template and an upload's notes
+# (shared by the generated tsvector columns, the trigram indexes and SearchService)
+SUGGESTION_SEARCH_TEXT = (
+    "coalesce(neck_design, '') || ' ' || coalesce(sleeve_style, '') || ' ' || "
+    "coalesce(embroidery_pattern, '') || ' ' || coalesce(color_combination, '') || ' ' || "
+    "coalesce(border_style, '')"
+)
+TEMPLATE_SEARCH_TEXT = "neck || ' ' || sleeve || ' ' || embroidery || ' ' || color || ' ' || border"
+UPLOAD_SEARCH_TEXT = "coalesce(size_info, '')"
+
+# Upload attributes counted by the rollup tables (upload_counts, upload_daily_counts)
+ROLLUP_DIMENSIONS = ("cloth_type", "occasion", "gender", "budget_range")
+
+# NOTIFY channel of committed upload and save count deltas (see dashboard_notify)
+DASHBOARD_CHANNEL = "dashboard_events"
+
+# Serializes init_db across workers starting at once (held until it commits)
+INIT_LOCK_KEY = 280043
+
+
+class _TimedExecute:
+    """Cursor mixin recording every execute in the db_query_duration_seconds metric (and a span, if traced)"""
+
+    def execute(self, query, vars=None):
+        operation = sql_operation(query)
+        started = time.perf_counter()
+        try:
+            with tracing.span("db.query", operation=operation):
+                return super().execute(query, vars)
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - started, operation)
+
+
+class TimedCursor(_TimedExecute, psycopg2.extensions.cursor):
+    pass
+
+
+class TimedRealDictCursor(_TimedExecute, RealDictCursor):
+    pass
+
+
 # Parse connection string
 def get_connection():
     """Get a database connection"""
     try:
-        conn = psycopg2.connect(settings.database_url)
+        conn = psycopg2.connect(settings.database_url, cursor_factory=TimedCursor)
         return conn
     except Exception as e:
         raise Exception(f"Failed to connect to database: {str(e)}")
@@ -20,6 +65,10 @@ def init_db():
     cursor = conn.cursor()
     
     try:
+        # Workers run this at import: the others wait here, then find the
+        # schema (and the rollup backfill decision) already committed
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", (INIT_LOCK_KEY,))
+        
         # Create users table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -78,6 +127,286 @@ def init_db():
             )
         """)
         
+        # Catalog template each suggestion was drawn from (NULL for rule-based)
+        cursor.execute("""
+            ALTER TABLE design_suggestions ADD COLUMN IF NOT EXISTS template_id VARCHAR(64)
+        """)
+        
+        # Create design_templates table (catalog mirror, synced at startup)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS design_templates (
+                id VARCHAR(64) PRIMARY KEY,
+                cloth_type VARCHAR(50) NOT NULL,
+                occasion VARCHAR(50) NOT NULL,
+                neck VARCHAR(255) NOT NULL,
+                sleeve VARCHAR(255) NOT NULL,
+                embroidery VARCHAR(255) NOT NULL,
+                color VARCHAR(255) NOT NULL,
+                border VARCHAR(255) NOT NULL
+            )
+        """)
+        
+        # Catalog-based suggestions keep their text in design_templates
+        cursor.execute("""
+            ALTER TABLE design_suggestions
+                ALTER COLUMN neck_design DROP NOT NULL,
+                ALTER COLUMN sleeve_style DROP NOT NULL,
+                ALTER COLUMN embroidery_pattern DROP NOT NULL,
+                ALTER COLUMN color_combination DROP NOT NULL,
+                ALTER COLUMN border_style DROP NOT NULL,
+                ALTER COLUMN description DROP NOT NULL
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_suggestions_upload_id ON design_suggestions(upload_id)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_uploads_user_created_at ON uploads(user_id, created_at DESC)
+        """)
+        
+        # Admin upload listing, newest first, unfiltered or filtered by one
+        # attribute (further filters are checked on the ordered index rows)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_uploads_created_at ON uploads(created_at DESC)
+        """)
+        for column in ("cloth_type", "occasion", "budget_range"):
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_uploads_{column}_created_at ON uploads({column}, created_at DESC)
+            """)
+        
+        # Keyset index for the saved designs feed (also serves user_id lookups)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_saved_designs_user_saved_at
+            ON saved_designs(user_id, saved_at DESC, id DESC)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_saved_designs_user_id")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_suggestions_user_created_at
+            ON design_suggestions(user_id, created_at DESC)
+        """)
+        # Day ranges of suggestions, read when building analytics sketches
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_suggestions_created_at ON design_suggestions(created_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_suggestions_template_id ON design_suggestions(template_id)
+        """)
+        
+        # Full-text search: rule-based suggestion text, catalog text, upload notes
+        cursor.execute(f"""
+            ALTER TABLE design_suggestions ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', {SUGGESTION_SEARCH_TEXT})) STORED
+        """)
+        cursor.execute(f"""
+            ALTER TABLE design_templates ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', {TEMPLATE_SEARCH_TEXT})) STORED
+        """)
+        cursor.execute(f"""
+            ALTER TABLE uploads ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', {UPLOAD_SEARCH_TEXT})) STORED
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_suggestions_search ON design_suggestions USING GIN (search_vector)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_design_templates_search ON design_templates USING GIN (search_vector)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_uploads_search ON uploads USING GIN (search_vector)
+        """)
+        
+        # Fuzzy matching of short queries needs pg_trgm, which may not be installable
+        cursor.execute("SAVEPOINT trigram")
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_design_suggestions_search_trgm
+                ON design_suggestions USING GIN (({SUGGESTION_SEARCH_TEXT}) gin_trgm_ops)
+            """)
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_uploads_search_trgm
+                ON uploads USING GIN (({UPLOAD_SEARCH_TEXT}) gin_trgm_ops)
+            """)
+            cursor.execute("RELEASE SAVEPOINT trigram")
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT trigram")
+            print(f"pg_trgm unavailable, short searches use prefix matching: {e}")
+        
+        # Create template_cooccurrence table (sparse item-to-item matrix over saves)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS template_cooccurrence (
+                template_a VARCHAR(64) NOT NULL,
+                template_b VARCHAR(64) NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (template_a, template_b)
+            )
+        """)
+        
+        # Create related_templates table (precomputed top-N neighbors)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS related_templates (
+                template_id VARCHAR(64) NOT NULL,
+                rank INTEGER NOT NULL,
+                related_template_id VARCHAR(64) NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (template_id, rank)
+            )
+        """)
+        
+        # Create user_preferences table (running sum of saved design styles)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+                style_vector BYTEA NOT NULL,
+                save_count INTEGER DEFAULT 0 NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW() NOT NULL
+            )
+        """)
+        
+        # Rollups of upload counts for the admin dashboard, kept current by
+        # statement-level triggers (deletes also arrive by cascade from users)
+        cursor.execute("SELECT to_regclass('upload_counts') IS NOT NULL AS exists")
+        rollups_exist = cursor.fetchone()[0]
+        dimensions = ", ".join(ROLLUP_DIMENSIONS)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS upload_counts (
+                cloth_type VARCHAR(50) NOT NULL,
+                occasion VARCHAR(50) NOT NULL,
+                gender VARCHAR(50) NOT NULL,
+                budget_range VARCHAR(50) NOT NULL,
+                count BIGINT NOT NULL,
+                PRIMARY KEY ({dimensions})
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS upload_daily_counts (
+                day DATE NOT NULL,
+                cloth_type VARCHAR(50) NOT NULL,
+                occasion VARCHAR(50) NOT NULL,
+                gender VARCHAR(50) NOT NULL,
+                budget_range VARCHAR(50) NOT NULL,
+                count BIGINT NOT NULL,
+                PRIMARY KEY (day, {dimensions})
+            )
+        """)
+        # Keys are applied in sorted order so concurrent statements lock rollup
+        # rows in the same order
+        cursor.execute(f"""
+            CREATE OR REPLACE FUNCTION uploads_rollup() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO upload_counts ({dimensions}, count)
+                    SELECT {dimensions}, COUNT(*) FROM new_rows
+                    GROUP BY {dimensions} ORDER BY {dimensions}
+                    ON CONFLICT ({dimensions}) DO UPDATE SET count = upload_counts.count + EXCLUDED.count;
+                    INSERT INTO upload_daily_counts (day, {dimensions}, count)
+                    SELECT created_at::date, {dimensions}, COUNT(*) FROM new_rows
+                    GROUP BY 1, {dimensions} ORDER BY 1, {dimensions}
+                    ON CONFLICT (day, {dimensions}) DO UPDATE SET count = upload_daily_counts.count + EXCLUDED.count;
+                ELSE
+                    INSERT INTO upload_counts ({dimensions}, count)
+                    SELECT {dimensions}, -COUNT(*) FROM old_rows
+                    GROUP BY {dimensions} ORDER BY {dimensions}
+                    ON CONFLICT ({dimensions}) DO UPDATE SET count = upload_counts.count + EXCLUDED.count;
+                    INSERT INTO upload_daily_counts (day, {dimensions}, count)
+                    SELECT created_at::date, {dimensions}, -COUNT(*) FROM old_rows
+                    GROUP BY 1, {dimensions} ORDER BY 1, {dimensions}
+                    ON CONFLICT (day, {dimensions}) DO UPDATE SET count = upload_daily_counts.count + EXCLUDED.count;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS uploads_rollup_insert ON uploads")
+        cursor.execute("""
+            CREATE TRIGGER uploads_rollup_insert AFTER INSERT ON uploads
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION uploads_rollup()
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS uploads_rollup_delete ON uploads")
+        cursor.execute("""
+            CREATE TRIGGER uploads_rollup_delete AFTER DELETE ON uploads
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION uploads_rollup()
+        """)
+        if not rollups_exist:
+            # First run on an existing database: backfill
+            cursor.execute(f"""
+                INSERT INTO upload_counts ({dimensions}, count)
+                SELECT {dimensions}, COUNT(*) FROM uploads GROUP BY {dimensions}
+            """)
+            cursor.execute(f"""
+                INSERT INTO upload_daily_counts (day, {dimensions}, count)
+                SELECT created_at::date, {dimensions}, COUNT(*) FROM uploads GROUP BY 1, {dimensions}
+            """)
+        
+        # Live dashboard: each statement that inserts or deletes uploads or
+        # saves notifies its count deltas; NOTIFY is delivered on commit only.
+        # The sequence keeps payloads distinct, since Postgres folds
+        # identical notifications within a transaction.
+        cursor.execute("CREATE SEQUENCE IF NOT EXISTS dashboard_event_seq")
+        cursor.execute(f"""
+            CREATE OR REPLACE FUNCTION dashboard_notify() RETURNS trigger AS $$
+            DECLARE
+                deltas json;
+                saves bigint;
+            BEGIN
+                IF TG_TABLE_NAME = 'uploads' THEN
+                    IF TG_OP = 'INSERT' THEN
+                        SELECT json_agg(json_build_array(cloth_type, occasion, count)) INTO deltas
+                        FROM (SELECT cloth_type, occasion, COUNT(*) AS count FROM new_rows GROUP BY 1, 2) c;
+                    ELSE
+                        SELECT json_agg(json_build_array(cloth_type, occasion, -count)) INTO deltas
+                        FROM (SELECT cloth_type, occasion, COUNT(*) AS count FROM old_rows GROUP BY 1, 2) c;
+                    END IF;
+                    IF deltas IS NOT NULL THEN
+                        PERFORM pg_notify('{DASHBOARD_CHANNEL}', json_build_object(
+                            'seq', nextval('dashboard_event_seq'), 'uploads', deltas)::text);
+                    END IF;
+                ELSE
+                    IF TG_OP = 'INSERT' THEN
+                        SELECT COUNT(*) INTO saves FROM new_rows;
+                    ELSE
+                        SELECT -COUNT(*) INTO saves FROM old_rows;
+                    END IF;
+                    IF saves <> 0 THEN
+                        PERFORM pg_notify('{DASHBOARD_CHANNEL}', json_build_object(
+                            'seq', nextval('dashboard_event_seq'), 'saves', saves)::text);
+                    END IF;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for table in ("uploads", "saved_designs"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_notify_insert ON {table}")
+            cursor.execute(f"""
+                CREATE TRIGGER {table}_notify_insert AFTER INSERT ON {table}
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify()
+            """)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_notify_delete ON {table}")
+            cursor.execute(f"""
+                CREATE TRIGGER {table}_notify_delete AFTER DELETE ON {table}
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify()
+            """)
+        
+        # Serialized analytics sketches (HyperLogLog, Count-Min + top-k) per
+        # sketch name and day or month bucket; see AnalyticsService
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_sketches (
+                name VARCHAR(32) NOT NULL,
+                period VARCHAR(8) NOT NULL,
+                bucket DATE NOT NULL,
+                sketch BYTEA NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW() NOT NULL,
+                PRIMARY KEY (name, period, bucket)
+            )
+        """)
+        
         conn.commit()
         print("Database tables initialized successfully")
     except Exception as e:
@@ -98,7 +427,7 @@ def get_db():
 @contextmanager
 def get_db_cursor(conn):
     """Context manager for database cursor"""
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = conn.cursor(cursor_factory=TimedRealDictCursor)
     try:
         yield cursor
         conn.commit()
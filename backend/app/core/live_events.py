@@ -0,0 +1,159 @@
+import asyncio
+import json
+from functools import lru_cache
+import psycopg2
+from starlette.concurrency import run_in_threadpool
+from app.core.config import get_settings
+from app.core.database import get_connection, DASHBOARD_CHANNEL
+
+settings = get_settings()
+
+
+class DashboardBroadcaster:
+    """One LISTEN connection per worker, fanned out to every connected admin
+
+    The dashboard_notify triggers send the upload (by cloth type and
+    occasion) and save count deltas of each committed statement. Deltas
+    arriving within `flush_ms` are summed into one event, which is put on
+    every subscriber's queue. A subscriber that falls `queue_size` events
+    behind, or any subscriber after the listener reconnects (notifications
+    may have been missed), gets a "resync" event and should refetch the
+    stats instead.
+    """
+
+    def __init__(self, flush_ms: float, queue_size: int, reconnect_seconds: float = 5.0):
+        self.flush_ms = flush_ms
+        self.queue_size = queue_size
+        self.reconnect_seconds = reconnect_seconds
+        self.notifications = 0
+        self.events = 0
+        self.resyncs = 0
+        self._subscribers = set()
+        self._uploads = {}
+        self._saves = 0
+        self._conn = None
+        self._fileno = None
+        self._loop = None
+        self._flush_handle = None
+        self._reconnect_task = None
+        self._stopped = False
+
+    async def start(self):
+        """Start listening on the running event loop (retries in the background if the database is down)"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        try:
+            await self._connect()
+        except Exception as e:
+            print(f"Dashboard event listener failed to connect: {e}")
+            self._schedule_reconnect()
+
+    async def stop(self):
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._disconnect()
+
+    async def _connect(self):
+        def listen():
+            conn = get_connection()
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {DASHBOARD_CHANNEL}")
+            return conn
+
+        self._conn = await run_in_threadpool(listen)
+        # Kept: fileno() raises once the connection is lost
+        self._fileno = self._conn.fileno()
+        self._loop.add_reader(self._fileno, self._on_readable)
+
+    def _disconnect(self):
+        if self._conn is not None:
+            self._loop.remove_reader(self._fileno)
+            self._conn.close()
+            self._conn = None
+
+    def _schedule_reconnect(self):
+        if not self._stopped and (self._reconnect_task is None or self._reconnect_task.done()):
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        while not self._stopped:
+            await asyncio.sleep(self.reconnect_seconds)
+            try:
+                await self._connect()
+            except Exception as e:
+                print(f"Dashboard event listener failed to reconnect: {e}")
+                continue
+            # Notifications sent while disconnected are lost
+            self._broadcast_all("resync", {})
+            return
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            print(f"Dashboard event listener lost its connection: {e}")
+            self._disconnect()
+            self._schedule_reconnect()
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            self.notifications += 1
+            payload = json.loads(notify.payload)
+            for cloth_type, occasion, count in payload.get("uploads", ()):
+                key = (cloth_type, occasion)
+                self._uploads[key] = self._uploads.get(key, 0) + count
+            self._saves += payload.get("saves", 0)
+
+        if self._flush_handle is None and (self._uploads or self._saves):
+            self._flush_handle = self._loop.call_later(self.flush_ms / 1000, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        uploads = [
+            {"cloth_type": cloth_type, "occasion": occasion, "count": count}
+            for (cloth_type, occasion), count in sorted(self._uploads.items()) if count
+        ]
+        saves, self._uploads, self._saves = self._saves, {}, 0
+        if uploads or saves:
+            self._broadcast_all("deltas", {"uploads": uploads, "saves": saves})
+
+    def _broadcast_all(self, event: str, data: dict):
+        message = (event, json.dumps(data))
+        self.events += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind to catch up from deltas: start over
+                self.resyncs += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", "{}"))
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def to_dict(self) -> dict:
+        return {
+            "listening": self._conn is not None,
+            "subscribers": len(self._subscribers),
+            "notifications": self.notifications,
+            "events": self.events,
+            "resyncs": self.resyncs,
+        }
+
+
+@lru_cache()
+def get_broadcaster() -> DashboardBroadcaster:
+    """Get this worker's dashboard event broadcaster"""
+    return DashboardBroadcaster(settings.live_events_flush_ms, settings.live_events_queue_size)
@@ -0,0 +1,322 @@
+import asyncio
+import glob
+import os
+import threading
+import time
+from bisect import bisect_left
+import orjson
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Upper bounds of the default latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the upload size histogram buckets, in bytes
+UPLOAD_SIZE_BUCKETS = (16384, 65536, 262144, 1048576, 2097152, 5242880, 10485760)
+
+# Route label of requests no route matched (keeps unknown paths out of the labels)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _Metric:
+    kind = None
+    size = 1
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: tuple):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._local = threading.local()
+
+    def _series(self, labels: tuple) -> list:
+        """This thread's value list of one labelled series"""
+        try:
+            table = self._local.table
+        except AttributeError:
+            table = self._local.table = self.registry.register_table(self)
+        series = table.get(labels)
+        if series is None:
+            series = table[labels] = [0] * self.size
+        return series
+
+
+class Counter(_Metric):
+    """Monotonic counter; inc(amount, *label values)"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, *labels):
+        self._series(labels)[0] += amount
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; observe(value, *label values)"""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name: str, help: str, labelnames: tuple, buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = buckets
+        # One count per bucket, the +Inf bucket, then the sum
+        self.size = len(buckets) + 2
+
+    def observe(self, value: float, *labels):
+        series = self._series(labels)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+
+class MetricsRegistry:
+    """Counters and histograms kept per thread, summed when scraped
+
+    Every thread updates only its own table of each metric (label values ->
+    series value list), so recording takes no lock and loses no updates; the
+    lock is only taken when a thread first records a metric. Tables of
+    threads that have exited (idle thread pool workers are retired) are
+    folded into per-process totals on the next collect(), so short-lived
+    threads don't pile up tables. With `directory` set (several
+    worker processes), each process also writes its totals to
+    <directory>/<pid>.json every `flush_seconds`, and a scrape adds up every
+    file there, so any worker answers for all of them. Files of exited
+    workers keep counting, so clear the directory when the app is deployed.
+    """
+
+    def __init__(self, directory: str = "", flush_seconds: float = 1.0):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.metrics = {}
+        # (metric name, thread ident) -> that thread's table
+        self._tables = {}
+        # Summed tables of exited threads
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._stopped = threading.Event()
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        self.metrics[name] = Counter(self, name, help, labelnames)
+        return self.metrics[name]
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        self.metrics[name] = Histogram(self, name, help, labelnames, buckets)
+        return self.metrics[name]
+
+    def register_table(self, metric: _Metric) -> dict:
+        """This thread's series table of a metric, included in collect()
+
+        A thread reusing the ident of an exited one whose table was not
+        folded in yet takes over that table.
+        """
+        key = (metric.name, threading.current_thread().ident)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = self._tables[key] = {}
+        return table
+
+    def collect(self) -> dict:
+        """{(name, labels): summed values} of this process"""
+        with self._lock:
+            # Under the lock: a thread registers after it shows up in enumerate()
+            alive = {thread.ident for thread in threading.enumerate()}
+            for key in [key for key in self._tables if key[1] not in alive]:
+                _add_table(self._retired, key[0], self._tables.pop(key))
+            totals = {key: list(values) for key, values in self._retired.items()}
+            tables = list(self._tables.items())
+        for (name, _), table in tables:
+            _add_table(totals, name, table)
+        return totals
+
+    def collect_all(self) -> dict:
+        """Totals of this process plus, with a directory, every other process's last flush"""
+        totals = self.collect()
+        if not self.directory:
+            return totals
+        own = os.path.join(self.directory, f"{os.getpid()}.json")
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    rows = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                continue
+            for name, labels, values in rows:
+                key = (name, tuple(labels))
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = values
+                elif len(total) == len(values):
+                    for i, value in enumerate(values):
+                        total[i] += value
+        return totals
+
+    def flush(self):
+        """Write this process's totals for the other workers' scrapes"""
+        rows = [[name, labels, values] for (name, labels), values in self.collect().items()]
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(orjson.dumps(rows))
+        os.replace(f"{path}.tmp", path)
+
+    def start(self):
+        """Start flushing in the background (no-op without a directory)"""
+        if not self.directory or self._flusher is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stopped.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        if self._flusher is not None:
+            self._stopped.set()
+            self._flusher.join()
+            self._flusher = None
+            self.flush()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Writing metrics failed: {e}")
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text format"""
+        by_metric = {}
+        for (name, labels), values in self.collect_all().items():
+            by_metric.setdefault(name, []).append((labels, values))
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, values in sorted(by_metric.get(name, ())):
+                pairs = [f'{label}="{_escape(value)}"' for label, value in zip(metric.labelnames, labels)]
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_labels(pairs)} {_number(values[0])}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ("+Inf",), values):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{_labels(pairs + [le])} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(values[-1])}")
+                lines.append(f"{name}_count{_labels(pairs)} {_number(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+def _add_table(totals: dict, name: str, table: dict):
+    for labels, values in list(table.items()):
+        key = (name, labels)
+        total = totals.get(key)
+        if total is None:
+            totals[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                total[i] += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: list) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY = MetricsRegistry(settings.metrics_dir, settings.metrics_flush_seconds)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requests answered, by route and status code", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency including admission queueing", ("method", "route")
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "Database statement execution time, by leading SQL keyword", ("operation",)
+)
+UPLOAD_BYTES = REGISTRY.histogram(
+    "upload_size_bytes", "Size of uploaded image files", buckets=UPLOAD_SIZE_BUCKETS
+)
+IMAGE_PROCESSING_SECONDS = REGISTRY.histogram(
+    "image_processing_duration_seconds", "Image decoding time, by step", ("step",)
+)
+ENGINE_SECONDS = REGISTRY.histogram(
+    "suggestion_engine_duration_seconds",
+    "Suggestion generation time, by requested backend and whether a catalog template or the fallback rules answered",
+    ("backend", "path")
+)
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "event_loop_lag_seconds", "How late the event loop woke a periodic timer",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+
+def sql_operation(query) -> str:
+    """Leading keyword of a statement (SELECT, INSERT, WITH, ...), for the operation label"""
+    if isinstance(query, bytes):
+        query = query.decode(errors="replace")
+    elif not isinstance(query, str):
+        # psycopg2.sql.Composed and friends
+        return "COMPOSED"
+    words = query[:32].split(None, 1)
+    return words[0].upper() if words else ""
+
+
+class MetricsMiddleware:
+    """Per-route request counts by status and latency histograms
+
+    Requests are labelled by the matched route's path template (the router
+    leaves the endpoint in the scope), never by the raw path.
+    """
+
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+        self._routes = None
+
+    def _route(self, scope) -> str:
+        if self._routes is None:
+            # Built on first use: every route is registered by then
+            self._routes = {}
+            for route in self.router.routes:
+                self._routes.setdefault(getattr(route, "endpoint", None) or getattr(route, "app", None), route.path)
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route(scope)
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], route)
+            HTTP_REQUESTS.inc(1, scope["method"], route, status)
+
+
+async def monitor_event_loop(interval: float):
+    """Record how late the loop wakes from a sleep of `interval`, forever"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(loop.time() - started - interval, 0.0))
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from app.core.config import get_settings
+from app.core.database import get_connection
+
+settings = get_settings()
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until", "refreshing")
+
+    def __init__(self, value, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class _Flight:
+    """One in-progress computation that concurrent misses wait on"""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlightCache:
+    """Per-worker TTL cache of computed results with stale-while-revalidate
+
+    A fresh entry (younger than `ttl`) is served as-is. An entry up to
+    `stale` seconds past its TTL is still served, while one background
+    thread recomputes it on its own connection. On a miss, the first caller
+    computes with its connection and concurrent callers for the same key
+    wait for that result instead of running the same queries again.
+    compute(conn) must return a value callers treat as read-only.
+    """
+
+    def __init__(self, ttl: float, stale: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.stale = stale
+        self.maxsize = maxsize
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.computations = 0
+        self.total_compute_ms = 0.0
+        self.max_compute_ms = 0.0
+        self._items = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, compute, conn) -> tuple:
+        """(value, "hit" | "stale" | "miss" | "coalesced") for key, computing it if needed"""
+        if self.ttl <= 0:
+            return compute(conn), "miss"
+
+        with self._lock:
+            now = time.monotonic()
+            entry = self._items.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._items.move_to_end(key)
+                if now < entry.fresh_until:
+                    self.hits += 1
+                    return entry.value, "hit"
+                self.stale_hits += 1
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    threading.Thread(target=self._revalidate, args=(key, compute), daemon=True).start()
+                return entry.value, "stale"
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "coalesced"
+
+        try:
+            flight.value = self._compute(key, compute, conn)
+            return flight.value, "miss"
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _compute(self, key, compute, conn):
+        started = time.perf_counter()
+        try:
+            value = compute(conn)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.computations += 1
+            self.total_compute_ms += elapsed_ms
+            self.max_compute_ms = max(self.max_compute_ms, elapsed_ms)
+            now = time.monotonic()
+            self._items[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def _revalidate(self, key, compute):
+        """Recompute a stale entry in the background; on failure the stale value stays until it expires"""
+        try:
+            conn = get_connection()
+            try:
+                self._compute(key, compute, conn)
+            finally:
+                conn.close()
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            print(f"Revalidating cached {key} failed: {e}")
+            with self._lock:
+                entry = self._items.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.stale_hits + self.misses + self.coalesced
+            return {
+                "ttl_seconds": self.ttl,
+                "stale_seconds": self.stale,
+                "entries": len(self._items),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round((self.hits + self.stale_hits + self.coalesced) / requests, 4) if requests else 0.0,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "computations": self.computations,
+                "avg_compute_ms": round(self.total_compute_ms / self.computations, 3) if self.computations else 0.0,
+                "max_compute_ms": round(self.max_compute_ms, 3),
+            }
+
+
+@lru_cache()
+def get_analytics_cache() -> SingleFlightCache:
+    """Get this worker's cache of admin analytics responses"""
+    return SingleFlightCache(settings.admin_cache_ttl_seconds, settings.admin_cache_stale_seconds)
@@ -0,0 +1,32 @@
+import asyncio
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_connection
+
+_tasks = []
+
+
+async def _run_periodically(name: str, interval: int, job):
+    """Run a blocking job(conn) every interval seconds in the thread pool"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            conn = await run_in_threadpool(get_connection)
+            try:
+                await run_in_threadpool(job, conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Background job {name} failed: {e}")
+
+
+def schedule(name: str, interval: int, job):
+    """Schedule a periodic database job on the running event loop (interval <= 0 disables it)"""
+    if interval > 0:
+        _tasks.append(asyncio.get_running_loop().create_task(_run_periodically(name, interval, job)))
+
+
+def cancel_all():
+    """Cancel all scheduled jobs"""
+    for task in _tasks:
+        task.cancel()
+    _tasks.clear()
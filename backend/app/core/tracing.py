@@ -0,0 +1,282 @@
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from functools import lru_cache, partial
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Spans waiting for the export thread; beyond this, finished traces are dropped
+EXPORT_QUEUE_SIZE = 1000
+
+# Spans sent per file write or collector request
+EXPORT_BATCH_SIZE = 256
+
+# Innermost open span of this context, or None outside sampled traces.
+# run_in_threadpool copies it into the worker thread; other executors need
+# propagate() to carry it across
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str, attributes: dict):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = None
+        self._token = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.trace.finish(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """The spans of one sampled request, exported together when the root ends"""
+
+    __slots__ = ("trace_id", "root", "spans", "exporter")
+
+    def __init__(self, exporter: "SpanExporter"):
+        self.trace_id = os.urandom(16).hex()
+        self.root = None
+        self.spans = []
+        self.exporter = exporter
+
+    def finish(self, span: Span):
+        if self.root is None:
+            # A span outliving its root (an engine call past its timeout)
+            self.exporter.submit([span])
+            return
+        self.spans.append(span)
+        if span is self.root:
+            self.root = None
+            self.exporter.submit(self.spans)
+
+
+class _NoopSpan:
+    """Stands in for a span outside sampled traces, at the cost of a context variable read"""
+
+    __slots__ = ()
+
+    def set(self, key: str, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """Context manager timing `name` as a child of the current span, if the request is traced"""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def start_trace(name: str, **attributes) -> Span:
+    """Root span of a new trace, exported when it ends"""
+    trace = Trace(get_exporter())
+    trace.root = Span(trace, name, None, attributes)
+    return trace.root
+
+
+def propagate(fn):
+    """fn bound to a copy of the caller's context, for executor.submit (as-is when not traced)"""
+    if _current_span.get() is None:
+        return fn
+    return partial(contextvars.copy_context().run, fn)
+
+
+class SpanExporter:
+    """Writes finished spans from a background thread, never from a request
+
+    "file" appends one JSON span per line to `path`; "otlp" posts OTLP/JSON
+    batches to a collector's /v1/traces `endpoint`. When the queue is full
+    the spans are dropped and counted rather than slowing requests down.
+    """
+
+    def __init__(self, kind: str, path: str, endpoint: str, service_name: str = "boutique-api"):
+        if kind not in ("file", "otlp"):
+            raise ValueError(f"Unknown tracing exporter: {kind}")
+        self.kind = kind
+        self.path = path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.exported = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(EXPORT_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: list):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until every span submitted so far has been written"""
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = []
+            waiters = []
+            item = self._queue.get()
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.extend(item)
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._export([span.to_dict() for span in batch])
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Exporting {len(batch)} spans failed: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _export(self, spans: list):
+        if self.kind == "file":
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(span) + "\n" for span in spans))
+            return
+
+        body = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": [_otlp_span(span) for span in spans]}],
+        }]}).encode()
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+    def to_dict(self) -> dict:
+        return {
+            "exporter": self.kind,
+            "queued": self._queue.qsize(),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(span: dict) -> dict:
+    otlp = {
+        "traceId": span["trace_id"],
+        "spanId": span["span_id"],
+        "name": span["name"],
+        "kind": 1,
+        "startTimeUnixNano": str(span["start_time_unix_nano"]),
+        "endTimeUnixNano": str(span["end_time_unix_nano"]),
+        "attributes": [_otlp_attribute(key, value) for key, value in span["attributes"].items()],
+        # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+        "status": {"code": 2, "message": span["error"]} if span["error"] else {},
+    }
+    if span["parent_span_id"]:
+        otlp["parentSpanId"] = span["parent_span_id"]
+    return otlp
+
+
+@lru_cache()
+def get_exporter() -> SpanExporter:
+    """Get this worker's span exporter (started on the first sampled trace)"""
+    return SpanExporter(settings.tracing_exporter, settings.tracing_file, settings.tracing_otlp_endpoint)
+
+
+class TracingMiddleware:
+    """Starts a trace for a `sample_rate` fraction of requests
+
+    The root span is named after the method and path; spans opened further
+    down (span()) become its children.
+    """
+
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        root = start_trace(f"{scope['method']} {scope['path']}", **{"http.method": scope["method"]})
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with root:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                root.set("http.status_code", status)
@@ -7,7 +7,7 @@ class DesignSuggestion:
     def __init__(self, id=None, upload_id=None, user_id=None, neck_design=None,
                  sleeve_style=None, embroidery_pattern=None, color_combination=None,
                  border_style=None, description=None, confidence_score="High",
-                 created_at=None):
+                 created_at=None, template_id=None):
         self.id = id
         self.upload_id = upload_id
         self.user_id = user_id
@@ -18,6 +18,7 @@ class DesignSuggestion:
         self.border_style = border_style
         self.description = description
         self.confidence_score = confidence_score
+        self.template_id = template_id
         self.created_at = created_at or datetime.utcnow()
     
     def __repr__(self):
@@ -36,5 +37,6 @@ class DesignSuggestion:
             'border_style': self.border_style,
             'description': self.description,
             'confidence_score': self.confidence_score,
+            'template_id': self.template_id,
             'created_at': self.created_at
         }
@@ -1,65 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.core.database import get_db, get_db_cursor
-from app.schemas.upload import UploadListResponse
-from app.utils.dependencies import get_admin_user
+import asyncio
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from app.core.config import get_settings
+from app.core.database import get_db, get_db_cursor, get_connection
+from app.schemas.upload import UploadListResponse, UploadFilters
+from app.utils.dependencies import get_admin_user, get_streaming_admin_user, get_upload_filters
+from app.utils.responses import trusted_response
 from app.services.upload_service import UploadService
 from app.models.upload import ClothType, Occasion
+from app.services.engine_registry import get_engine_registry
+from app.core.admission import get_limiters
+from app.core.response_cache import get_analytics_cache
+from app.core.live_events import get_broadcaster
+from app.schemas.design_suggestion import SearchResultResponse
+from app.services.search_service import SearchService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.rollup_service import RollupService
+from app.services.trending_service import get_trend_tracker
+from app.services.analytics_service import AnalyticsService
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
+settings = get_settings()
 
 
-@router.get("/dashboard/stats")
-def get_dashboard_stats(
-    db = Depends(get_db),
-    current_admin = Depends(get_admin_user)
-):
-    """Get admin dashboard statistics"""
-    
-    total_uploads = UploadService.get_uploads_count(db)
-    
-    # Most popular cloth types
-    with get_db_cursor(db) as cursor:
-        cursor.execute(
-            "SELECT cloth_type, COUNT(*) as count FROM uploads GROUP BY cloth_type ORDER BY count DESC"
-        )
-        cloth_stats = cursor.fetchall()
-    
-    # Most requested occasions
-    with get_db_cursor(db) as cursor:
-        cursor.execute(
-            "SELECT occasion, COUNT(*) as count FROM uploads GROUP BY occasion ORDER BY count DESC"
-        )
-        occasion_stats = cursor.fetchall()
-    
+def _dashboard_stats(conn, days: int) -> dict:
     return {
-        "total_uploads": total_uploads,
+        "total_uploads": RollupService.get_total(conn),
         "cloth_types": [
-            {"type": stat['cloth_type'], "count": stat['count']} for stat in cloth_stats
+            {"type": value, "count": count} for value, count in RollupService.get_counts_by(conn, "cloth_type")
         ],
         "occasions": [
-            {"occasion": stat['occasion'], "count": stat['count']} for stat in occasion_stats
+            {"occasion": value, "count": count} for value, count in RollupService.get_counts_by(conn, "occasion")
+        ],
+        "genders": [
+            {"gender": value, "count": count} for value, count in RollupService.get_counts_by(conn, "gender")
+        ],
+        "budget_ranges": [
+            {"budget_range": value, "count": count} for value, count in RollupService.get_counts_by(conn, "budget_range")
+        ],
+        "daily_uploads": [
+            {"day": day, "count": count} for day, count in RollupService.get_daily(conn, days)
         ]
     }
 
 
+@router.get("/dashboard/stats")
+def get_dashboard_stats(
+    response: Response,
+    days: int = Query(30, ge=1, le=366),
+    fresh: bool = False,
+    db = Depends(get_db),
+    current_admin = Depends(get_admin_user)
+):
+    """Get admin dashboard statistics (from the upload rollups, cached; X-Cache tells how it was served)
+
+    `fresh` skips the cache: live event deltas are added to these counts, so
+    the dashboard loads them uncached when it (re)subscribes.
+    """
+    if fresh:
+        response.headers["X-Cache"] = "bypass"
+        return _dashboard_stats(db, days)
+    stats, outcome = get_analytics_cache().get(("stats", days), lambda conn: _dashboard_stats(conn, days), db)
+    response.headers["X-Cache"] = outcome
+    return stats
+
+
 @router.get("/uploads", response_model=list[UploadListResponse])
 def get_all_uploads(
     skip: int = 0,
     limit: int = 10,
+    filters: UploadFilters = Depends(get_upload_filters),
     db = Depends(get_db),
     current_admin = Depends(get_admin_user)
 ):
-    """Get all uploads (admin)"""
-    uploads = UploadService.get_all_uploads(db, skip, limit)
-    return [
+    """Get all uploads (admin), optionally filtered by cloth type, occasion, budget and date range"""
+    if "admin_uploads" in settings.db_json_endpoints_list:
+        return Response(
+            UploadService.get_all_uploads_json(db, skip, limit, filters),
+            media_type="application/json"
+        )
+    
+    uploads = UploadService.get_all_uploads(db, skip, limit, filters)
+    return trusted_response([
         {
             "id": u.id,
             "cloth_type": u.cloth_type,
             "occasion": u.occasion,
             "created_at": u.created_at,
-            "file_path": u.file_path
+            "file_path": u.file_path,
+            "user_id": u.user_id
         } for u in uploads
-    ]
+    ])
 
 
 @router.get("/uploads/by-type/{cloth_type}")
@@ -91,34 +124,208 @@ def get_uploads_by_type(
         raise HTTPException(status_code=400, detail="Invalid cloth type")
 
 
-@router.get("/trending")
-def get_trending_data(
-    db = Depends(get_db),
+def _export_response(name: str, query: str, params: tuple, columns: tuple, format: str) -> StreamingResponse:
+    """Stream an export as a download, on its own connection held for the whole stream"""
+    def body():
+        conn = get_connection()
+        try:
+            yield from ExportService.stream(conn, query, params, columns, format)
+        finally:
+            conn.close()
+    
+    filename = f"{name}-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/export/uploads")
+def export_uploads(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: UploadFilters = Depends(get_upload_filters),
     current_admin = Depends(get_admin_user)
 ):
-    """Get trending colors, patterns, and designs"""
-    
-    # Most popular cloth types
-    with get_db_cursor(db) as cursor:
-        cursor.execute(
-            "SELECT cloth_type, COUNT(*) as count FROM uploads GROUP BY cloth_type ORDER BY count DESC LIMIT 5"
-        )
-        top_cloths = cursor.fetchall()
+    """Download every upload (optionally filtered) as NDJSON or CSV, streamed"""
+    return _export_response("uploads", *ExportService.uploads_query(filters), format)
+
+
+@router.get("/export/suggestions")
+def export_suggestions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_admin = Depends(get_admin_user)
+):
+    """Download every design suggestion as NDJSON or CSV, streamed"""
+    return _export_response("suggestions", *ExportService.suggestions_query(), format)
+
+
+def _trending_data(conn, limit: int) -> dict:
+    top_cloths = RollupService.get_counts_by(conn, "cloth_type", limit=5)
+    top_occasions = RollupService.get_counts_by(conn, "occasion", limit=5)
     
-    # Most popular occasions
-    with get_db_cursor(db) as cursor:
-        cursor.execute(
-            "SELECT occasion, COUNT(*) as count FROM uploads GROUP BY occasion ORDER BY count DESC LIMIT 5"
-        )
-        top_occasions = cursor.fetchall()
+    tracker = get_trend_tracker()
+    if tracker.refreshed_at is None:
+        tracker.refresh(conn)
     
     return {
         "trending_cloths": [
-            {"cloth_type": cloth['cloth_type'], "count": cloth['count']} for cloth in top_cloths
+            {"cloth_type": value, "count": count} for value, count in top_cloths
         ],
         "trending_occasions": [
-            {"occasion": occ['occasion'], "count": occ['count']} for occ in top_occasions
+            {"occasion": value, "count": count} for value, count in top_occasions
         ],
-        "trending_colors": ["Gold", "Royal Blue", "Maroon", "Emerald Green", "Pink"],
-        "trending_patterns": ["Zari", "Block Print", "Mirror Work", "Embroidery", "Geometric"]
+        "trending_colors": [color for color, _ in tracker.top_colors(limit)],
+        "trending_patterns": [pattern for pattern, _ in tracker.top_patterns(limit)]
     }
+
+
+@router.get("/trending")
+def get_trending_data(
+    response: Response,
+    limit: int = Query(5, ge=1, le=20),
+    db = Depends(get_db),
+    current_admin = Depends(get_admin_user)
+):
+    """Get trending cloth types, occasions, colors and patterns (cached; X-Cache tells how it was served)"""
+    trending, outcome = get_analytics_cache().get(("trending", limit), lambda conn: _trending_data(conn, limit), db)
+    response.headers["X-Cache"] = outcome
+    return trending
+
+
+def _analytics_range(start: date, end: date) -> tuple:
+    """(start, end) defaulting to the last 30 days ending today"""
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start, end
+
+
+@router.get("/analytics/uploaders")
+def get_distinct_uploaders(
+    start: date = None,
+    end: date = None,
+    daily: bool = False,
+    db = Depends(get_db),
+    current_admin = Depends(get_admin_user)
+):
+    """Get estimated distinct uploaders over a date range, and per day if `daily` (HyperLogLog, ~2% error)"""
+    start, end = _analytics_range(start, end)
+    total, days = AnalyticsService.distinct_uploaders(db, start, end, daily)
+    result = {"start": start, "end": end, "distinct_uploaders": total}
+    if daily:
+        result["daily"] = [{"day": day, "distinct_uploaders": count} for day, count in days]
+    return result
+
+
+@router.get("/analytics/heavy-hitters")
+def get_heavy_hitters(
+    start: date = None,
+    end: date = None,
+    k: int = Query(10, ge=1, le=20),
+    db = Depends(get_db),
+    current_admin = Depends(get_admin_user)
+):
+    """Get the most suggested colors and patterns over a date range (Count-Min estimates, never under)"""
+    start, end = _analytics_range(start, end)
+    return {
+        "start": start,
+        "end": end,
+        "colors": [
+            {"color": label, "count": count}
+            for label, count in AnalyticsService.heavy_hitters(db, "colors", start, end, k)
+        ],
+        "patterns": [
+            {"pattern": label, "count": count}
+            for label, count in AnalyticsService.heavy_hitters(db, "patterns", start, end, k)
+        ]
+    }
+
+
+@router.get("/engines")
+def get_engine_metrics(current_admin = Depends(get_admin_user)):
+    """Get suggestion engine backends with timing metrics and breaker state"""
+    return get_engine_registry().metrics()
+
+
+@router.get("/admission")
+def get_admission_metrics(current_admin = Depends(get_admin_user)):
+    """Get per route class queue depth, wait time and shed counts (this worker)"""
+    return {name: limiter.to_dict() for name, limiter in get_limiters().items()}
+
+
+@router.get("/cache")
+def get_cache_metrics(current_admin = Depends(get_admin_user)):
+    """Get the admin analytics cache hit ratio and recompute times (this worker)"""
+    return get_analytics_cache().to_dict()
+
+
+@router.get("/events")
+async def stream_dashboard_events(current_admin = Depends(get_streaming_admin_user)):
+    """Stream dashboard counter deltas as server-sent events
+
+    A "deltas" event carries {"uploads": [{"cloth_type", "occasion", "count"}],
+    "saves": n} (counts may be negative after deletes) to add to the stats
+    loaded from /dashboard/stats?fresh=true. On "resync" the client has
+    missed events and should reload them; one is sent as soon as the stream
+    is subscribed, so the stats the deltas apply to are loaded after it.
+    """
+    broadcaster = get_broadcaster()
+
+    async def body():
+        queue = broadcaster.subscribe()
+        try:
+            yield "retry: 5000\n\nevent: resync\ndata: {}\n\n"
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), settings.live_events_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event}\ndata: {data}\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/search", response_model=list[SearchResultResponse])
+def search_suggestions(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    db = Depends(get_db),
+    current_admin = Depends(get_admin_user)
+):
+    """Search all suggestions by keyword, best match first (next page cursor in X-Next-Cursor)"""
+    before = decode_cursor(cursor, float, int) if cursor else None
+    results = SearchService.search(db, q, None, limit, before)
+    
+    headers = {}
+    if len(results) == limit:
+        last, rank = results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(rank, last.id)
+    
+    return trusted_response([
+        {
+            "id": s.id,
+            "upload_id": s.upload_id,
+            "user_id": s.user_id,
+            "neck_design": s.neck_design,
+            "sleeve_style": s.sleeve_style,
+            "embroidery_pattern": s.embroidery_pattern,
+            "color_combination": s.color_combination,
+            "border_style": s.border_style,
+            "description": s.description,
+            "confidence_score": s.confidence_score,
+            "template_id": s.template_id,
+            "created_at": s.created_at,
+            "rank": rank
+        } for s, rank in results
+    ], headers=headers)
@@ -4,6 +4,7 @@ from app.schemas.user import UserCreate, UserResponse, Token, UserUpdate
 from app.services.auth_service import AuthService
 from app.models.user import UserRole
 from app.utils.dependencies import get_current_user
+from app.utils.responses import trusted_response
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
@@ -78,7 +79,7 @@ def login(email: str, password: str, db = Depends(get_db)):
 @router.get("/me", response_model=UserResponse)
 def get_me(current_user = Depends(get_current_user)):
     """Get current user info"""
-    return {
+    return trusted_response({
         "id": current_user.id,
         "email": current_user.email,
         "username": current_user.username,
@@ -87,7 +88,7 @@ def get_me(current_user = Depends(get_current_user)):
         "is_active": current_user.is_active,
         "created_at": current_user.created_at,
         "updated_at": current_user.updated_at
-    }
+    })
 
 
 @router.put("/me", response_model=UserResponse)
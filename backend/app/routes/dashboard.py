@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.database import get_db
+from app.schemas.dashboard import DashboardResponse
+from app.services.dashboard_service import DashboardService
+from app.utils.dependencies import get_current_user
+from app.utils.responses import trusted_response
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    uploads_limit: int = Query(10, ge=1, le=50),
+    db = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get everything the user dashboard needs on first load
+    
+    Replaces /auth/me + /uploads/my-uploads + per-upload /suggestions +
+    /saved/list with one request that runs two queries (auth and uploads).
+    """
+    recent = DashboardService.get_recent_uploads(db, current_user.id, uploads_limit)
+    
+    return trusted_response({
+        "user": {
+            "id": current_user.id,
+            "email": current_user.email,
+            "username": current_user.username,
+            "role": current_user.role,
+            "full_name": current_user.full_name,
+            "is_active": current_user.is_active,
+            "created_at": current_user.created_at,
+            "updated_at": current_user.updated_at
+        },
+        "uploads": [
+            {
+                "id": upload.id,
+                "user_id": upload.user_id,
+                "file_path": upload.file_path,
+                "cloth_type": upload.cloth_type,
+                "occasion": upload.occasion,
+                "gender": upload.gender,
+                "age_group": upload.age_group,
+                "budget_range": upload.budget_range,
+                "size_info": upload.size_info,
+                "created_at": upload.created_at,
+                "latest_suggestion": {
+                    "id": suggestion.id,
+                    "upload_id": suggestion.upload_id,
+                    "user_id": suggestion.user_id,
+                    "neck_design": suggestion.neck_design,
+                    "sleeve_style": suggestion.sleeve_style,
+                    "embroidery_pattern": suggestion.embroidery_pattern,
+                    "color_combination": suggestion.color_combination,
+                    "border_style": suggestion.border_style,
+                    "description": suggestion.description,
+                    "confidence_score": suggestion.confidence_score,
+                    "template_id": suggestion.template_id,
+                    "created_at": suggestion.created_at
+                } if suggestion else None,
+                "saved_design_id": saved_design_id
+            } for upload, suggestion, saved_design_id in recent
+        ]
+    })
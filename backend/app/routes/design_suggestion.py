@@ -1,28 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from app.core.database import get_db
-from app.schemas.design_suggestion import DesignSuggestionResponse, SavedDesignResponse
+from app.schemas.design_suggestion import (
+    DesignSuggestionResponse, SavedDesignResponse, SavedDesignFeedResponse, RelatedDesignResponse,
+    SearchResultResponse
+)
 from app.services.upload_service import SavedDesignService, DesignSuggestionService
+from app.services.recommendation_service import RecommendationService
+from app.services.search_service import SearchService
+from app.models.user import UserRole
 from app.utils.dependencies import get_current_user
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.responses import trusted_response
+from app.utils.etag import cache_headers, is_not_modified, not_modified
 
 router = APIRouter(prefix="/api/design-suggestions", tags=["Design Suggestions"])
 
 
+@router.get("/search", response_model=list[SearchResultResponse])
+def search_suggestions(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    db = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Search the user's suggestions by keyword ("zari", "mirror work", "pastel"), best match first
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to get the next page.
+    """
+    before = decode_cursor(cursor, float, int) if cursor else None
+    results = SearchService.search(db, q, current_user.id, limit, before)
+    
+    headers = {}
+    if len(results) == limit:
+        last, rank = results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(rank, last.id)
+    
+    return trusted_response([
+        {
+            "id": s.id,
+            "upload_id": s.upload_id,
+            "user_id": s.user_id,
+            "neck_design": s.neck_design,
+            "sleeve_style": s.sleeve_style,
+            "embroidery_pattern": s.embroidery_pattern,
+            "color_combination": s.color_combination,
+            "border_style": s.border_style,
+            "description": s.description,
+            "confidence_score": s.confidence_score,
+            "template_id": s.template_id,
+            "created_at": s.created_at,
+            "rank": rank
+        } for s, rank in results
+    ], headers=headers)
+
+
 @router.get("/{suggestion_id}", response_model=DesignSuggestionResponse)
 def get_suggestion(
     suggestion_id: int,
+    request: Request,
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get design suggestion by ID"""
-    suggestion = DesignSuggestionService.get_suggestion_by_id(db, suggestion_id)
+    stamp = DesignSuggestionService.cached_suggestion_stamp(suggestion_id, current_user.id)
+    if stamp and is_not_modified(request, *stamp):
+        return not_modified(cache_headers(*stamp))
+    
+    suggestion = DesignSuggestionService.get_user_suggestion(db, suggestion_id, current_user.id)
     
     if not suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     
-    if suggestion.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    etag, last_modified = DesignSuggestionService.suggestion_stamp(suggestion)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
     
-    return {
+    return trusted_response({
         "id": suggestion.id,
         "upload_id": suggestion.upload_id,
         "user_id": suggestion.user_id,
@@ -33,8 +89,25 @@ def get_suggestion(
         "border_style": suggestion.border_style,
         "description": suggestion.description,
         "confidence_score": suggestion.confidence_score,
+        "template_id": suggestion.template_id,
         "created_at": suggestion.created_at
-    }
+    }, headers=headers)
+
+
+@router.get("/{suggestion_id}/related", response_model=list[RelatedDesignResponse])
+def get_related_designs(
+    suggestion_id: int,
+    db = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get designs that users who saved this design also saved (404 for someone else's, like a missing one)"""
+    owner_id = None if current_user.role == UserRole.ADMIN.value else current_user.id
+    related = RecommendationService.get_related(db, suggestion_id, owner_id)
+    
+    if related is None:
+        raise HTTPException(status_code=404, detail="Suggestion not found")
+    
+    return trusted_response(related)
 
 
 @router.post("/{suggestion_id}/save", response_model=SavedDesignResponse, status_code=status.HTTP_201_CREATED)
@@ -44,48 +117,67 @@ def save_design(
     current_user = Depends(get_current_user)
 ):
     """Save a design suggestion"""
-    try:
-        saved = SavedDesignService.save_design(db, current_user.id, suggestion_id)
-        if saved:
-            return {
-                "id": saved.id,
-                "user_id": saved.user_id,
-                "design_suggestion_id": saved.design_suggestion_id,
-                "saved_at": saved.saved_at
-            }
-        raise ValueError("Failed to save design")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    saved = SavedDesignService.save_design(db, current_user.id, suggestion_id)
+    
+    if not saved:
+        raise HTTPException(status_code=404, detail="Suggestion not found")
+    
+    return {
+        "id": saved.id,
+        "user_id": saved.user_id,
+        "design_suggestion_id": saved.design_suggestion_id,
+        "saved_at": saved.saved_at
+    }
 
 
-@router.get("/saved/list", response_model=list[DesignSuggestionResponse])
+@router.get("/saved/list", response_model=list[SavedDesignFeedResponse])
 def get_saved_designs(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get user's saved designs"""
-    saved_designs = SavedDesignService.get_user_saved_designs(db, current_user.id)
+    """Get user's saved designs, newest first
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to get the next page.
+    """
+    before = decode_cursor(cursor, datetime, int) if cursor else None
+    feed = SavedDesignService.get_saved_feed(db, current_user.id, limit, before)
     
-    # Get the actual design suggestions
-    suggestions = []
-    for saved in saved_designs:
-        suggestion = DesignSuggestionService.get_suggestion_by_id(db, saved.design_suggestion_id)
-        if suggestion:
-            suggestions.append({
-                "id": suggestion.id,
-                "upload_id": suggestion.upload_id,
-                "user_id": suggestion.user_id,
-                "neck_design": suggestion.neck_design,
-                "sleeve_style": suggestion.sleeve_style,
-                "embroidery_pattern": suggestion.embroidery_pattern,
-                "color_combination": suggestion.color_combination,
-                "border_style": suggestion.border_style,
-                "description": suggestion.description,
-                "confidence_score": suggestion.confidence_score,
-                "created_at": suggestion.created_at
-            })
+    headers = {}
+    if len(feed) == limit:
+        last_saved = feed[-1][0]
+        headers["X-Next-Cursor"] = encode_cursor(last_saved.saved_at, last_saved.id)
     
-    return suggestions
+    return trusted_response([
+        {
+            "id": suggestion.id,
+            "upload_id": suggestion.upload_id,
+            "user_id": suggestion.user_id,
+            "neck_design": suggestion.neck_design,
+            "sleeve_style": suggestion.sleeve_style,
+            "embroidery_pattern": suggestion.embroidery_pattern,
+            "color_combination": suggestion.color_combination,
+            "border_style": suggestion.border_style,
+            "description": suggestion.description,
+            "confidence_score": suggestion.confidence_score,
+            "template_id": suggestion.template_id,
+            "created_at": suggestion.created_at,
+            "saved_design_id": saved.id,
+            "saved_at": saved.saved_at,
+            "upload": {
+                "id": upload.id,
+                "file_path": upload.file_path,
+                "cloth_type": upload.cloth_type,
+                "occasion": upload.occasion,
+                "gender": upload.gender,
+                "age_group": upload.age_group,
+                "budget_range": upload.budget_range,
+                "size_info": upload.size_info,
+                "created_at": upload.created_at
+            }
+        } for saved, suggestion, upload in feed
+    ], headers=headers)
 
 
 @router.delete("/{saved_design_id}/save", status_code=status.HTTP_204_NO_CONTENT)
@@ -95,4 +187,5 @@ def unsave_design(
     current_user = Depends(get_current_user)
 ):
     """Unsave a design suggestion"""
-    SavedDesignService.unsave_design(db, saved_design_id)
+    if not SavedDesignService.unsave_design(db, saved_design_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Saved design not found")
@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Request, Response, status
+from app.core.config import get_settings
 from app.core.database import get_db
-from app.schemas.upload import UploadCreate, UploadResponse, UploadListResponse
+from app.core import tracing
+from app.schemas.upload import UploadCreate, UploadResponse, UploadListResponse, UploadFilters
 from app.schemas.design_suggestion import DesignSuggestionResponse
 from app.services.upload_service import UploadService, DesignSuggestionService
-from app.services.design_suggestion_service import DesignSuggestionEngine
+from app.services.engine_registry import get_engine_registry
+from app.services.preference_service import PreferenceService
 from app.utils.file_handler import save_upload_file, get_file_url
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_upload_filters
+from app.utils.responses import trusted_response
+from app.utils.etag import cache_headers, is_not_modified, not_modified
 from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
 
 router = APIRouter(prefix="/api/uploads", tags=["Uploads"])
+settings = get_settings()
 
 
 @router.post("", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
@@ -20,13 +26,19 @@ async def create_upload(
     age_group: AgeGroup = Form(...),
     budget_range: BudgetRange = Form(...),
     fabric_description: str = Form(None),
+    engine: str = Form(None),
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Upload cloth image and create upload record"""
     
+    registry = get_engine_registry()
+    if engine and engine not in registry.names():
+        raise HTTPException(status_code=400, detail=f"Unknown engine. Available: {', '.join(registry.names())}")
+    
     # Save file
-    filepath = await save_upload_file(file, current_user.id)
+    with tracing.span("save_upload_file"):
+        filepath = await save_upload_file(file, current_user.id)
     
     # Create upload
     upload_data = UploadCreate(
@@ -35,14 +47,19 @@ async def create_upload(
         gender=gender.value if hasattr(gender, 'value') else gender,
         age_group=age_group.value if hasattr(age_group, 'value') else age_group,
         budget_range=budget_range.value if hasattr(budget_range, 'value') else budget_range,
-        size_info=fabric_description
+        fabric_description=fabric_description
     )
     
-    db_upload = UploadService.create_upload(db, current_user.id, upload_data, filepath)
+    with tracing.span("UploadService.create_upload"):
+        db_upload = UploadService.create_upload(db, current_user.id, upload_data, filepath)
     
-    # Generate design suggestions
-    suggestions = DesignSuggestionEngine.generate_suggestions(db_upload)
-    DesignSuggestionService.create_suggestion(db, db_upload.id, current_user.id, suggestions)
+    # Generate design suggestions, personalized by the user's saved designs
+    with tracing.span("PreferenceService.get_preference"):
+        preference = PreferenceService.get_preference(db, current_user.id)
+    with tracing.span("EngineRegistry.generate", engine=engine or registry.default):
+        suggestions = await registry.generate(db_upload, preference, engine)
+    with tracing.span("DesignSuggestionService.create_suggestion"):
+        DesignSuggestionService.create_suggestion(db, db_upload.id, current_user.id, suggestions)
     
     return {
         "id": db_upload.id,
@@ -53,7 +70,7 @@ async def create_upload(
         "gender": db_upload.gender,
         "age_group": db_upload.age_group,
         "budget_range": db_upload.budget_range,
-        "size_info": db_upload.size_info,
+        "fabric_description": db_upload.size_info,
         "created_at": db_upload.created_at
     }
 
@@ -62,38 +79,53 @@ async def create_upload(
 def get_my_uploads(
     skip: int = 0,
     limit: int = 10,
+    filters: UploadFilters = Depends(get_upload_filters),
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get user's uploads"""
-    uploads = UploadService.get_user_uploads(db, current_user.id, skip, limit)
-    return [
+    """Get user's uploads, optionally filtered by cloth type, occasion, budget and date range"""
+    if "my_uploads" in settings.db_json_endpoints_list:
+        return Response(
+            UploadService.get_user_uploads_json(db, current_user.id, skip, limit, filters),
+            media_type="application/json"
+        )
+    
+    uploads = UploadService.get_user_uploads(db, current_user.id, skip, limit, filters)
+    return trusted_response([
         {
             "id": u.id,
             "cloth_type": u.cloth_type,
             "occasion": u.occasion,
             "created_at": u.created_at,
-            "file_path": u.file_path
+            "file_path": u.file_path,
+            "user_id": u.user_id
         } for u in uploads
-    ]
+    ])
 
 
 @router.get("/{upload_id}", response_model=UploadResponse)
 def get_upload(
     upload_id: int,
+    request: Request,
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get upload by ID"""
-    upload = UploadService.get_upload_by_id(db, upload_id)
+    stamp = UploadService.cached_upload_stamp(upload_id, current_user.id)
+    if stamp and is_not_modified(request, *stamp):
+        return not_modified(cache_headers(*stamp))
+    
+    upload = UploadService.get_user_upload(db, upload_id, current_user.id)
     
     if not upload:
         raise HTTPException(status_code=404, detail="Upload not found")
     
-    if upload.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    etag, last_modified = UploadService.upload_stamp(upload)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
     
-    return {
+    return trusted_response({
         "id": upload.id,
         "user_id": upload.user_id,
         "file_path": upload.file_path,
@@ -102,28 +134,40 @@ def get_upload(
         "gender": upload.gender,
         "age_group": upload.age_group,
         "budget_range": upload.budget_range,
-        "size_info": upload.size_info,
+        "fabric_description": upload.size_info,
         "created_at": upload.created_at
-    }
+    }, headers=headers)
 
 
 @router.get("/{upload_id}/suggestions", response_model=list[DesignSuggestionResponse])
 def get_upload_suggestions(
     upload_id: int,
+    request: Request,
     db = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get design suggestions for an upload"""
-    upload = UploadService.get_upload_by_id(db, upload_id)
+    stamp = DesignSuggestionService.cached_upload_suggestions_stamp(upload_id, current_user.id)
+    if stamp and is_not_modified(request, *stamp):
+        return not_modified(cache_headers(*stamp))
     
-    if not upload:
+    if "upload_suggestions" in settings.db_json_endpoints_list:
+        result = DesignSuggestionService.get_user_upload_suggestions_json(db, upload_id, current_user.id)
+    else:
+        result = DesignSuggestionService.get_user_upload_suggestions(db, upload_id, current_user.id)
+    
+    if result is None:
         raise HTTPException(status_code=404, detail="Upload not found")
     
-    if upload.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    body, (etag, last_modified) = result
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    
+    if isinstance(body, bytes):
+        return Response(body, media_type="application/json", headers=headers)
     
-    suggestions = DesignSuggestionService.get_upload_suggestions(db, upload_id)
-    return [
+    return trusted_response([
         {
             "id": s.id,
             "upload_id": s.upload_id,
@@ -135,6 +179,7 @@ def get_upload_suggestions(
             "border_style": s.border_style,
             "description": s.description,
             "confidence_score": s.confidence_score,
+            "template_id": s.template_id,
             "created_at": s.created_at
-        } for s in suggestions
-    ]
+        } for s in body
+    ], headers=headers)
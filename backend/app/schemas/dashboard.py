@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from app.models.upload import Gender, AgeGroup, BudgetRange
+from app.schemas.upload import UploadListResponse
+from app.schemas.design_suggestion import DesignSuggestionResponse
+from app.schemas.user import UserResponse
+
+
+class DashboardUpload(UploadListResponse):
+    """Recent upload with its latest suggestion"""
+    gender: Gender
+    age_group: AgeGroup
+    budget_range: BudgetRange
+    size_info: Optional[str] = None
+    latest_suggestion: Optional[DesignSuggestionResponse] = None
+    saved_design_id: Optional[int] = None
+
+
+class DashboardResponse(BaseModel):
+    """Everything the user dashboard needs on first load"""
+    user: UserResponse
+    uploads: list[DashboardUpload]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional
 from datetime import datetime
 
 
@@ -23,6 +24,7 @@ class DesignSuggestionResponse(DesignSuggestionBase):
     id: int
     upload_id: int
     user_id: int
+    template_id: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -38,3 +40,39 @@ class SavedDesignResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class SavedDesignUpload(BaseModel):
+    """Upload a saved design was generated for"""
+    id: int
+    file_path: str
+    cloth_type: str
+    occasion: str
+    gender: str
+    age_group: str
+    budget_range: str
+    size_info: Optional[str] = None
+    created_at: datetime
+
+
+class SavedDesignFeedResponse(DesignSuggestionResponse):
+    """Saved design feed item: the suggestion plus its saved row and upload"""
+    saved_design_id: int
+    saved_at: datetime
+    upload: SavedDesignUpload
+
+
+class SearchResultResponse(DesignSuggestionResponse):
+    """Search hit: the suggestion plus its match rank"""
+    rank: float
+
+
+class RelatedDesignResponse(BaseModel):
+    """Related catalog design response schema"""
+    template_id: str
+    neck_design: str
+    sleeve_style: str
+    embroidery_pattern: str
+    color_combination: str
+    border_style: str
+    score: float
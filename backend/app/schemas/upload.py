@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
 
 
@@ -41,3 +41,12 @@ class UploadListResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class UploadFilters(BaseModel):
+    """Upload listing filters; unset fields don't filter"""
+    cloth_type: Optional[ClothType] = None
+    occasion: Optional[Occasion] = None
+    budget_range: Optional[BudgetRange] = None
+    created_from: Optional[date] = None
+    created_to: Optional[date] = None
@@ -0,0 +1,178 @@
+from datetime import date, timedelta
+from psycopg2.extras import execute_values
+from app.core.database import get_db_cursor
+from app.services.trending_service import (
+    extract_terms, COLOR_TERMS, PATTERN_TERMS, _COLOR_PATTERN, _PATTERN_PATTERN
+)
+from app.utils.sketches import HyperLogLog, HeavyHitters
+
+# Advisory lock key held while (re)building sketch buckets
+SKETCH_LOCK_KEY = 280045
+
+# Sketch name -> class, as stored in analytics_sketches (default sizes:
+# HyperLogLog precision 12, Count-Min 4 x 1024 with 20 top-k candidates)
+SKETCHES = {
+    "uploaders": HyperLogLog,
+    "colors": HeavyHitters,
+    "patterns": HeavyHitters,
+}
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def split_range(start: date, end: date) -> tuple:
+    """([month starts], [days]) covering start..end with as few buckets as possible"""
+    months, days = [], []
+    day = start
+    while day <= end:
+        if day.day == 1 and _next_month(day) - timedelta(days=1) <= end:
+            months.append(day)
+            day = _next_month(day)
+        else:
+            days.append(day)
+            day += timedelta(days=1)
+    return months, days
+
+
+class AnalyticsService:
+    """Long-window admin analytics answered from mergeable sketches
+
+    analytics_sketches holds, per day and per calendar month, a HyperLogLog
+    of the users who uploaded and Count-Min + top-k sketches of the colors
+    and patterns suggested. A range query merges whole-month sketches plus
+    the days at either end (at most ~90 small sketches for any range)
+    instead of scanning uploads and design_suggestions. Past days are built
+    once; the scheduled refresh rebuilds only today and yesterday. Deleted
+    rows stay counted until their day is rebuilt (see jobs.py build-sketches).
+    """
+
+    @staticmethod
+    def build(conn, start: date, end: date) -> bool:
+        """Rebuild the day sketches from start to end (inclusive) and their months
+
+        Returns False if another worker holds the lock.
+        """
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        sketches = {day: {name: kind() for name, kind in SKETCHES.items()} for day in days}
+        bounds = (start, end + timedelta(days=1))
+
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (SKETCH_LOCK_KEY,))
+            if not cursor.fetchone()['locked']:
+                return False
+
+            cursor.execute(
+                """SELECT created_at::date AS day, user_id FROM uploads
+                   WHERE created_at >= %s AND created_at < %s
+                   GROUP BY 1, 2""",
+                bounds
+            )
+            for r in cursor.fetchall():
+                sketches[r['day']]["uploaders"].add(r['user_id'])
+
+            # One row per distinct text per day, so each is tokenized once
+            cursor.execute(
+                """SELECT ds.created_at::date AS day,
+                          COALESCE(ds.color_combination, t.color) AS color,
+                          COALESCE(ds.embroidery_pattern, t.embroidery) AS pattern,
+                          COUNT(*) AS count
+                   FROM design_suggestions ds
+                   LEFT JOIN design_templates t ON t.id = ds.template_id
+                   WHERE ds.created_at >= %s AND ds.created_at < %s
+                   GROUP BY 1, 2, 3""",
+                bounds
+            )
+            for r in cursor.fetchall():
+                by_name = sketches[r['day']]
+                for label in extract_terms(r['color'], _COLOR_PATTERN, COLOR_TERMS):
+                    by_name["colors"].add(label, r['count'])
+                for label in extract_terms(r['pattern'], _PATTERN_PATTERN, PATTERN_TERMS):
+                    by_name["patterns"].add(label, r['count'])
+
+            AnalyticsService._save(cursor, "day", [
+                (day, name, sketch) for day, by_name in sketches.items() for name, sketch in by_name.items()
+            ])
+
+            # Months touched are re-merged from their stored days, including
+            # days outside the rebuilt range
+            months = sorted({_month_start(day) for day in days})
+            merged = []
+            for month in months:
+                by_name = {name: kind() for name, kind in SKETCHES.items()}
+                cursor.execute(
+                    """SELECT name, sketch FROM analytics_sketches
+                       WHERE period = 'day' AND bucket >= %s AND bucket < %s""",
+                    (month, _next_month(month))
+                )
+                for r in cursor.fetchall():
+                    by_name[r['name']].merge(SKETCHES[r['name']].from_bytes(bytes(r['sketch'])))
+                merged.extend((month, name, sketch) for name, sketch in by_name.items())
+            AnalyticsService._save(cursor, "month", merged)
+        return True
+
+    @staticmethod
+    def _save(cursor, period: str, sketches: list):
+        """Upsert [(bucket, name, sketch)] of one period"""
+        execute_values(
+            cursor,
+            """INSERT INTO analytics_sketches (bucket, name, period, sketch) VALUES %s
+               ON CONFLICT (name, period, bucket) DO UPDATE SET sketch = EXCLUDED.sketch, updated_at = NOW()""",
+            [(bucket, name, period, sketch.to_bytes()) for bucket, name, sketch in sketches]
+        )
+
+    @staticmethod
+    def refresh(conn) -> bool:
+        """Rebuild today's and yesterday's sketches (yesterday catches late commits)"""
+        today = date.today()
+        return AnalyticsService.build(conn, today - timedelta(days=1), today)
+
+    @staticmethod
+    def _merged(conn, name: str, start: date, end: date, daily: list = None):
+        """One sketch of `name` merged over start..end
+
+        If `daily` is a list, [(day, sketch)] of every day in the range is
+        appended to it (months are then read as days).
+        """
+        if daily is None:
+            months, days = split_range(start, end)
+        else:
+            months, days = [], [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+        merged = SKETCHES[name]()
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                """SELECT bucket, sketch FROM analytics_sketches
+                   WHERE name = %s AND ((period = 'month' AND bucket = ANY(%s))
+                                     OR (period = 'day' AND bucket = ANY(%s)))
+                   ORDER BY bucket""",
+                (name, months, days)
+            )
+            for r in cursor.fetchall():
+                sketch = SKETCHES[name].from_bytes(bytes(r['sketch']))
+                if daily is not None:
+                    daily.append((r['bucket'], sketch))
+                merged.merge(sketch)
+        return merged
+
+    @staticmethod
+    def distinct_uploaders(conn, start: date, end: date, daily: bool = False) -> tuple:
+        """(estimated distinct uploaders over the range, [(day, estimate)] if `daily` else None)"""
+        if not daily:
+            return AnalyticsService._merged(conn, "uploaders", start, end).count(), None
+
+        days = []
+        total = AnalyticsService._merged(conn, "uploaders", start, end, days)
+        return total.count(), [(day, sketch.count()) for day, sketch in days]
+
+    @staticmethod
+    def heavy_hitters(conn, name: str, start: date, end: date, k: int = 10) -> list:
+        """[(label, estimated count)] of the k most frequent colors or patterns over the range"""
+        if SKETCHES.get(name) is not HeavyHitters:
+            raise ValueError(f"Unknown heavy-hitter sketch: {name}")
+        return AnalyticsService._merged(conn, name, start, end).top(k)
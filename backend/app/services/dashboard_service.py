@@ -0,0 +1,54 @@
+from app.models.upload import Upload
+from app.core.database import get_db_cursor
+from app.services.upload_service import DesignSuggestionService, SUGGESTION_COLUMNS
+
+
+class DashboardService:
+    """Dashboard bootstrap service"""
+    
+    @staticmethod
+    def get_recent_uploads(conn, user_id: int, limit: int = 10) -> list:
+        """Get recent uploads with their latest suggestion and its saved-design id
+        
+        One query regardless of `limit`. Returns a list of
+        (Upload, DesignSuggestion or None, saved_design_id or None).
+        """
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                f"""SELECT u.id AS u_id, u.user_id AS u_user_id, u.file_path, u.cloth_type, u.occasion,
+                           u.gender, u.age_group, u.budget_range, u.size_info, u.created_at AS u_created_at,
+                           s.*,
+                           (SELECT MIN(sd.id) FROM saved_designs sd
+                            WHERE sd.design_suggestion_id = s.id AND sd.user_id = u.user_id) AS saved_design_id
+                    FROM uploads u
+                    LEFT JOIN LATERAL (
+                        SELECT {SUGGESTION_COLUMNS}
+                        FROM design_suggestions ds
+                        LEFT JOIN design_templates t ON t.id = ds.template_id
+                        WHERE ds.upload_id = u.id
+                        ORDER BY ds.created_at DESC, ds.id DESC
+                        LIMIT 1
+                    ) s ON true
+                    WHERE u.user_id = %s
+                    ORDER BY u.created_at DESC
+                    LIMIT %s""",
+                (user_id, limit)
+            )
+            results = cursor.fetchall()
+        
+        return [(
+            Upload(
+                id=r['u_id'],
+                user_id=r['u_user_id'],
+                file_path=r['file_path'],
+                cloth_type=r['cloth_type'],
+                occasion=r['occasion'],
+                gender=r['gender'],
+                age_group=r['age_group'],
+                budget_range=r['budget_range'],
+                size_info=r['size_info'],
+                created_at=r['u_created_at']
+            ),
+            DesignSuggestionService._to_suggestion(r) if r['id'] is not None else None,
+            r['saved_design_id']
+        ) for r in results]
@@ -2,6 +2,11 @@ from app.models.upload import Upload
 from app.models.design_suggestion import DesignSuggestion
 from app.schemas.upload import UploadCreate
 from app.models.upload import ClothType, Occasion, BudgetRange
+from app.services.template_index import get_template_index
+from app.utils.image_features import extract_color_profile
+from functools import lru_cache
+import numpy as np
+import random
 
 
 class DesignSuggestionEngine:
@@ -264,75 +269,141 @@ class DesignSuggestionEngine:
         }
     }
     
+    # Minimum cosine similarity for a retrieved template to be used
+    MIN_SIMILARITY = 0.5
+    
+    # How strongly a user's saved-design preference re-ranks templates
+    PREFERENCE_WEIGHT = 0.15
+    
+    FABRIC_TYPES = {
+        "saree": "silk or cotton",
+        "kurti": "cotton or silk blend",
+        "lehenga": "silk with cotton lining",
+        "shirt": "premium cotton",
+        "dress": "premium fabric",
+        "blouse": "silk or cotton blend"
+    }
+    
+    # Also rendered in SQL for Postgres-built list responses (upload_service)
+    DESCRIPTION_FORMAT = (
+        "For this {fabric} {cloth_type}, a {neck} with {embroidery}, paired with {color} "
+        "color combination, is recommended for {occasion} wear. "
+        "The {sleeve} complement the look perfectly. "
+        "Accessorize with a {border}."
+    )
+    
+    @staticmethod
+    def generate_suggestions(upload: Upload, preference: np.ndarray = None, backend: str = None) -> dict:
+        """Generate design suggestions through the engine registry (blocking)"""
+        from app.services.engine_registry import get_engine_registry
+        return get_engine_registry().generate_sync(upload, preference, backend)
+    
+    @staticmethod
+    def _normalize(upload: Upload) -> tuple:
+        """Normalize string values (from database)"""
+        cloth_type_str = str(upload.cloth_type).lower().strip()
+        occasion_str = str(upload.occasion).lower().strip()
+        budget_str = str(upload.budget_range).lower().strip() if upload.budget_range else "3000-8000"
+        return cloth_type_str, occasion_str, budget_str
+    
     @staticmethod
-    def generate_suggestions(upload: Upload) -> dict:
-        """Generate design suggestions based on cloth type, occasion, and budget"""
+    def template_suggestions(upload: Upload, position: int) -> dict:
+        """Build suggestions from the catalog template at an index position"""
+        index = get_template_index()
+        template = index.templates[position]
+        cloth_type_str, occasion_str, _ = DesignSuggestionEngine._normalize(upload)
+        exact = index.keys[position] == (cloth_type_str, occasion_str)
         
-        try:
-            import random
-            
-            # Normalize string values (from database)
-            cloth_type_str = str(upload.cloth_type).lower().strip()
-            occasion_str = str(upload.occasion).lower().strip()
-            budget_str = str(upload.budget_range).lower().strip() if upload.budget_range else "3000-8000"
-            
-            # Try to get template from DESIGN_TEMPLATES using string keys
-            template = None
-            if cloth_type_str in DesignSuggestionEngine.DESIGN_TEMPLATES:
-                cloth_templates = DesignSuggestionEngine.DESIGN_TEMPLATES[cloth_type_str]
-                if occasion_str in cloth_templates:
-                    template_options = cloth_templates[occasion_str]
-                    if template_options and len(template_options) > 0:
-                        template = random.choice(template_options)
-            
-            # Use template if available, otherwise use fallback suggestions
-            if template:
-                suggestions = {
-                    "neck_design": template["neck"],
-                    "sleeve_style": template["sleeve"],
-                    "embroidery_pattern": template["embroidery"],
-                    "color_combination": template["color"],
-                    "border_style": template["border"],
-                    "confidence_score": "High"
-                }
-            else:
-                # Fallback to algorithm-based suggestions
-                suggestions = {
-                    "neck_design": DesignSuggestionEngine._suggest_neck(
-                        cloth_type_str, occasion_str, upload.gender
-                    ),
-                    "sleeve_style": DesignSuggestionEngine._suggest_sleeve(
-                        cloth_type_str, occasion_str, budget_str
-                    ),
-                    "embroidery_pattern": DesignSuggestionEngine._suggest_embroidery(
-                        occasion_str, budget_str
-                    ),
-                    "color_combination": DesignSuggestionEngine._suggest_color(
-                        occasion_str, upload.age_group
-                    ),
-                    "border_style": DesignSuggestionEngine._suggest_border(
-                        cloth_type_str, budget_str
-                    ),
-                    "confidence_score": "High"
-                }
-            
-            # Generate description
-            suggestions["description"] = DesignSuggestionEngine._generate_description(
-                upload, suggestions
-            )
-            
-            return suggestions
-        except Exception as e:
-            # Fallback: return basic suggestion if anything fails
-            return {
-                "neck_design": "Round neck",
-                "sleeve_style": "Standard sleeves",
-                "embroidery_pattern": "Basic embroidery",
-                "color_combination": "Multi-color",
-                "border_style": "Simple border",
-                "description": f"Design suggestion for {upload.cloth_type} for {upload.occasion} wear.",
-                "confidence_score": "Medium"
-            }
+        suggestions = {
+            "neck_design": template["neck"],
+            "sleeve_style": template["sleeve"],
+            "embroidery_pattern": template["embroidery"],
+            "color_combination": template["color"],
+            "border_style": template["border"],
+            "template_id": index.template_ids[position],
+            "confidence_score": "High" if exact else "Medium"
+        }
+        suggestions["description"] = DesignSuggestionEngine._generate_description(
+            upload, suggestions
+        )
+        return suggestions
+    
+    @staticmethod
+    def similarity_suggestions(upload: Upload, preference: np.ndarray = None) -> dict:
+        """Suggest the nearest catalog template, falling back to rules below MIN_SIMILARITY"""
+        cloth_type_str, occasion_str, budget_str = DesignSuggestionEngine._normalize(upload)
+        
+        # Retrieve the nearest catalog template for this upload
+        index = get_template_index()
+        query = index.encode_upload(
+            cloth_type_str, occasion_str, budget_str,
+            extract_color_profile(upload.file_path)
+        )
+        scores = index.score(query)
+        
+        if float(scores.max()) < DesignSuggestionEngine.MIN_SIMILARITY:
+            return DesignSuggestionEngine.rule_suggestions(upload)
+        
+        if preference is not None:
+            scores = scores + DesignSuggestionEngine.PREFERENCE_WEIGHT * index.style_score(preference)
+        
+        # Pick randomly among equally good matches
+        candidates = np.flatnonzero(scores >= scores.max() - 1e-6)
+        return DesignSuggestionEngine.template_suggestions(upload, int(random.choice(candidates)))
+    
+    @staticmethod
+    def rule_suggestions(upload: Upload) -> dict:
+        """Suggest by exact template lookup on (cloth_type, occasion), else by per-field rules"""
+        cloth_type_str, occasion_str, budget_str = DesignSuggestionEngine._normalize(upload)
+        
+        # Try to get template from DESIGN_TEMPLATES using string keys
+        options = DesignSuggestionEngine.DESIGN_TEMPLATES.get(cloth_type_str, {}).get(occasion_str)
+        if options:
+            index = get_template_index()
+            position = random.choice(index.key_positions[(cloth_type_str, occasion_str)])
+            return DesignSuggestionEngine.template_suggestions(upload, position)
+        
+        # Fallback to algorithm-based suggestions
+        suggestions = {
+            "neck_design": DesignSuggestionEngine._suggest_neck(
+                cloth_type_str, occasion_str, upload.gender
+            ),
+            "sleeve_style": DesignSuggestionEngine._suggest_sleeve(
+                cloth_type_str, occasion_str, budget_str
+            ),
+            "embroidery_pattern": DesignSuggestionEngine._suggest_embroidery(
+                occasion_str, budget_str
+            ),
+            "color_combination": DesignSuggestionEngine._suggest_color(
+                occasion_str, upload.age_group
+            ),
+            "border_style": DesignSuggestionEngine._suggest_border(
+                cloth_type_str, budget_str
+            ),
+            "template_id": None,
+            "confidence_score": "High"
+        }
+        
+        # Generate description
+        suggestions["description"] = DesignSuggestionEngine._generate_description(
+            upload, suggestions
+        )
+        
+        return suggestions
+    
+    @staticmethod
+    def basic_suggestions(upload: Upload) -> dict:
+        """Last-resort suggestion when even the rule engine fails"""
+        return {
+            "neck_design": "Round neck",
+            "sleeve_style": "Standard sleeves",
+            "embroidery_pattern": "Basic embroidery",
+            "color_combination": "Multi-color",
+            "border_style": "Simple border",
+            "description": f"Design suggestion for {upload.cloth_type} for {upload.occasion} wear.",
+            "template_id": None,
+            "confidence_score": "Medium"
+        }
     
     @staticmethod
     def _suggest_neck(cloth_type, occasion, gender) -> str:
@@ -487,32 +558,36 @@ class DesignSuggestionEngine:
         
         return "Embroidered border"
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def render_template_description(cloth_type: str, occasion: str, neck: str, sleeve: str,
+                                    embroidery: str, color: str, border: str) -> str:
+        """Render (and cache) the description of a catalog-based suggestion from its template text"""
+        suggestions = {
+            "neck_design": neck,
+            "sleeve_style": sleeve,
+            "embroidery_pattern": embroidery,
+            "color_combination": color,
+            "border_style": border,
+        }
+        return DesignSuggestionEngine._generate_description(
+            Upload(cloth_type=cloth_type, occasion=occasion), suggestions
+        )
+    
     @staticmethod
     def _generate_description(upload: Upload, suggestions: dict) -> str:
         """Generate full description"""
         
-        fabric_types = {
-            "saree": "silk or cotton",
-            "kurti": "cotton or silk blend",
-            "lehenga": "silk with cotton lining",
-            "shirt": "premium cotton",
-            "dress": "premium fabric",
-            "blouse": "silk or cotton blend"
-        }
-        
         cloth_type_str = str(upload.cloth_type).lower().strip()
         occasion_str = str(upload.occasion).lower().strip()
         
-        fabric = "premium fabric"
-        if cloth_type_str in fabric_types:
-            fabric = fabric_types[cloth_type_str]
-        
-        description = (
-            f"For this {fabric} {upload.cloth_type}, a {suggestions['neck_design'].lower()} "
-            f"with {suggestions['embroidery_pattern'].lower()}, paired with {suggestions['color_combination'].lower()} "
-            f"color combination, is recommended for {occasion_str} wear. "
-            f"The {suggestions['sleeve_style'].lower()} complement the look perfectly. "
-            f"Accessorize with a {suggestions['border_style'].lower()}."
+        return DesignSuggestionEngine.DESCRIPTION_FORMAT.format(
+            fabric=DesignSuggestionEngine.FABRIC_TYPES.get(cloth_type_str, "premium fabric"),
+            cloth_type=upload.cloth_type,
+            neck=suggestions['neck_design'].lower(),
+            embroidery=suggestions['embroidery_pattern'].lower(),
+            color=suggestions['color_combination'].lower(),
+            occasion=occasion_str,
+            sleeve=suggestions['sleeve_style'].lower(),
+            border=suggestions['border_style'].lower(),
         )
-        
-        return description
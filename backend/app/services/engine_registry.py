@@ -0,0 +1,367 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+import numpy as np
+from app.core.config import get_settings
+from app.core.metrics import ENGINE_SECONDS
+from app.core import tracing
+from app.models.upload import Upload
+from app.services.design_suggestion_service import DesignSuggestionEngine
+from app.services.template_index import get_template_index
+from app.utils.image_features import extract_color_profile
+
+try:
+    import onnxruntime
+except ImportError:  # optional dependency
+    onnxruntime = None
+
+settings = get_settings()
+
+# Upper bounds (ms) of the latency histogram buckets kept per backend
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class SuggestionBackend(ABC):
+    """Interface for suggestion engine backends"""
+
+    name = None
+
+    @abstractmethod
+    def generate(self, upload: Upload, preference: np.ndarray = None) -> dict:
+        """Generate a suggestion dict for an upload"""
+
+
+class RuleBackend(SuggestionBackend):
+    """Exact template lookup plus per-field rules (always-available fallback)"""
+
+    name = "rule"
+
+    def generate(self, upload: Upload, preference: np.ndarray = None) -> dict:
+        return DesignSuggestionEngine.rule_suggestions(upload)
+
+
+class SimilarityBackend(SuggestionBackend):
+    """Nearest catalog template by cosine similarity, personalized by preference"""
+
+    name = "similarity"
+
+    def generate(self, upload: Upload, preference: np.ndarray = None) -> dict:
+        return DesignSuggestionEngine.similarity_suggestions(upload, preference)
+
+
+class OnnxBackend(SuggestionBackend):
+    """CPU ONNX model scoring catalog templates from the upload feature vector
+
+    The model takes a float32 [1, d] feature vector (TemplateIndex.encode_upload)
+    and returns one score per catalog template, in index order.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str):
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def generate(self, upload: Upload, preference: np.ndarray = None) -> dict:
+        index = get_template_index()
+        cloth_type_str, occasion_str, budget_str = DesignSuggestionEngine._normalize(upload)
+        query = index.encode_upload(
+            cloth_type_str, occasion_str, budget_str,
+            extract_color_profile(upload.file_path)
+        )
+        scores = self.session.run(None, {self.input_name: query[None, :]})[0].reshape(-1)
+        if scores.shape[0] != len(index):
+            raise ValueError(f"ONNX model returned {scores.shape[0]} scores for {len(index)} templates")
+        return DesignSuggestionEngine.template_suggestions(upload, int(scores.argmax()))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open trial call"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                # Let exactly one trial call through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class BackendMetrics:
+    """Per-backend call counters and latency histogram"""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.over_budget = 0
+        self.short_circuited = 0
+        self.fallbacks = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ms: float):
+        with self._lock:
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def increment(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            observed = sum(self.buckets)
+            return {
+                "calls": self.calls,
+                "successes": self.successes,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "over_budget": self.over_budget,
+                "short_circuited": self.short_circuited,
+                "fallbacks": self.fallbacks,
+                "avg_ms": round(self.total_ms / observed, 3) if observed else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "latency_buckets_ms": {
+                    **{str(bound): count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                    "+Inf": self.buckets[-1],
+                },
+            }
+
+
+class RegisteredBackend:
+    """A backend with its latency budget, timeout, breaker and metrics"""
+
+    def __init__(self, backend: SuggestionBackend, budget_ms: float, timeout_ms: float,
+                 failure_threshold: int, reset_seconds: float):
+        self.backend = backend
+        self.budget_ms = budget_ms
+        self.timeout_ms = timeout_ms
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.metrics = BackendMetrics()
+
+
+class EngineRegistry:
+    """Registry of suggestion backends; every failure path ends at the rule engine
+
+    The rule backend runs inline. Other backends run in a bounded thread pool
+    with a hard timeout, and their breaker short-circuits straight to the rule
+    engine while open.
+    """
+
+    FALLBACK = RuleBackend.name
+
+    def __init__(self, default: str, workers: int):
+        self.default = default
+        self.backends = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="suggestion-engine")
+
+    def register(self, backend: SuggestionBackend, budget_ms: float = None, timeout_ms: float = None,
+                 failure_threshold: int = None, reset_seconds: float = None):
+        """Register a backend under its name"""
+        self.backends[backend.name] = RegisteredBackend(
+            backend,
+            budget_ms if budget_ms is not None else settings.engine_budget_ms,
+            timeout_ms if timeout_ms is not None else settings.engine_timeout_ms,
+            failure_threshold if failure_threshold is not None else settings.engine_breaker_failures,
+            reset_seconds if reset_seconds is not None else settings.engine_breaker_reset_seconds,
+        )
+
+    def names(self) -> list:
+        return list(self.backends)
+
+    def _resolve(self, name: str) -> RegisteredBackend:
+        name = name or self.default
+        if name not in self.backends:
+            raise ValueError(f"Unknown suggestion engine: {name}")
+        return self.backends[name]
+
+    def _timed(self, entry: RegisteredBackend, upload: Upload, preference: np.ndarray):
+        """Run a backend and return (suggestions, elapsed ms)"""
+        started = time.perf_counter()
+        with tracing.span(f"engine.{entry.backend.name}"):
+            suggestions = entry.backend.generate(upload, preference)
+        return suggestions, (time.perf_counter() - started) * 1000
+
+    def _settle(self, entry: RegisteredBackend, outcome: str, elapsed_ms: float = None):
+        """Record the outcome of a backend call"""
+        metrics = entry.metrics
+        if outcome == "success":
+            metrics.increment("successes")
+            metrics.observe(elapsed_ms)
+            if elapsed_ms > entry.budget_ms:
+                # Consistently blowing the budget trips the breaker like an error
+                metrics.increment("over_budget")
+                entry.breaker.record_failure()
+            else:
+                entry.breaker.record_success()
+        else:
+            metrics.increment(outcome)
+            entry.breaker.record_failure()
+
+    def _fallback(self, upload: Upload, preference: np.ndarray, entry: RegisteredBackend = None) -> dict:
+        """Answer with the rule engine, inline"""
+        if entry is not None:
+            entry.metrics.increment("fallbacks")
+        rule = self.backends[self.FALLBACK]
+        rule.metrics.increment("calls")
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"engine.{rule.backend.name}", fallback=entry is not None):
+                suggestions = rule.backend.generate(upload, preference)
+            rule.metrics.increment("successes")
+        except Exception as e:
+            print(f"Rule engine failed: {e}")
+            rule.metrics.increment("errors")
+            suggestions = DesignSuggestionEngine.basic_suggestions(upload)
+        rule.metrics.observe((time.perf_counter() - started) * 1000)
+        return suggestions
+
+    def _admit(self, entry: RegisteredBackend) -> bool:
+        """Count the call and check the breaker"""
+        entry.metrics.increment("calls")
+        if not entry.breaker.allow():
+            entry.metrics.increment("short_circuited")
+            return False
+        return True
+
+    def _observe(self, entry: RegisteredBackend, started: float, suggestions: dict):
+        """Record end-to-end generation time, by whether a catalog template answered"""
+        path = "template" if suggestions.get("template_id") else "fallback"
+        ENGINE_SECONDS.observe(time.perf_counter() - started, entry.backend.name, path)
+
+    def generate_sync(self, upload: Upload, preference: np.ndarray = None, backend: str = None) -> dict:
+        """Generate suggestions, blocking the calling thread for at most the backend timeout"""
+        entry = self._resolve(backend)
+        started = time.perf_counter()
+        suggestions = self._generate_sync(entry, upload, preference)
+        self._observe(entry, started, suggestions)
+        return suggestions
+
+    def _generate_sync(self, entry: RegisteredBackend, upload: Upload, preference: np.ndarray) -> dict:
+        if entry.backend.name == self.FALLBACK:
+            return self._fallback(upload, preference)
+        if not self._admit(entry):
+            return self._fallback(upload, preference, entry)
+
+        future = self._executor.submit(tracing.propagate(self._timed), entry, upload, preference)
+        try:
+            suggestions, elapsed_ms = future.result(timeout=entry.timeout_ms / 1000)
+        except FutureTimeoutError:
+            self._settle(entry, "timeouts")
+            return self._fallback(upload, preference, entry)
+        except Exception as e:
+            print(f"Suggestion engine {entry.backend.name} failed: {e}")
+            self._settle(entry, "errors")
+            return self._fallback(upload, preference, entry)
+
+        self._settle(entry, "success", elapsed_ms)
+        return suggestions
+
+    async def generate(self, upload: Upload, preference: np.ndarray = None, backend: str = None) -> dict:
+        """Generate suggestions without blocking the event loop"""
+        entry = self._resolve(backend)
+        started = time.perf_counter()
+        suggestions = await self._generate(entry, upload, preference)
+        self._observe(entry, started, suggestions)
+        return suggestions
+
+    async def _generate(self, entry: RegisteredBackend, upload: Upload, preference: np.ndarray) -> dict:
+        if entry.backend.name == self.FALLBACK:
+            return self._fallback(upload, preference)
+        if not self._admit(entry):
+            return self._fallback(upload, preference, entry)
+
+        future = self._executor.submit(tracing.propagate(self._timed), entry, upload, preference)
+        try:
+            suggestions, elapsed_ms = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=entry.timeout_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            self._settle(entry, "timeouts")
+            return self._fallback(upload, preference, entry)
+        except Exception as e:
+            print(f"Suggestion engine {entry.backend.name} failed: {e}")
+            self._settle(entry, "errors")
+            return self._fallback(upload, preference, entry)
+
+        self._settle(entry, "success", elapsed_ms)
+        return suggestions
+
+    def metrics(self) -> dict:
+        """Per-backend timing and breaker state"""
+        return {
+            "default": self.default,
+            "backends": {
+                name: {
+                    "budget_ms": entry.budget_ms,
+                    "timeout_ms": entry.timeout_ms,
+                    "breaker": entry.breaker.state,
+                    **entry.metrics.to_dict(),
+                } for name, entry in self.backends.items()
+            },
+        }
+
+
+@lru_cache()
+def get_engine_registry() -> EngineRegistry:
+    """Get the engine registry with all available backends registered"""
+    registry = EngineRegistry(settings.engine_default_backend, settings.engine_workers)
+    registry.register(RuleBackend())
+    registry.register(SimilarityBackend())
+
+    if settings.onnx_model_path:
+        if onnxruntime is None:
+            print("onnx_model_path is set but onnxruntime is not installed; ONNX engine disabled")
+        else:
+            try:
+                registry.register(OnnxBackend(settings.onnx_model_path))
+            except Exception as e:
+                print(f"Failed to load ONNX model: {e}")
+
+    if registry.default not in registry.backends:
+        registry.default = SimilarityBackend.name
+    return registry
@@ -0,0 +1,82 @@
+import csv
+import io
+from app.core.config import get_settings
+from app.schemas.upload import UploadFilters
+from app.services.upload_service import UploadService, UPLOAD_COLUMNS, SUGGESTION_JSON_SELECT
+
+settings = get_settings()
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Suggestion export columns, in SUGGESTION_JSON_SELECT order
+SUGGESTION_EXPORT_COLUMNS = (
+    "id", "upload_id", "user_id", "neck_design", "sleeve_style", "embroidery_pattern",
+    "color_combination", "border_style", "description", "confidence_score", "template_id", "created_at",
+)
+
+
+class ExportService:
+    """Streams whole tables as NDJSON or CSV in constant memory"""
+
+    @staticmethod
+    def uploads_query(filters: UploadFilters = None) -> tuple:
+        """(query, params, columns) of the uploads export, in id order"""
+        where, params = UploadService.filter_clause(None, filters)
+        return (
+            f"SELECT {UPLOAD_COLUMNS} FROM uploads {where} ORDER BY id",
+            tuple(params),
+            tuple(column.strip() for column in UPLOAD_COLUMNS.split(",")),
+        )
+
+    @staticmethod
+    def suggestions_query() -> tuple:
+        """(query, params, columns) of the suggestions export, in id order"""
+        return f"{SUGGESTION_JSON_SELECT} ORDER BY ds.id", (), SUGGESTION_EXPORT_COLUMNS
+
+    @staticmethod
+    def stream(conn, query: str, params: tuple, columns: tuple, format: str, batch_size: int = None):
+        """Yield the query's rows as NDJSON or CSV, one chunk per fetched batch
+
+        Rows come from a named (server-side) cursor, so only one batch is held
+        in memory. NDJSON lines are rendered by Postgres (row_to_json), like the
+        json_agg list endpoints. The caller owns `conn`; the cursor's
+        transaction is rolled back when the stream ends or is abandoned.
+        """
+        batch_size = batch_size or settings.export_batch_size
+        if format == "ndjson":
+            query = f"SELECT row_to_json(r)::text FROM ({query}) r"
+        else:
+            # Text columns spare the csv writer converting datetimes row by row
+            query = f"SELECT {', '.join(f'r.{column}::text' for column in columns)} FROM ({query}) r"
+
+        cursor = conn.cursor(name="export")
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(query, params)
+
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    yield buffer.getvalue().encode()
+                    buffer.seek(0)
+                    buffer.truncate()
+                if buffer.tell():
+                    yield buffer.getvalue().encode()
+            else:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield ("\n".join(row[0] for row in rows) + "\n").encode()
+        finally:
+            cursor.close()
+            conn.rollback()
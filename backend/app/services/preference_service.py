@@ -0,0 +1,88 @@
+import numpy as np
+import psycopg2
+from app.core.database import get_db_cursor
+from app.services.template_index import encode_style, STYLE_DIM
+
+
+class PreferenceService:
+    """Per-user style preferences learned from saved designs"""
+    
+    # Pseudo-count that damps the preference of users with few saves
+    PRIOR_SAVES = 3
+    
+    @staticmethod
+    def _suggestion_style(cursor, design_suggestion_id: int) -> np.ndarray:
+        """Encode the style of a stored suggestion"""
+        cursor.execute(
+            """SELECT COALESCE(ds.embroidery_pattern, t.embroidery) AS embroidery_pattern,
+                      COALESCE(ds.color_combination, t.color) AS color_combination
+               FROM design_suggestions ds
+               LEFT JOIN design_templates t ON t.id = ds.template_id
+               WHERE ds.id = %s""",
+            (design_suggestion_id,)
+        )
+        result = cursor.fetchone()
+        
+        if result:
+            return encode_style(result['embroidery_pattern'], result['color_combination'])
+        return None
+    
+    @staticmethod
+    def apply_saved(cursor, user_id: int, design_suggestion_id: int, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) a saved design from the user's preference"""
+        style = PreferenceService._suggestion_style(cursor, design_suggestion_id)
+        if style is None:
+            return
+        
+        # Create the row first: FOR UPDATE locks nothing while it doesn't
+        # exist, and two first saves would both start from zero
+        cursor.execute(
+            """INSERT INTO user_preferences (user_id, style_vector, save_count, updated_at)
+               VALUES (%s, %s, 0, NOW())
+               ON CONFLICT (user_id) DO NOTHING""",
+            (user_id, psycopg2.Binary(np.zeros(STYLE_DIM, dtype=np.float32).tobytes()))
+        )
+        cursor.execute(
+            "SELECT style_vector, save_count FROM user_preferences WHERE user_id = %s FOR UPDATE",
+            (user_id,)
+        )
+        result = cursor.fetchone()
+        
+        vector = np.zeros(STYLE_DIM, dtype=np.float32)
+        count = 0
+        if result:
+            stored = np.frombuffer(bytes(result['style_vector']), dtype=np.float32)
+            if stored.shape[0] == STYLE_DIM:
+                vector = stored.copy()
+                count = result['save_count']
+        
+        vector += sign * style
+        count = max(count + sign, 0)
+        if count == 0:
+            vector[:] = 0.0
+        
+        cursor.execute(
+            """UPDATE user_preferences
+               SET style_vector = %s, save_count = %s, updated_at = NOW()
+               WHERE user_id = %s""",
+            (psycopg2.Binary(vector.tobytes()), count, user_id)
+        )
+    
+    @staticmethod
+    def get_preference(conn, user_id: int) -> np.ndarray:
+        """Get the user's damped mean style vector, or None without saves"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                "SELECT style_vector, save_count FROM user_preferences WHERE user_id = %s",
+                (user_id,)
+            )
+            result = cursor.fetchone()
+        
+        if not result or result['save_count'] <= 0:
+            return None
+        
+        vector = np.frombuffer(bytes(result['style_vector']), dtype=np.float32)
+        if vector.shape[0] != STYLE_DIM:
+            return None
+        
+        return vector / (result['save_count'] + PreferenceService.PRIOR_SAVES)
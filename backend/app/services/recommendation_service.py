@@ -0,0 +1,152 @@
+from app.core.config import get_settings
+from app.core.database import get_db_cursor
+from app.services.template_index import get_template_index
+
+settings = get_settings()
+
+# Advisory lock key so only one worker refreshes the neighbor table at a time
+REFRESH_LOCK_KEY = 280028
+
+
+class RecommendationService:
+    """Item-to-item "saved this also saved" recommendations over catalog templates"""
+
+    @staticmethod
+    def record_save(cursor, user_id: int, saved_design_id: int, design_suggestion_id: int, sign: int = 1):
+        """Update co-occurrence counts for a save (sign=1) or unsave (sign=-1)"""
+        cursor.execute(
+            "SELECT template_id FROM design_suggestions WHERE id = %s",
+            (design_suggestion_id,)
+        )
+        result = cursor.fetchone()
+
+        if not result or not result['template_id']:
+            return
+        template_id = result['template_id']
+
+        # Pair the template with every other template this user has saved
+        cursor.execute(
+            """WITH others AS (
+                   SELECT ds.template_id, COUNT(*) AS n
+                   FROM saved_designs sd
+                   JOIN design_suggestions ds ON ds.id = sd.design_suggestion_id
+                   WHERE sd.user_id = %(user_id)s AND sd.id <> %(saved_id)s
+                     AND ds.template_id IS NOT NULL AND ds.template_id <> %(template_id)s
+                   GROUP BY ds.template_id
+               )
+               INSERT INTO template_cooccurrence (template_a, template_b, count)
+               SELECT %(template_id)s, template_id, %(sign)s * n FROM others
+               UNION ALL
+               SELECT template_id, %(template_id)s, %(sign)s * n FROM others
+               ON CONFLICT (template_a, template_b)
+               DO UPDATE SET count = template_cooccurrence.count + EXCLUDED.count""",
+            {"user_id": user_id, "saved_id": saved_design_id, "template_id": template_id, "sign": sign}
+        )
+
+        if sign < 0:
+            cursor.execute(
+                """DELETE FROM template_cooccurrence
+                   WHERE count <= 0 AND (template_a = %s OR template_b = %s)""",
+                (template_id, template_id)
+            )
+
+    @staticmethod
+    def rebuild_cooccurrence(conn):
+        """Recompute the co-occurrence matrix from scratch (backfill/repair)"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("DELETE FROM template_cooccurrence")
+            cursor.execute(
+                """WITH saves AS (
+                       SELECT sd.id, sd.user_id, ds.template_id
+                       FROM saved_designs sd
+                       JOIN design_suggestions ds ON ds.id = sd.design_suggestion_id
+                       WHERE ds.template_id IS NOT NULL
+                   )
+                   INSERT INTO template_cooccurrence (template_a, template_b, count)
+                   SELECT a.template_id, b.template_id, COUNT(*)
+                   FROM saves a
+                   JOIN saves b ON b.user_id = a.user_id AND b.id <> a.id
+                               AND b.template_id <> a.template_id
+                   GROUP BY a.template_id, b.template_id"""
+            )
+
+    @staticmethod
+    def refresh_neighbors(conn, top_n: int = None) -> bool:
+        """Rebuild the top-N neighbor table; returns False if another worker holds the lock"""
+        top_n = top_n or settings.related_designs_top_n
+
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (REFRESH_LOCK_KEY,))
+            if not cursor.fetchone()['locked']:
+                return False
+
+            # Cosine-normalized co-occurrence: count(a, b) / sqrt(saves(a) * saves(b))
+            cursor.execute("DELETE FROM related_templates")
+            cursor.execute(
+                """WITH totals AS (
+                       SELECT ds.template_id, COUNT(*) AS n
+                       FROM saved_designs sd
+                       JOIN design_suggestions ds ON ds.id = sd.design_suggestion_id
+                       WHERE ds.template_id IS NOT NULL
+                       GROUP BY ds.template_id
+                   ),
+                   scored AS (
+                       SELECT c.template_a, c.template_b,
+                              c.count / sqrt(ta.n::float * tb.n) AS score
+                       FROM template_cooccurrence c
+                       JOIN totals ta ON ta.template_id = c.template_a
+                       JOIN totals tb ON tb.template_id = c.template_b
+                       WHERE c.count > 0
+                   ),
+                   ranked AS (
+                       SELECT template_a, template_b, score,
+                              ROW_NUMBER() OVER (
+                                  PARTITION BY template_a ORDER BY score DESC, template_b
+                              ) AS rank
+                       FROM scored
+                   )
+                   INSERT INTO related_templates (template_id, rank, related_template_id, score)
+                   SELECT template_a, rank, template_b, score FROM ranked WHERE rank <= %s""",
+                (top_n,)
+            )
+
+        return True
+
+    @staticmethod
+    def get_related(conn, suggestion_id: int, user_id: int = None):
+        """Get the related templates of a suggestion, or None if missing or not owned by `user_id`
+
+        `user_id` None (admins) allows any owner.
+        """
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                """SELECT r.related_template_id, r.score
+                   FROM design_suggestions ds
+                   LEFT JOIN related_templates r ON r.template_id = ds.template_id
+                   WHERE ds.id = %s AND (%s::int IS NULL OR ds.user_id = %s)
+                   ORDER BY r.rank""",
+                (suggestion_id, user_id, user_id)
+            )
+            results = cursor.fetchall()
+
+        if not results:
+            return None
+
+        index = get_template_index()
+        related = []
+        for r in results:
+            position = index.positions.get(r['related_template_id'])
+            if position is None:
+                continue
+            template = index.templates[position]
+            related.append({
+                "template_id": r['related_template_id'],
+                "neck_design": template["neck"],
+                "sleeve_style": template["sleeve"],
+                "embroidery_pattern": template["embroidery"],
+                "color_combination": template["color"],
+                "border_style": template["border"],
+                "score": r['score']
+            })
+
+        return related
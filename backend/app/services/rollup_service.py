@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+from app.core.database import get_db_cursor, ROLLUP_DIMENSIONS
+
+DIMENSIONS_SQL = ", ".join(ROLLUP_DIMENSIONS)
+
+
+class RollupService:
+    """Admin dashboard counts read from the upload rollup tables
+
+    upload_counts (all time) and upload_daily_counts are maintained by the
+    uploads_rollup triggers; rebuild() recomputes them from uploads.
+    """
+
+    @staticmethod
+    def get_total(conn) -> int:
+        """Total uploads"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("SELECT COALESCE(SUM(count), 0) AS total FROM upload_counts")
+            return int(cursor.fetchone()['total'])
+
+    @staticmethod
+    def get_counts_by(conn, dimension: str, limit: int = None) -> list:
+        """[(value, count)] of one rollup dimension, most uploads first"""
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                f"""SELECT {dimension} AS value, SUM(count) AS count FROM upload_counts
+                    GROUP BY {dimension} HAVING SUM(count) > 0
+                    ORDER BY count DESC, {dimension} LIMIT %s""",
+                (limit,)
+            )
+            return [(r['value'], int(r['count'])) for r in cursor.fetchall()]
+
+    @staticmethod
+    def get_daily(conn, days: int = 30) -> list:
+        """[(day, count)] of the last `days` days, oldest first, days without uploads included"""
+        start = date.today() - timedelta(days=days - 1)
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                """SELECT d.day::date AS day, COALESCE(SUM(c.count), 0) AS count
+                   FROM generate_series(%s::date, CURRENT_DATE, interval '1 day') AS d(day)
+                   LEFT JOIN upload_daily_counts c ON c.day = d.day::date
+                   GROUP BY 1 ORDER BY 1""",
+                (start,)
+            )
+            return [(r['day'], int(r['count'])) for r in cursor.fetchall()]
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        """Recompute both rollups from uploads; returns how many daily rollup rows were wrong
+
+        Holds a SHARE lock on uploads for the duration, so uploads wait
+        rather than slip between the recount and the swap.
+        """
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("LOCK TABLE uploads IN SHARE MODE")
+            cursor.execute(
+                f"""CREATE TEMP TABLE fresh_daily_counts ON COMMIT DROP AS
+                    SELECT created_at::date AS day, {DIMENSIONS_SQL}, COUNT(*) AS count
+                    FROM uploads GROUP BY 1, {DIMENSIONS_SQL}"""
+            )
+            cursor.execute(
+                f"""SELECT COUNT(*) AS drift
+                    FROM fresh_daily_counts f
+                    FULL JOIN (SELECT * FROM upload_daily_counts WHERE count <> 0) c
+                      USING (day, {DIMENSIONS_SQL})
+                    WHERE f.count IS DISTINCT FROM c.count"""
+            )
+            drift = cursor.fetchone()['drift']
+
+            cursor.execute("DELETE FROM upload_daily_counts")
+            cursor.execute(
+                f"""INSERT INTO upload_daily_counts (day, {DIMENSIONS_SQL}, count)
+                    SELECT day, {DIMENSIONS_SQL}, count FROM fresh_daily_counts"""
+            )
+            cursor.execute("DELETE FROM upload_counts")
+            cursor.execute(
+                f"""INSERT INTO upload_counts ({DIMENSIONS_SQL}, count)
+                    SELECT {DIMENSIONS_SQL}, SUM(count) FROM fresh_daily_counts GROUP BY {DIMENSIONS_SQL}"""
+            )
+        return drift
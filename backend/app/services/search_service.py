@@ -0,0 +1,110 @@
+import re
+from app.core.config import get_settings
+from app.core.database import get_db_cursor, SUGGESTION_SEARCH_TEXT, TEMPLATE_SEARCH_TEXT, UPLOAD_SEARCH_TEXT
+from app.services.upload_service import DesignSuggestionService, SUGGESTION_COLUMNS
+
+settings = get_settings()
+
+# Whether pg_trgm is installed; checked once per process
+_trigram_available = None
+
+
+class SearchService:
+    """Keyword search over suggestion text, catalog templates and upload notes"""
+    
+    @staticmethod
+    def _has_trigram(cursor) -> bool:
+        global _trigram_available
+        if _trigram_available is None:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') AS installed")
+            _trigram_available = cursor.fetchone()['installed']
+        return _trigram_available
+    
+    @staticmethod
+    def _prefix_query(query: str) -> str:
+        """to_tsquery text matching every word of a short query as a prefix"""
+        words = re.findall(r"\w+", query.lower())
+        return " & ".join(f"{word}:*" for word in words)
+    
+    @staticmethod
+    def search(conn, query: str, user_id: int = None, limit: int = 20, before: tuple = None) -> list:
+        """Search suggestions, best match first
+        
+        Queries of up to settings.search_fuzzy_max_length characters are matched
+        fuzzily (pg_trgm word similarity, or word prefixes without pg_trgm);
+        longer ones as web-search full-text queries ("mirror work", -pastel).
+        `user_id` limits the search to one user's suggestions. `before` is the
+        (rank, id) keyset cursor of the last row of the previous page.
+        Returns a list of (DesignSuggestion, rank).
+        """
+        query = query.strip()
+        if not query:
+            return []
+        
+        params = {"query": query, "user_id": user_id, "limit": limit}
+        own_suggestion = "AND ds.user_id = %(user_id)s" if user_id is not None else ""
+        own_upload = "AND u.user_id = %(user_id)s" if user_id is not None else ""
+        keyset = ""
+        if before:
+            keyset = "WHERE (rank, id) < (%(before_rank)s, %(before_id)s)"
+            params["before_rank"], params["before_id"] = before
+        
+        with get_db_cursor(conn) as cursor:
+            fuzzy = len(query) <= settings.search_fuzzy_max_length
+            if fuzzy and SearchService._has_trigram(cursor):
+                match = "%(query)s <%% ({text})"
+                score = "word_similarity(%(query)s, {text})"
+                texts = (SUGGESTION_SEARCH_TEXT, TEMPLATE_SEARCH_TEXT, UPLOAD_SEARCH_TEXT)
+            else:
+                if fuzzy:
+                    params["tsquery"] = SearchService._prefix_query(query)
+                    if not params["tsquery"]:
+                        return []
+                    tsquery = "to_tsquery('english', %(tsquery)s)"
+                else:
+                    tsquery = "websearch_to_tsquery('english', %(query)s)"
+                # Inlined rather than a CTE so the planner can estimate its selectivity
+                match = "{text} @@ " + tsquery
+                score = "ts_rank({text}, " + tsquery + ")"
+                texts = ("ds.search_vector", "t.search_vector", "u.search_vector")
+            
+            # One branch per source so each can use its own index (GIN, the
+            # small template table, or the user's rows); a suggestion's rank is
+            # its best branch score
+            suggestion_text, template_text, upload_text = texts
+            cursor.execute(
+                f"""WITH hits AS (
+                        SELECT id, MAX(score)::float8 AS rank
+                        FROM (
+                            SELECT ds.id, {score.format(text=suggestion_text)} AS score
+                            FROM design_suggestions ds
+                            WHERE {match.format(text=suggestion_text)} {own_suggestion}
+                            UNION ALL
+                            SELECT ds.id, {score.format(text=template_text)}
+                            FROM design_templates t
+                            JOIN design_suggestions ds ON ds.template_id = t.id
+                            WHERE {match.format(text=template_text)} {own_suggestion}
+                            UNION ALL
+                            SELECT ds.id, {score.format(text=upload_text)}
+                            FROM uploads u
+                            JOIN design_suggestions ds ON ds.upload_id = u.id
+                            WHERE {match.format(text=upload_text)} {own_upload}
+                        ) branches
+                        GROUP BY id
+                    ),
+                    page AS (
+                        SELECT id, rank FROM hits {keyset}
+                        ORDER BY rank DESC, id DESC
+                        LIMIT %(limit)s
+                    )
+                    SELECT {SUGGESTION_COLUMNS}, page.rank
+                    FROM page
+                    JOIN design_suggestions ds ON ds.id = page.id
+                    JOIN uploads u ON u.id = ds.upload_id
+                    LEFT JOIN design_templates t ON t.id = ds.template_id
+                    ORDER BY page.rank DESC, page.id DESC""",
+                params
+            )
+            results = cursor.fetchall()
+        
+        return [(DesignSuggestionService._to_suggestion(r), r['rank']) for r in results]
@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from app.core.config import get_settings
+from app.services.export_service import SUGGESTION_EXPORT_COLUMNS
+from app.services.upload_service import SUGGESTION_JSON_SELECT
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+settings = get_settings()
+
+# Advisory lock key held while a snapshot is written, so only one worker does
+SNAPSHOT_LOCK_KEY = 280047
+
+# Enum-like columns written as Arrow dictionaries (categoricals when read back)
+DICTIONARY_COLUMNS = {"cloth_type", "occasion", "gender", "age_group", "budget_range", "confidence_score", "template_id"}
+
+_INTEGER_COLUMNS = {"id", "user_id", "upload_id", "design_suggestion_id"}
+_TIMESTAMP_COLUMNS = {"created_at", "saved_at"}
+
+# Table -> (query selecting the partition month first, then the columns)
+SNAPSHOT_TABLES = {
+    "uploads": (
+        """SELECT to_char(created_at, 'YYYY-MM'), id, user_id, file_path, cloth_type, occasion, gender,
+                  age_group, budget_range, size_info, created_at
+           FROM uploads""",
+        ("id", "user_id", "file_path", "cloth_type", "occasion", "gender", "age_group", "budget_range",
+         "size_info", "created_at"),
+    ),
+    "design_suggestions": (
+        f"SELECT to_char(r.created_at, 'YYYY-MM'), r.* FROM ({SUGGESTION_JSON_SELECT}) r",
+        SUGGESTION_EXPORT_COLUMNS,
+    ),
+    "saved_designs": (
+        "SELECT to_char(saved_at, 'YYYY-MM'), id, user_id, design_suggestion_id, saved_at FROM saved_designs",
+        ("id", "user_id", "design_suggestion_id", "saved_at"),
+    ),
+}
+
+
+def _arrow_type(column: str):
+    if column in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if column in _INTEGER_COLUMNS:
+        return pa.int64()
+    if column in _TIMESTAMP_COLUMNS:
+        # Stored without a zone; the database runs in UTC
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _record_batch(schema, rows: list):
+    """Arrow record batch of row tuples, skipping their leading month column"""
+    arrays = []
+    for field, values in zip(schema, list(zip(*rows))[1:]):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class SnapshotService:
+    """Columnar snapshots of uploads, suggestions and saves for offline analysis
+
+    Each snapshot is a directory of Hive-style partitions,
+    <table>/month=YYYY-MM/part-NNNNN.parquet, plus a _manifest.json of row
+    counts. All tables are read in one REPEATABLE READ, read-only
+    transaction through server-side cursors, so the snapshot is consistent
+    and only a few batches are held in memory.
+    """
+
+    @staticmethod
+    def write(conn, directory: str = None, batch_size: int = None, row_group_size: int = None) -> dict:
+        """Write a snapshot under `directory`; returns its manifest, or None if another worker is writing one"""
+        if pa is None:
+            raise RuntimeError("Parquet snapshots need the optional pyarrow package")
+
+        directory = directory or settings.snapshot_dir
+        batch_size = batch_size or settings.snapshot_batch_size
+        row_group_size = row_group_size or settings.snapshot_row_group_size
+        name = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        partial = os.path.join(directory, f".{name}.partial")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", (SNAPSHOT_LOCK_KEY,))
+                if not cursor.fetchone()[0]:
+                    return None
+
+            os.makedirs(partial)
+            manifest = {"snapshot": name, "tables": {}}
+            for table in SNAPSHOT_TABLES:
+                manifest["tables"][table] = SnapshotService._write_table(
+                    conn, table, partial, batch_size, row_group_size
+                )
+            with open(os.path.join(partial, "_manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+        except Exception:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        finally:
+            conn.rollback()
+
+        # Readers only ever see complete snapshots
+        os.rename(partial, os.path.join(directory, name))
+        SnapshotService.prune(directory, settings.snapshot_keep)
+        return manifest
+
+    @staticmethod
+    def _write_table(conn, table: str, directory: str, batch_size: int, row_group_size: int) -> dict:
+        """Stream one table into month partitions; returns {"rows": n, "months": {month: n}}"""
+        query, columns = SNAPSHOT_TABLES[table]
+        schema = pa.schema([(column, _arrow_type(column)) for column in columns])
+        pending, months, parts = {}, {}, {}
+        os.makedirs(os.path.join(directory, table))
+
+        def flush(month: str):
+            # Each row group is its own file, so no writer stays open (and
+            # holds buffers) while other months are scanned
+            partition = os.path.join(directory, table, f"month={month}")
+            if month not in parts:
+                os.makedirs(partition)
+                parts[month] = 0
+            pq.write_table(
+                pa.Table.from_batches(pending.pop(month)),
+                os.path.join(partition, f"part-{parts[month]:05d}.parquet"),
+                row_group_size=row_group_size,
+                compression=settings.snapshot_compression,
+            )
+            parts[month] += 1
+
+        # A plain scan, not ORDER BY (no sort of the whole table). Each
+        # fetched batch is converted to Arrow at once (far smaller than the
+        # row tuples), and a month's batches are buffered until they fill a
+        # row group
+        cursor = conn.cursor(name=f"snapshot_{table}")
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                by_month = {}
+                for row in rows:
+                    by_month.setdefault(row[0], []).append(row)
+                del rows
+                for month, month_rows in by_month.items():
+                    pending.setdefault(month, []).append(_record_batch(schema, month_rows))
+                    months[month] = months.get(month, 0) + len(month_rows)
+                # A month absent from this batch has most likely been scanned
+                # past (rows are mostly in insertion order)
+                for month in [month for month, batches in pending.items()
+                              if month not in by_month or sum(len(b) for b in batches) >= row_group_size]:
+                    flush(month)
+                # Rows of many months interleaved (reused heap space): flush
+                # the largest buffers early rather than hold them all
+                sizes = {month: sum(len(b) for b in batches) for month, batches in pending.items()}
+                while sum(sizes.values()) > 2 * row_group_size:
+                    month = max(sizes, key=sizes.get)
+                    flush(month)
+                    del sizes[month]
+            for month in list(pending):
+                flush(month)
+        finally:
+            cursor.close()
+
+        return {"rows": sum(months.values()), "months": dict(sorted(months.items()))}
+
+    @staticmethod
+    def prune(directory: str, keep: int):
+        """Delete all but the newest `keep` complete snapshots"""
+        snapshots = sorted(
+            entry for entry in os.listdir(directory)
+            if not entry.startswith(".") and os.path.isfile(os.path.join(directory, entry, "_manifest.json"))
+        )
+        for entry in snapshots[:-keep] if keep > 0 else []:
+            shutil.rmtree(os.path.join(directory, entry))
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import numpy as np
+from functools import lru_cache
+from app.models.upload import ClothType, Occasion, BudgetRange
+from app.utils.image_features import COLOR_FAMILIES
+
+
+CLOTH_TYPES = [c.value for c in ClothType]
+OCCASIONS = [o.value for o in Occasion]
+
+# Garment families let sparse cloth types borrow from similar garments
+CLOTH_FAMILIES = {
+    "saree": "drape",
+    "dupatta": "drape",
+    "shawl": "drape",
+    "kurti": "top",
+    "blouse": "top",
+    "shirt": "top",
+    "lehenga": "ensemble",
+    "dress": "ensemble",
+}
+FAMILIES = ["drape", "top", "ensemble"]
+
+# How heavy the work is expected to be for each budget (0 = minimal, 1 = premium)
+BUDGET_HEAVINESS = {
+    BudgetRange.LOW.value: 0.0,
+    BudgetRange.MEDIUM.value: 0.5,
+    BudgetRange.HIGH.value: 1.0,
+}
+
+HEAVY_KEYWORDS = ("heavy", "zari", "stone", "bead", "intricate")
+MEDIUM_KEYWORDS = ("medium", "sequin", "mirror", "threadwork", "mixed")
+
+# Color words found in template text mapped onto image color families
+COLOR_KEYWORDS = {
+    "red": ["red"],
+    "maroon": ["maroon"],
+    "burgundy": ["maroon"],
+    "rich": ["maroon"],
+    "pink": ["pink"],
+    "peach": ["pink", "orange"],
+    "orange": ["orange"],
+    "gold": ["gold"],
+    "zari": ["gold"],
+    "metallic": ["gold", "neutral"],
+    "green": ["green"],
+    "emerald": ["green"],
+    "mint": ["green", "white"],
+    "jewel": ["green", "blue", "purple"],
+    "blue": ["blue"],
+    "navy": ["blue", "black"],
+    "purple": ["purple"],
+    "black": ["black"],
+    "dark": ["black"],
+    "white": ["white"],
+    "ivory": ["white"],
+    "cream": ["white"],
+    "bridal": ["white", "gold", "pink"],
+    "pastel": ["pink", "blue", "white"],
+    "light": ["white"],
+    "silver": ["neutral"],
+    "gray": ["neutral"],
+    "beige": ["neutral"],
+    "earthy": ["neutral", "orange"],
+    "neutral": ["neutral", "white"],
+    "professional": ["neutral", "white"],
+    "vibrant": ["orange", "pink", "purple"],
+}
+
+# Relative weight of each feature block in the similarity score
+CLOTH_WEIGHT = 2.5
+FAMILY_WEIGHT = 1.5
+OCCASION_WEIGHT = 3.0
+HEAVINESS_WEIGHT = 1.0
+COLOR_WEIGHT = 1.0
+
+
+def _one_hot(values: list, value: str) -> np.ndarray:
+    vector = np.zeros(len(values), dtype=np.float32)
+    if value in values:
+        vector[values.index(value)] = 1.0
+    return vector
+
+
+def _template_heaviness(embroidery: str) -> float:
+    text = embroidery.lower()
+    if any(word in text for word in HEAVY_KEYWORDS):
+        return 1.0
+    if any(word in text for word in MEDIUM_KEYWORDS):
+        return 0.5
+    return 0.0
+
+
+def _template_colors(color_text: str) -> np.ndarray:
+    vector = np.zeros(len(COLOR_FAMILIES), dtype=np.float32)
+    text = color_text.lower()
+    for keyword, families in COLOR_KEYWORDS.items():
+        if keyword in text:
+            for family in families:
+                vector[COLOR_FAMILIES.index(family)] += 1.0
+    total = vector.sum()
+    return vector / total if total else vector
+
+
+def encode_style(embroidery: str, color_text: str) -> np.ndarray:
+    """Encode the style part of a design (work heaviness and colors)"""
+    heaviness = _template_heaviness(embroidery)
+    return np.concatenate([
+        np.array([heaviness, 1.0 - heaviness], dtype=np.float32) * HEAVINESS_WEIGHT,
+        _template_colors(color_text) * COLOR_WEIGHT,
+    ]).astype(np.float32)
+
+
+STYLE_DIM = 2 + len(COLOR_FAMILIES)
+
+
+def encode_features(cloth_type: str, occasion: str, heaviness: float,
+                    colors: np.ndarray = None) -> np.ndarray:
+    """Encode attributes and a color histogram as a single feature vector"""
+    if colors is None:
+        colors = np.zeros(len(COLOR_FAMILIES), dtype=np.float32)
+
+    return np.concatenate([
+        _one_hot(CLOTH_TYPES, cloth_type) * CLOTH_WEIGHT,
+        _one_hot(FAMILIES, CLOTH_FAMILIES.get(cloth_type)) * FAMILY_WEIGHT,
+        _one_hot(OCCASIONS, occasion) * OCCASION_WEIGHT,
+        np.array([heaviness, 1.0 - heaviness], dtype=np.float32) * HEAVINESS_WEIGHT,
+        colors * COLOR_WEIGHT,
+    ]).astype(np.float32)
+
+
+def template_id(cloth_type: str, occasion: str, template: dict) -> str:
+    """Stable ID of a catalog template, derived from its text
+
+    Editing a template gives it a new ID (and a new design_templates row),
+    so suggestions stored against the old one keep their original text;
+    reordering the catalog changes nothing.
+    """
+    digest = hashlib.sha1(json.dumps(template, sort_keys=True).encode()).hexdigest()[:12]
+    return f"{cloth_type}:{occasion}:{digest}"
+
+
+class TemplateIndex:
+    """Cosine similarity index over the design template catalog"""
+
+    def __init__(self, templates: dict):
+        self.template_ids = []
+        self.templates = []
+        self.keys = []
+        # (cloth_type, occasion) -> positions of its templates
+        self.key_positions = {}
+
+        rows = []
+        styles = []
+        for cloth_type, occasions in templates.items():
+            for occasion, options in occasions.items():
+                for template in options:
+                    self.key_positions.setdefault((cloth_type, occasion), []).append(len(self.templates))
+                    self.template_ids.append(template_id(cloth_type, occasion, template))
+                    self.templates.append(template)
+                    self.keys.append((cloth_type, occasion))
+                    rows.append(encode_features(
+                        cloth_type,
+                        occasion,
+                        _template_heaviness(template["embroidery"]),
+                        _template_colors(template["color"]),
+                    ))
+                    styles.append(encode_style(template["embroidery"], template["color"]))
+
+        matrix = np.vstack(rows)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1.0, norms)
+        self.positions = {tid: i for i, tid in enumerate(self.template_ids)}
+        # Changes whenever any template text changes (part of suggestion ETags)
+        self.version = hashlib.sha1(json.dumps(templates, sort_keys=True).encode()).hexdigest()[:12]
+
+        styles = np.vstack(styles)
+        style_norms = np.linalg.norm(styles, axis=1, keepdims=True)
+        self.style_matrix = styles / np.where(style_norms == 0, 1.0, style_norms)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def encode_upload(self, cloth_type: str, occasion: str, budget_range: str,
+                      colors: np.ndarray = None) -> np.ndarray:
+        """Encode an upload as a query vector"""
+        heaviness = BUDGET_HEAVINESS.get(budget_range, 0.5)
+        return encode_features(cloth_type, occasion, heaviness, colors)
+
+    def score(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a query against every template"""
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return np.zeros(len(self.templates), dtype=np.float32)
+        return self.matrix @ (query / norm)
+
+    def style_score(self, preference: np.ndarray) -> np.ndarray:
+        """Affinity of a (not normalized) style preference vector for every template"""
+        return self.style_matrix @ preference
+
+    def score_many(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a batch of queries (one per row) against every template"""
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        return (queries / np.where(norms == 0, 1.0, norms)) @ self.matrix.T
+
+    def nearest(self, query: np.ndarray, k: int = 5) -> list:
+        """Get the top k (position, score) pairs for a query"""
+        scores = self.score(query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+@lru_cache()
+def get_template_index() -> TemplateIndex:
+    """Get the template index, built once per process"""
+    from app.services.design_suggestion_service import DesignSuggestionEngine
+    return TemplateIndex(DesignSuggestionEngine.DESIGN_TEMPLATES)
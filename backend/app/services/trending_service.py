@@ -0,0 +1,224 @@
+import re
+import threading
+import time
+from functools import lru_cache
+from app.core.config import get_settings
+from app.core.database import get_db_cursor
+
+settings = get_settings()
+
+# Trend terms found in suggestion text mapped to the label shown on the
+# dashboard; longer phrases win over the words inside them
+COLOR_TERMS = {
+    "royal blue": "Royal Blue", "sky blue": "Sky Blue", "light blue": "Light Blue",
+    "mint green": "Mint Green", "light pink": "Light Pink",
+    "red": "Red", "maroon": "Maroon", "burgundy": "Burgundy", "pink": "Pink", "peach": "Peach",
+    "orange": "Orange", "gold": "Gold", "emerald": "Emerald", "green": "Green", "blue": "Blue",
+    "navy": "Navy", "purple": "Purple", "black": "Black", "white": "White", "ivory": "Ivory",
+    "cream": "Cream", "silver": "Silver", "gray": "Gray", "grey": "Gray", "beige": "Beige",
+    "pastel": "Pastel", "metallic": "Metallic",
+}
+PATTERN_TERMS = {
+    "zari": "Zari", "block print": "Block Print", "mirror work": "Mirror Work", "mirror": "Mirror Work",
+    "sequin": "Sequins", "beadwork": "Beadwork", "bead": "Beadwork", "stone work": "Stone Work",
+    "stone": "Stone Work", "cutwork": "Cutwork", "threadwork": "Threadwork", "thread work": "Threadwork",
+    "floral": "Floral", "geometric": "Geometric", "ethnic motif": "Ethnic Motifs",
+    "embroidery": "Embroidery", "embroidered": "Embroidery", "print": "Print",
+}
+
+
+def _terms_pattern(terms: dict) -> re.Pattern:
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b({alternatives})s?\b", re.IGNORECASE)
+
+
+_COLOR_PATTERN = _terms_pattern(COLOR_TERMS)
+_PATTERN_PATTERN = _terms_pattern(PATTERN_TERMS)
+
+
+def extract_terms(text: str, pattern: re.Pattern, terms: dict) -> set:
+    """Dashboard labels of the trend terms in a piece of suggestion text"""
+    if not text:
+        return set()
+    return {terms[match.lower()] for match in pattern.findall(text)}
+
+
+class DecayedCounter:
+    """Exponentially time-decayed counts per key
+
+    A count added at time t is stored as weight * 2^((t - reference) / half_life),
+    so adding never touches other keys and the ranking never changes as time
+    passes; reading divides by the same factor at the read time. The reference
+    is moved forward before the stored values can overflow.
+    """
+
+    REBASE_HALF_LIVES = 256
+
+    def __init__(self, half_life_seconds: float, reference: float = None):
+        self.half_life = half_life_seconds
+        self.reference = time.time() if reference is None else reference
+        self.values = {}
+        self._ranked = None
+
+    def growth(self, timestamp: float) -> float:
+        """Stored weight of one count at `timestamp`"""
+        return 2.0 ** ((timestamp - self.reference) / self.half_life)
+
+    def add_stored(self, key, amount: float):
+        """Add an amount already expressed in stored units (see growth())"""
+        self.values[key] = self.values.get(key, 0.0) + amount
+        self._ranked = None
+
+    def rebase(self, reference: float):
+        """Move the reference time, rescaling stored values"""
+        factor = 2.0 ** ((self.reference - reference) / self.half_life)
+        self.values = {key: value * factor for key, value in self.values.items()}
+        self.reference = reference
+        self._ranked = None
+
+    def maybe_rebase(self, now: float):
+        if now - self.reference > self.REBASE_HALF_LIVES * self.half_life:
+            self.rebase(now)
+
+    def top(self, k: int, now: float = None) -> list:
+        """[(key, decayed count at `now`)] of the k highest keys"""
+        if self._ranked is None:
+            self._ranked = sorted(self.values.items(), key=lambda item: item[1], reverse=True)
+        scale = 1.0 / self.growth(time.time() if now is None else now)
+        return [(key, value * scale) for key, value in self._ranked[:k]]
+
+
+class TrendTracker:
+    """Decayed color and pattern counts over suggestions and saves
+
+    refresh() folds in only rows with ids past the last refresh, aggregated
+    per distinct text in SQL. Rows older than HORIZON_HALF_LIVES
+    half-lives are skipped on the first load: they would weigh almost nothing.
+    Ids are allocated at insert but rows appear at commit, so ids missing
+    below the last one seen are remembered as gaps and folded in if they
+    show up within OVERLAP_SECONDS (gaps of rolled back or deleted rows
+    expire). Rows committed later than that are missed. Unsaving a design
+    does not subtract its save: it counts as activity at the time it happened.
+    """
+
+    HORIZON_HALF_LIVES = 10
+    OVERLAP_SECONDS = 300
+
+    # Per source: table, timestamp column, alias, and the rows joined to their suggestion (`ds`)
+    SOURCES = {
+        "suggestions": ("design_suggestions", "created_at", "ds", "design_suggestions ds"),
+        "saves": ("saved_designs", "saved_at", "sd",
+                  "saved_designs sd JOIN design_suggestions ds ON ds.id = sd.design_suggestion_id"),
+    }
+
+    def __init__(self, half_life_hours: float, save_weight: float):
+        self.half_life = half_life_hours * 3600
+        self.save_weight = save_weight
+        self.colors = DecayedCounter(self.half_life)
+        self.patterns = DecayedCounter(self.half_life, self.colors.reference)
+        # Per source: highest id folded in (None before the first refresh),
+        # and {missing id below it: when it was first missed}
+        self.last_ids = {source: None for source in self.SOURCES}
+        self.gaps = {source: {} for source in self.SOURCES}
+        self.refreshed_at = None
+        self.refresh_ms = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, conn):
+        """Fold in suggestions and saves committed since the last refresh"""
+        with self._lock:
+            started = time.perf_counter()
+            now = time.time()
+            self.colors.maybe_rebase(now)
+            self.patterns.maybe_rebase(now)
+
+            with get_db_cursor(conn) as cursor:
+                # Upper bounds first, so rows arriving meanwhile wait for the
+                # next refresh instead of being skipped
+                cursor.execute(
+                    """SELECT COALESCE((SELECT MAX(id) FROM design_suggestions), 0) AS suggestions,
+                              COALESCE((SELECT MAX(id) FROM saved_designs), 0) AS saves"""
+                )
+                latest = cursor.fetchone()
+                
+                for source, weight in (("suggestions", 1.0), ("saves", self.save_weight)):
+                    for r in self._new_rows(cursor, source, latest[source], now):
+                        amount = float(r['weight']) * weight
+                        for label in extract_terms(r['color'], _COLOR_PATTERN, COLOR_TERMS):
+                            self.colors.add_stored(label, amount)
+                        for label in extract_terms(r['pattern'], _PATTERN_PATTERN, PATTERN_TERMS):
+                            self.patterns.add_stored(label, amount)
+
+            self.refreshed_at = now
+            self.refresh_ms = (time.perf_counter() - started) * 1000
+
+    def _new_rows(self, cursor, source: str, latest_id: int, now: float) -> list:
+        """Stored weight of each distinct (color, pattern) text of the source's new rows
+
+        A suggestion counts at created_at, a save at saved_at.
+        """
+        table, column, alias, rows = self.SOURCES[source]
+        last_id = self.last_ids[source]
+        gaps = self.gaps[source]
+        params = {
+            "reference": self.colors.reference,
+            "half_life": self.half_life,
+            "horizon": self.HORIZON_HALF_LIVES * self.half_life,
+            "overlap_start": now - self.OVERLAP_SECONDS,
+            "last_id": last_id or 0,
+            "latest_id": latest_id,
+            "gaps": list(gaps),
+        }
+        
+        # Ids still missing: new ones in the range read now (on the first
+        # load, from the rows of the overlap window on), and earlier gaps.
+        # They are left out below even if they commit in between, and read
+        # by a later refresh
+        if last_id is None:
+            first = f"""(SELECT COALESCE(MIN(id), %(latest_id)s + 1) FROM {table}
+                         WHERE {column} > to_timestamp(%(overlap_start)s))"""
+        else:
+            first = "%(last_id)s + 1"
+        cursor.execute(
+            f"""SELECT c.id
+                FROM (SELECT generate_series({first}, %(latest_id)s) AS id
+                      UNION SELECT unnest(%(gaps)s::int[])) c
+                WHERE NOT EXISTS (SELECT 1 FROM {table} x WHERE x.id = c.id)""",
+            params
+        )
+        params["missing"] = [r['id'] for r in cursor.fetchall()]
+        
+        cursor.execute(
+            f"""SELECT COALESCE(ds.color_combination, t.color) AS color,
+                       COALESCE(ds.embroidery_pattern, t.embroidery) AS pattern,
+                       SUM(power(2.0, (extract(epoch FROM {alias}.{column})::float8 - %(reference)s) / %(half_life)s)) AS weight
+                FROM {rows}
+                LEFT JOIN design_templates t ON t.id = ds.template_id
+                WHERE (({alias}.id > %(last_id)s AND {alias}.id <= %(latest_id)s) OR {alias}.id = ANY(%(gaps)s::int[]))
+                  AND NOT {alias}.id = ANY(%(missing)s::int[])
+                  AND {alias}.{column} > now() - make_interval(secs => %(horizon)s)
+                GROUP BY 1, 2""",
+            params
+        )
+        result = cursor.fetchall()
+        
+        self.gaps[source] = {
+            gap: gaps.get(gap, now) for gap in params["missing"]
+            if gaps.get(gap, now) > params["overlap_start"]
+        }
+        self.last_ids[source] = max(last_id or 0, latest_id)
+        return result
+
+    def top_colors(self, k: int) -> list:
+        with self._lock:
+            return self.colors.top(k)
+
+    def top_patterns(self, k: int) -> list:
+        with self._lock:
+            return self.patterns.top(k)
+
+
+@lru_cache()
+def get_trend_tracker() -> TrendTracker:
+    """Get the process-wide trend tracker"""
+    return TrendTracker(settings.trending_half_life_hours, settings.trending_save_weight)
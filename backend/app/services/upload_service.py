@@ -1,9 +1,27 @@
+import string
+from datetime import timedelta
+import psycopg2.extras
 from app.models.upload import Upload
 from app.models.design_suggestion import DesignSuggestion
 from app.models.saved_design import SavedDesign
-from app.schemas.upload import UploadCreate
+from app.schemas.upload import UploadCreate, UploadFilters
 from app.models.user import User
 from app.core.database import get_db_cursor
+from app.services.design_suggestion_service import DesignSuggestionEngine
+from app.services.template_index import get_template_index
+from app.services.preference_service import PreferenceService
+from app.services.recommendation_service import RecommendationService
+from app.utils.etag import StampCache, make_etag
+
+# Uploads and suggestions are never updated, so their version stamps are
+# cached per process: conditional GETs answer 304 without a query
+_upload_stamps = StampCache()
+_upload_suggestions_stamps = StampCache()
+_suggestion_stamps = StampCache()
+
+UPLOAD_COLUMNS = "id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, size_info, created_at"
+# Same fields as UploadListResponse, for json_agg
+UPLOAD_LIST_COLUMNS = "id, cloth_type, occasion, file_path, created_at, user_id"
 
 
 class UploadService:
@@ -20,7 +38,7 @@ class UploadService:
                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                    RETURNING id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, size_info, created_at""",
                 (user_id, file_path, upload.cloth_type, upload.occasion, upload.gender, 
-                 upload.age_group, upload.budget_range, getattr(upload, 'size_info', None))
+                 upload.age_group, upload.budget_range, upload.fabric_description)
             )
             result = cursor.fetchone()
             
@@ -67,16 +85,90 @@ class UploadService:
         return None
     
     @staticmethod
-    def get_user_uploads(conn, user_id: int, skip: int = 0, limit: int = 10) -> list:
-        """Get user uploads"""
-        from app.core.database import get_db_cursor
-        
+    def get_user_upload(conn, upload_id: int, user_id: int) -> Upload:
+        """Get an upload owned by the user, or None if missing or someone else's"""
         with get_db_cursor(conn) as cursor:
             cursor.execute(
-                """SELECT id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, size_info, created_at 
-                   FROM uploads WHERE user_id = %s ORDER BY created_at DESC OFFSET %s LIMIT %s""",
-                (user_id, skip, limit)
+                """SELECT id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, size_info, created_at
+                   FROM uploads WHERE id = %s AND user_id = %s""",
+                (upload_id, user_id)
+            )
+            result = cursor.fetchone()
+        
+        if result:
+            return Upload(
+                id=result['id'],
+                user_id=result['user_id'],
+                file_path=result['file_path'],
+                cloth_type=result['cloth_type'],
+                occasion=result['occasion'],
+                gender=result['gender'],
+                age_group=result['age_group'],
+                budget_range=result['budget_range'],
+                size_info=result['size_info'],
+                created_at=result['created_at']
             )
+        return None
+    
+    @staticmethod
+    def cached_upload_stamp(upload_id: int, user_id: int):
+        """Get the cached (ETag, Last-Modified) of the user's upload, without a query"""
+        stamp = _upload_stamps.get(upload_id)
+        if stamp and stamp[0] == user_id:
+            return stamp[1:]
+        return None
+    
+    @staticmethod
+    def upload_stamp(upload: Upload) -> tuple:
+        """Get (ETag, Last-Modified) of an upload and cache it"""
+        stamp = (upload.user_id, make_etag("upload", upload.id), upload.created_at)
+        _upload_stamps.put(upload.id, stamp)
+        return stamp[1:]
+    
+    @staticmethod
+    def filter_clause(user_id: int = None, filters: UploadFilters = None) -> tuple:
+        """Build the (WHERE clause, params) selecting a user's and/or filtered uploads
+        
+        Every filter compares a bare column against a parameter, so the
+        (user_id, ...) and (cloth_type/occasion/budget_range, created_at)
+        indexes serve it; created_to is inclusive and becomes
+        created_at < the next day.
+        """
+        conditions = []
+        params = []
+        if user_id is not None:
+            conditions.append("user_id = %s")
+            params.append(user_id)
+        if filters:
+            for column in ("cloth_type", "occasion", "budget_range"):
+                value = getattr(filters, column)
+                if value is not None:
+                    conditions.append(f"{column} = %s")
+                    params.append(value.value)
+            if filters.created_from:
+                conditions.append("created_at >= %s")
+                params.append(filters.created_from)
+            if filters.created_to:
+                conditions.append("created_at < %s")
+                params.append(filters.created_to + timedelta(days=1))
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+    
+    @staticmethod
+    def listing_query(columns: str, user_id: int = None, filters: UploadFilters = None,
+                      skip: int = 0, limit: int = 10) -> tuple:
+        """Build the (query, params) of an upload listing, newest first"""
+        where, params = UploadService.filter_clause(user_id, filters)
+        query = f"SELECT {columns} FROM uploads {where} ORDER BY created_at DESC OFFSET %s LIMIT %s"
+        return query, tuple(params) + (skip, limit)
+    
+    @staticmethod
+    def get_user_uploads(conn, user_id: int, skip: int = 0, limit: int = 10, filters: UploadFilters = None) -> list:
+        """Get user uploads"""
+        query, params = UploadService.listing_query(UPLOAD_COLUMNS, user_id, filters, skip, limit)
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(query, params)
             results = cursor.fetchall()
         
         return [Upload(
@@ -93,16 +185,11 @@ class UploadService:
         ) for r in results]
     
     @staticmethod
-    def get_all_uploads(conn, skip: int = 0, limit: int = 10) -> list:
+    def get_all_uploads(conn, skip: int = 0, limit: int = 10, filters: UploadFilters = None) -> list:
         """Get all uploads (admin)"""
-        from app.core.database import get_db_cursor
-        
+        query, params = UploadService.listing_query(UPLOAD_COLUMNS, None, filters, skip, limit)
         with get_db_cursor(conn) as cursor:
-            cursor.execute(
-                """SELECT id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, size_info, created_at 
-                   FROM uploads ORDER BY created_at DESC OFFSET %s LIMIT %s""",
-                (skip, limit)
-            )
+            cursor.execute(query, params)
             results = cursor.fetchall()
         
         return [Upload(
@@ -118,6 +205,19 @@ class UploadService:
             created_at=r['created_at']
         ) for r in results]
     
+    @staticmethod
+    def get_user_uploads_json(conn, user_id: int, skip: int = 0, limit: int = 10,
+                              filters: UploadFilters = None) -> bytes:
+        """Get user uploads as a Postgres-rendered UploadListResponse array"""
+        query, params = UploadService.listing_query(UPLOAD_LIST_COLUMNS, user_id, filters, skip, limit)
+        return json_list(conn, query, params, "r.created_at DESC")
+    
+    @staticmethod
+    def get_all_uploads_json(conn, skip: int = 0, limit: int = 10, filters: UploadFilters = None) -> bytes:
+        """Get all uploads (admin) as a Postgres-rendered UploadListResponse array"""
+        query, params = UploadService.listing_query(UPLOAD_LIST_COLUMNS, None, filters, skip, limit)
+        return json_list(conn, query, params, "r.created_at DESC")
+    
     @staticmethod
     def get_uploads_count(conn) -> int:
         """Get total uploads count"""
@@ -130,24 +230,156 @@ class UploadService:
         return result['count'] if result else 0
 
 
+# Suggestion text lives on the row for rule-based suggestions and in
+# design_templates for catalog-based ones; the description of catalog-based
+# suggestions is rendered on read from the upload's cloth type and occasion.
+SUGGESTION_COLUMNS = """ds.id, ds.upload_id, ds.user_id,
+       COALESCE(ds.neck_design, t.neck) AS neck_design,
+       COALESCE(ds.sleeve_style, t.sleeve) AS sleeve_style,
+       COALESCE(ds.embroidery_pattern, t.embroidery) AS embroidery_pattern,
+       COALESCE(ds.color_combination, t.color) AS color_combination,
+       COALESCE(ds.border_style, t.border) AS border_style,
+       ds.description, ds.confidence_score, ds.template_id, ds.created_at,
+       u.cloth_type AS upload_cloth_type, u.occasion AS upload_occasion"""
+
+SUGGESTION_SELECT = f"""SELECT {SUGGESTION_COLUMNS}
+FROM design_suggestions ds
+JOIN uploads u ON u.id = ds.upload_id
+LEFT JOIN design_templates t ON t.id = ds.template_id"""
+
+
+def _sql_literal(text: str) -> str:
+    return "'" + text.replace("'", "''").replace("%", "%%") + "'"
+
+
+def _description_sql() -> str:
+    """DesignSuggestionEngine.DESCRIPTION_FORMAT as a SQL expression over SUGGESTION_SELECT"""
+    fabric = "CASE lower(btrim(u.cloth_type)) " + " ".join(
+        f"WHEN {_sql_literal(cloth_type)} THEN {_sql_literal(fabric)}"
+        for cloth_type, fabric in DesignSuggestionEngine.FABRIC_TYPES.items()
+    ) + f" ELSE {_sql_literal('premium fabric')} END"
+    fields = {
+        "fabric": fabric,
+        "cloth_type": "u.cloth_type",
+        "neck": "lower(t.neck)",
+        "embroidery": "lower(t.embroidery)",
+        "color": "lower(t.color)",
+        "occasion": "lower(btrim(u.occasion))",
+        "sleeve": "lower(t.sleeve)",
+        "border": "lower(t.border)",
+    }
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(DesignSuggestionEngine.DESCRIPTION_FORMAT):
+        if literal:
+            parts.append(_sql_literal(literal))
+        if field:
+            parts.append(fields[field])
+    return " || ".join(parts)
+
+
+# Same fields as DesignSuggestionResponse, description included, for json_agg
+SUGGESTION_JSON_SELECT = f"""SELECT ds.id, ds.upload_id, ds.user_id,
+       COALESCE(ds.neck_design, t.neck) AS neck_design,
+       COALESCE(ds.sleeve_style, t.sleeve) AS sleeve_style,
+       COALESCE(ds.embroidery_pattern, t.embroidery) AS embroidery_pattern,
+       COALESCE(ds.color_combination, t.color) AS color_combination,
+       COALESCE(ds.border_style, t.border) AS border_style,
+       COALESCE(ds.description, {_description_sql()}) AS description,
+       ds.confidence_score, ds.template_id, ds.created_at
+FROM design_suggestions ds
+JOIN uploads u ON u.id = ds.upload_id
+LEFT JOIN design_templates t ON t.id = ds.template_id"""
+
+
+def json_list(conn, query: str, params: tuple, order_by: str) -> bytes:
+    """Run a listing query and have Postgres render its rows as a JSON array
+
+    `order_by` is applied inside json_agg and refers to the query's output
+    columns through the alias `r`.
+    """
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            f"SELECT COALESCE(json_agg(r ORDER BY {order_by}), '[]')::text AS body FROM ({query}) r",
+            params
+        )
+        return cursor.fetchone()['body'].encode()
+
+
 class DesignSuggestionService:
     """Design suggestion service"""
     
+    @staticmethod
+    def _to_suggestion(r) -> DesignSuggestion:
+        """Build a suggestion from a SUGGESTION_SELECT row"""
+        description = r['description']
+        if description is None and r['template_id'] and r['neck_design'] is not None:
+            # The text columns come from the joined design_templates row,
+            # the same source _description_sql() renders from
+            description = DesignSuggestionEngine.render_template_description(
+                r['upload_cloth_type'], r['upload_occasion'], r['neck_design'], r['sleeve_style'],
+                r['embroidery_pattern'], r['color_combination'], r['border_style']
+            )
+        
+        return DesignSuggestion(
+            id=r['id'],
+            upload_id=r['upload_id'],
+            user_id=r['user_id'],
+            neck_design=r['neck_design'],
+            sleeve_style=r['sleeve_style'],
+            embroidery_pattern=r['embroidery_pattern'],
+            color_combination=r['color_combination'],
+            border_style=r['border_style'],
+            description=description,
+            confidence_score=r['confidence_score'],
+            template_id=r['template_id'],
+            created_at=r['created_at']
+        )
+    
+    @staticmethod
+    def sync_templates(conn):
+        """Insert the in-code template catalog into design_templates
+
+        Rows are never updated: IDs are derived from the template text, so an
+        edited template is a new row and suggestions stored against the old
+        one keep rendering their original text.
+        """
+        index = get_template_index()
+        rows = [
+            (template_id, cloth_type, occasion, t["neck"], t["sleeve"], t["embroidery"], t["color"], t["border"])
+            for template_id, (cloth_type, occasion), t in zip(index.template_ids, index.keys, index.templates)
+        ]
+        
+        with get_db_cursor(conn) as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO design_templates (id, cloth_type, occasion, neck, sleeve, embroidery, color, border)
+                   VALUES %s
+                   ON CONFLICT (id) DO NOTHING""",
+                rows
+            )
+    
     @staticmethod
     def create_suggestion(conn, upload_id: int, user_id: int, suggestion_data: dict) -> DesignSuggestion:
         """Create design suggestion"""
         from app.core.database import get_db_cursor
         
+        # Catalog-based suggestions only store the template reference
+        template_id = suggestion_data.get('template_id')
+        if template_id:
+            text = (None, None, None, None, None, None)
+        else:
+            text = (suggestion_data['neck_design'], suggestion_data['sleeve_style'],
+                    suggestion_data['embroidery_pattern'], suggestion_data['color_combination'],
+                    suggestion_data['border_style'], suggestion_data['description'])
+        
         with get_db_cursor(conn) as cursor:
             cursor.execute(
                 """INSERT INTO design_suggestions 
-                   (upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                   RETURNING id, upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score, created_at""",
-                (upload_id, user_id, suggestion_data['neck_design'], suggestion_data['sleeve_style'],
-                 suggestion_data['embroidery_pattern'], suggestion_data['color_combination'],
-                 suggestion_data['border_style'], suggestion_data['description'],
-                 suggestion_data.get('confidence_score', 'High'))
+                   (upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score, template_id)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                   RETURNING id, upload_id, user_id, confidence_score, template_id, created_at""",
+                (upload_id, user_id, *text,
+                 suggestion_data.get('confidence_score', 'High'), template_id)
             )
             result = cursor.fetchone()
             
@@ -156,13 +388,14 @@ class DesignSuggestionService:
                     id=result['id'],
                     upload_id=result['upload_id'],
                     user_id=result['user_id'],
-                    neck_design=result['neck_design'],
-                    sleeve_style=result['sleeve_style'],
-                    embroidery_pattern=result['embroidery_pattern'],
-                    color_combination=result['color_combination'],
-                    border_style=result['border_style'],
-                    description=result['description'],
+                    neck_design=suggestion_data['neck_design'],
+                    sleeve_style=suggestion_data['sleeve_style'],
+                    embroidery_pattern=suggestion_data['embroidery_pattern'],
+                    color_combination=suggestion_data['color_combination'],
+                    border_style=suggestion_data['border_style'],
+                    description=suggestion_data['description'],
                     confidence_score=result['confidence_score'],
+                    template_id=result['template_id'],
                     created_at=result['created_at']
                 )
         return None
@@ -174,28 +407,94 @@ class DesignSuggestionService:
         
         with get_db_cursor(conn) as cursor:
             cursor.execute(
-                """SELECT id, upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score, created_at 
-                   FROM design_suggestions WHERE id = %s""",
+                f"{SUGGESTION_SELECT} WHERE ds.id = %s",
                 (suggestion_id,)
             )
             result = cursor.fetchone()
         
         if result:
-            return DesignSuggestion(
-                id=result['id'],
-                upload_id=result['upload_id'],
-                user_id=result['user_id'],
-                neck_design=result['neck_design'],
-                sleeve_style=result['sleeve_style'],
-                embroidery_pattern=result['embroidery_pattern'],
-                color_combination=result['color_combination'],
-                border_style=result['border_style'],
-                description=result['description'],
-                confidence_score=result['confidence_score'],
-                created_at=result['created_at']
+            return DesignSuggestionService._to_suggestion(result)
+        return None
+    
+    @staticmethod
+    def get_user_suggestion(conn, suggestion_id: int, user_id: int) -> DesignSuggestion:
+        """Get a suggestion owned by the user, or None if missing or someone else's"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                f"{SUGGESTION_SELECT} WHERE ds.id = %s AND ds.user_id = %s",
+                (suggestion_id, user_id)
             )
+            result = cursor.fetchone()
+        
+        if result:
+            return DesignSuggestionService._to_suggestion(result)
+        return None
+    
+    @staticmethod
+    def cached_suggestion_stamp(suggestion_id: int, user_id: int):
+        """Get the cached (ETag, Last-Modified) of the user's suggestion, without a query"""
+        stamp = _suggestion_stamps.get(suggestion_id)
+        if stamp and stamp[0] == user_id:
+            return stamp[1:]
+        return None
+    
+    @staticmethod
+    def suggestion_stamp(suggestion: DesignSuggestion) -> tuple:
+        """Get (ETag, Last-Modified) of a suggestion and cache it"""
+        # Catalog-based text comes from the templates, so their version is part of the tag
+        stamp = (suggestion.user_id, make_etag("suggestion", suggestion.id, get_template_index().version),
+                 suggestion.created_at)
+        _suggestion_stamps.put(suggestion.id, stamp)
+        return stamp[1:]
+    
+    @staticmethod
+    def cached_upload_suggestions_stamp(upload_id: int, user_id: int):
+        """Get the cached (ETag, Last-Modified) of the suggestions of the user's upload, without a query"""
+        stamp = _upload_suggestions_stamps.get(upload_id)
+        if stamp and stamp[0] == user_id:
+            return stamp[1:]
         return None
     
+    @staticmethod
+    def _upload_suggestions_stamp(upload_id: int, user_id: int, r) -> tuple:
+        """Get (ETag, Last-Modified) of an upload's suggestions from their count/last id/last created_at"""
+        stamp = (
+            user_id,
+            make_etag("upload-suggestions", upload_id, r['count'], r['last_id'] or 0, get_template_index().version),
+            r['last_created_at'] or r['upload_created_at']
+        )
+        # Suggestions are written right after their upload; don't pin the empty list
+        if r['count']:
+            _upload_suggestions_stamps.put(upload_id, stamp)
+        return stamp[1:]
+    
+    @staticmethod
+    def get_user_upload_suggestions(conn, upload_id: int, user_id: int):
+        """Get (suggestions, (ETag, Last-Modified)) for the user's upload, or None if missing or someone else's"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                f"""SELECT {SUGGESTION_COLUMNS}, u.created_at AS upload_created_at
+                    FROM uploads u
+                    LEFT JOIN design_suggestions ds ON ds.upload_id = u.id
+                    LEFT JOIN design_templates t ON t.id = ds.template_id
+                    WHERE u.id = %s AND u.user_id = %s
+                    ORDER BY ds.id""",
+                (upload_id, user_id)
+            )
+            results = cursor.fetchall()
+        
+        if not results:
+            return None
+        
+        suggestions = [DesignSuggestionService._to_suggestion(r) for r in results if r['id'] is not None]
+        stamp = DesignSuggestionService._upload_suggestions_stamp(upload_id, user_id, {
+            "count": len(suggestions),
+            "last_id": suggestions[-1].id if suggestions else None,
+            "last_created_at": max((s.created_at for s in suggestions), default=None),
+            "upload_created_at": results[0]['upload_created_at'],
+        })
+        return suggestions, stamp
+    
     @staticmethod
     def get_upload_suggestions(conn, upload_id: int) -> list:
         """Get suggestions for an upload"""
@@ -203,25 +502,34 @@ class DesignSuggestionService:
         
         with get_db_cursor(conn) as cursor:
             cursor.execute(
-                """SELECT id, upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score, created_at 
-                   FROM design_suggestions WHERE upload_id = %s""",
+                f"{SUGGESTION_SELECT} WHERE ds.upload_id = %s ORDER BY ds.id",
                 (upload_id,)
             )
             results = cursor.fetchall()
         
-        return [DesignSuggestion(
-            id=r['id'],
-            upload_id=r['upload_id'],
-            user_id=r['user_id'],
-            neck_design=r['neck_design'],
-            sleeve_style=r['sleeve_style'],
-            embroidery_pattern=r['embroidery_pattern'],
-            color_combination=r['color_combination'],
-            border_style=r['border_style'],
-            description=r['description'],
-            confidence_score=r['confidence_score'],
-            created_at=r['created_at']
-        ) for r in results]
+        return [DesignSuggestionService._to_suggestion(r) for r in results]
+    
+    @staticmethod
+    def get_user_upload_suggestions_json(conn, upload_id: int, user_id: int):
+        """Get (Postgres-rendered DesignSuggestionResponse array, (ETag, Last-Modified)) for the
+        user's upload, or None if missing or someone else's"""
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                f"""SELECT u.created_at AS upload_created_at, s.*
+                    FROM uploads u
+                    CROSS JOIN LATERAL (
+                        SELECT COUNT(*) AS count, MAX(r.id) AS last_id, MAX(r.created_at) AS last_created_at,
+                               COALESCE(json_agg(r ORDER BY r.id), '[]')::text AS body
+                        FROM ({SUGGESTION_JSON_SELECT} WHERE ds.upload_id = %s) r
+                    ) s
+                    WHERE u.id = %s AND u.user_id = %s""",
+                (upload_id, upload_id, user_id)
+            )
+            result = cursor.fetchone()
+        
+        if not result:
+            return None
+        return result['body'].encode(), DesignSuggestionService._upload_suggestions_stamp(upload_id, user_id, result)
     
     @staticmethod
     def get_user_suggestions(conn, user_id: int, skip: int = 0, limit: int = 10) -> list:
@@ -230,25 +538,65 @@ class DesignSuggestionService:
         
         with get_db_cursor(conn) as cursor:
             cursor.execute(
-                """SELECT id, upload_id, user_id, neck_design, sleeve_style, embroidery_pattern, color_combination, border_style, description, confidence_score, created_at 
-                   FROM design_suggestions WHERE user_id = %s ORDER BY created_at DESC OFFSET %s LIMIT %s""",
+                f"{SUGGESTION_SELECT} WHERE ds.user_id = %s ORDER BY ds.created_at DESC OFFSET %s LIMIT %s",
                 (user_id, skip, limit)
             )
             results = cursor.fetchall()
         
-        return [DesignSuggestion(
-            id=r['id'],
-            upload_id=r['upload_id'],
-            user_id=r['user_id'],
-            neck_design=r['neck_design'],
-            sleeve_style=r['sleeve_style'],
-            embroidery_pattern=r['embroidery_pattern'],
-            color_combination=r['color_combination'],
-            border_style=r['border_style'],
-            description=r['description'],
-            confidence_score=r['confidence_score'],
-            created_at=r['created_at']
-        ) for r in results]
+        return [DesignSuggestionService._to_suggestion(r) for r in results]
+    
+    @staticmethod
+    def normalize_existing(conn, batch_size: int = 1000) -> int:
+        """Backfill: move catalog-identical suggestion rows to template references"""
+        index = get_template_index()
+        by_text = {
+            (t["neck"], t["sleeve"], t["embroidery"], t["color"], t["border"]): template_id
+            for template_id, t in zip(index.template_ids, index.templates)
+        }
+        
+        normalized = 0
+        last_id = 0
+        while True:
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(
+                    """SELECT ds.id, ds.neck_design, ds.sleeve_style, ds.embroidery_pattern,
+                              ds.color_combination, ds.border_style, ds.description,
+                              u.cloth_type, u.occasion
+                       FROM design_suggestions ds
+                       JOIN uploads u ON u.id = ds.upload_id
+                       WHERE ds.id > %s AND ds.neck_design IS NOT NULL
+                       ORDER BY ds.id LIMIT %s""",
+                    (last_id, batch_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                
+                # Only rows whose stored text renders back exactly are rewritten
+                updates = []
+                for r in rows:
+                    template_id = by_text.get((r['neck_design'], r['sleeve_style'], r['embroidery_pattern'],
+                                               r['color_combination'], r['border_style']))
+                    if template_id and r['description'] == DesignSuggestionEngine.render_template_description(
+                            r['cloth_type'], r['occasion'], r['neck_design'], r['sleeve_style'],
+                            r['embroidery_pattern'], r['color_combination'], r['border_style']):
+                        updates.append((r['id'], template_id))
+                
+                if updates:
+                    psycopg2.extras.execute_values(
+                        cursor,
+                        """UPDATE design_suggestions AS ds
+                           SET template_id = v.template_id, neck_design = NULL, sleeve_style = NULL,
+                               embroidery_pattern = NULL, color_combination = NULL,
+                               border_style = NULL, description = NULL
+                           FROM (VALUES %s) AS v(id, template_id)
+                           WHERE ds.id = v.id""",
+                        updates
+                    )
+                normalized += len(updates)
+        
+        return normalized
 
 
 class SavedDesignService:
@@ -256,19 +604,22 @@ class SavedDesignService:
     
     @staticmethod
     def save_design(conn, user_id: int, design_suggestion_id: int) -> SavedDesign:
-        """Save a design"""
+        """Save one of the user's design suggestions; None if missing or someone else's"""
         from app.core.database import get_db_cursor
         
         with get_db_cursor(conn) as cursor:
+            # Only the user's own suggestions can be saved
             cursor.execute(
                 """INSERT INTO saved_designs (user_id, design_suggestion_id)
-                   VALUES (%s, %s)
+                   SELECT user_id, id FROM design_suggestions WHERE id = %s AND user_id = %s
                    RETURNING id, user_id, design_suggestion_id, saved_at""",
-                (user_id, design_suggestion_id)
+                (design_suggestion_id, user_id)
             )
             result = cursor.fetchone()
             
             if result:
+                PreferenceService.apply_saved(cursor, user_id, design_suggestion_id)
+                RecommendationService.record_save(cursor, user_id, result['id'], design_suggestion_id)
                 return SavedDesign(
                     id=result['id'],
                     user_id=result['user_id'],
@@ -298,11 +649,76 @@ class SavedDesignService:
         ) for r in results]
     
     @staticmethod
-    def unsave_design(conn, saved_design_id: int) -> bool:
-        """Unsave a design"""
+    def get_saved_feed(conn, user_id: int, limit: int = 20, before: tuple = None) -> list:
+        """Get a page of saved designs with their suggestion and upload, newest first
+        
+        `before` is the (saved_at, saved_design_id) keyset cursor of the last row
+        of the previous page. Returns a list of (SavedDesign, DesignSuggestion, Upload).
+        """
         from app.core.database import get_db_cursor
         
+        keyset = ""
+        params = [user_id]
+        if before:
+            keyset = "AND (sd.saved_at, sd.id) < (%s, %s)"
+            params.extend(before)
+        params.append(limit)
+        
         with get_db_cursor(conn) as cursor:
-            cursor.execute("DELETE FROM saved_designs WHERE id = %s", (saved_design_id,))
+            cursor.execute(
+                f"""SELECT sd.id AS saved_design_id, sd.saved_at, {SUGGESTION_COLUMNS},
+                           u.file_path, u.gender, u.age_group, u.budget_range, u.size_info,
+                           u.created_at AS upload_created_at
+                    FROM saved_designs sd
+                    JOIN design_suggestions ds ON ds.id = sd.design_suggestion_id
+                    JOIN uploads u ON u.id = ds.upload_id
+                    LEFT JOIN design_templates t ON t.id = ds.template_id
+                    WHERE sd.user_id = %s {keyset}
+                    ORDER BY sd.saved_at DESC, sd.id DESC
+                    LIMIT %s""",
+                params
+            )
+            results = cursor.fetchall()
+        
+        return [(
+            SavedDesign(
+                id=r['saved_design_id'],
+                user_id=user_id,
+                design_suggestion_id=r['id'],
+                saved_at=r['saved_at']
+            ),
+            DesignSuggestionService._to_suggestion(r),
+            Upload(
+                id=r['upload_id'],
+                user_id=r['user_id'],
+                file_path=r['file_path'],
+                cloth_type=r['upload_cloth_type'],
+                occasion=r['upload_occasion'],
+                gender=r['gender'],
+                age_group=r['age_group'],
+                budget_range=r['budget_range'],
+                size_info=r['size_info'],
+                created_at=r['upload_created_at']
+            )
+        ) for r in results]
+    
+    @staticmethod
+    def unsave_design(conn, saved_design_id: int, user_id: int) -> bool:
+        """Unsave one of the user's saved designs; False if missing or someone else's"""
+        from app.core.database import get_db_cursor
+        
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                "DELETE FROM saved_designs WHERE id = %s AND user_id = %s RETURNING design_suggestion_id",
+                (saved_design_id, user_id)
+            )
+            result = cursor.fetchone()
+            
+            if not result:
+                return False
+            PreferenceService.apply_saved(cursor, user_id, result['design_suggestion_id'], sign=-1)
+            RecommendationService.record_save(
+                cursor, user_id, saved_design_id, result['design_suggestion_id'], sign=-1
+            )
         
         return True
@@ -1,19 +1,18 @@
+from datetime import date
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from app.core.security import decode_token
 from app.services.auth_service import AuthService
-from app.core.database import get_db
+from app.core.database import get_db, get_connection
+from app.models.upload import ClothType, Occasion, BudgetRange
+from app.schemas.upload import UploadFilters
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_db)
-):
-    """Get current user from token"""
-    token = credentials.credentials
-    
+def _user_from_token(db, token: str):
+    """Look up the user a bearer token belongs to, or raise 401"""
     payload = decode_token(token)
     if payload is None:
         raise HTTPException(
@@ -38,6 +37,14 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db = Depends(get_db)
+):
+    """Get current user from token"""
+    return _user_from_token(db, credentials.credentials)
+
+
 async def get_admin_user(current_user = Depends(get_current_user)):
     """Get current admin user"""
     from app.models.user import UserRole
@@ -49,3 +56,42 @@ async def get_admin_user(current_user = Depends(get_current_user)):
         )
     
     return current_user
+
+
+async def get_streaming_admin_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Get current admin user for a long-lived stream
+    
+    The user is looked up on a short-lived connection, so an open stream
+    does not hold a get_db connection.
+    """
+    def lookup():
+        conn = get_connection()
+        try:
+            return _user_from_token(conn, credentials.credentials)
+        finally:
+            conn.close()
+    
+    return await get_admin_user(await run_in_threadpool(lookup))
+
+
+def get_upload_filters(
+    cloth_type: ClothType = None,
+    occasion: Occasion = None,
+    budget_range: BudgetRange = None,
+    created_from: date = None,
+    created_to: date = None
+) -> UploadFilters:
+    """Upload listing filters from query parameters (dates inclusive)"""
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="created_from must not be after created_to"
+        )
+    
+    return UploadFilters(
+        cloth_type=cloth_type,
+        occasion=occasion,
+        budget_range=budget_range,
+        created_from=created_from,
+        created_to=created_to
+    )
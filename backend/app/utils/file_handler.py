@@ -1,8 +1,11 @@
 import os
 import shutil
+import time
 from pathlib import Path
 from fastapi import HTTPException, UploadFile
 from app.core.config import get_settings
+from app.core.metrics import UPLOAD_BYTES, IMAGE_PROCESSING_SECONDS
+from app.core import tracing
 from PIL import Image
 import io
 
@@ -21,6 +24,7 @@ async def save_upload_file(file: UploadFile, user_id: int) -> str:
     
     # Check file size
     contents = await file.read()
+    UPLOAD_BYTES.observe(len(contents))
     if len(contents) > settings.max_upload_size:
         raise HTTPException(
             status_code=413,
@@ -38,21 +42,25 @@ async def save_upload_file(file: UploadFile, user_id: int) -> str:
         )
     
     # Verify it's actually an image
+    started = time.perf_counter()
     try:
-        img = Image.open(io.BytesIO(contents))
-        img.verify()
+        with tracing.span("image.verify"):
+            img = Image.open(io.BytesIO(contents))
+            img.verify()
     except Exception:
         raise HTTPException(
             status_code=400,
             detail="Invalid image file"
         )
+    finally:
+        IMAGE_PROCESSING_SECONDS.observe(time.perf_counter() - started, "verify")
     
     # Generate filename
     filename = f"user_{user_id}_{int(os.path.getmtime(__file__))}_{file.filename}"
     filepath = os.path.join(settings.uploads_dir, filename)
     
     # Save file
-    with open(filepath, "wb") as f:
+    with tracing.span("file.write", bytes=len(contents)), open(filepath, "wb") as f:
         f.write(contents)
     
     return filepath
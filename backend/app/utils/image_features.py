@@ -0,0 +1,54 @@
+import os
+import time
+import numpy as np
+from PIL import Image
+from app.core.metrics import IMAGE_PROCESSING_SECONDS
+from app.core import tracing
+
+# Color families shared by uploaded images and template color text
+COLOR_FAMILIES = [
+    "red", "maroon", "pink", "orange", "gold", "green",
+    "blue", "purple", "black", "white", "neutral"
+]
+
+# Representative RGB anchor for each color family (same order as COLOR_FAMILIES)
+COLOR_ANCHORS = np.array([
+    (200, 30, 45),    # red
+    (110, 20, 40),    # maroon
+    (235, 140, 175),  # pink
+    (240, 140, 40),   # orange
+    (212, 175, 55),   # gold
+    (40, 140, 80),    # green
+    (40, 80, 170),    # blue
+    (120, 50, 140),   # purple
+    (25, 25, 25),     # black
+    (240, 238, 230),  # white
+    (160, 150, 135),  # neutral
+], dtype=np.float32)
+
+# Images are downsampled to this size before color extraction
+SAMPLE_SIZE = (32, 32)
+
+
+def extract_color_profile(filepath: str) -> np.ndarray:
+    """Get normalized color family histogram for an image, or None if unreadable"""
+    if not filepath or not os.path.exists(filepath):
+        return None
+
+    started = time.perf_counter()
+    try:
+        with tracing.span("image.color_profile"), Image.open(filepath) as img:
+            img.draft("RGB", SAMPLE_SIZE)
+            pixels = np.asarray(
+                img.convert("RGB").resize(SAMPLE_SIZE), dtype=np.float32
+            ).reshape(-1, 3)
+    except Exception:
+        return None
+    finally:
+        IMAGE_PROCESSING_SECONDS.observe(time.perf_counter() - started, "color_profile")
+
+    # Assign every pixel to its nearest anchor in one vectorized pass
+    distances = ((pixels[:, None, :] - COLOR_ANCHORS[None, :, :]) ** 2).sum(axis=2)
+    counts = np.bincount(distances.argmin(axis=1), minlength=len(COLOR_FAMILIES))
+
+    return counts.astype(np.float32) / max(counts.sum(), 1)
@@ -0,0 +1,24 @@
+import base64
+from datetime import datetime
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    """Encode keyset values (datetimes, ints, strings) as an opaque cursor"""
+    raw = "\x1f".join(v.isoformat() if isinstance(v, datetime) else str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode a cursor made by encode_cursor into values of the given types"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        parts = raw.split("\x1f")
+        if len(parts) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            datetime.fromisoformat(part) if kind is datetime else kind(part)
+            for part, kind in zip(parts, types)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
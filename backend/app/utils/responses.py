@@ -0,0 +1,11 @@
+from fastapi.responses import ORJSONResponse
+
+
+def trusted_response(content, status_code: int = 200, headers: dict = None) -> ORJSONResponse:
+    """Send a route-built dict/list as-is, without response_model validation
+
+    Only for content the route assembles field by field from service objects
+    in exactly the response_model's shape; the model then just documents the
+    endpoint. orjson serializes datetimes and enums natively.
+    """
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,160 @@
+import hashlib
+import heapq
+import json
+import struct
+import numpy as np
+
+
+def hash64(value) -> int:
+    """Stable 64-bit hash of a value's string form (same in every process)"""
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimate in 2^precision one-byte registers
+
+    Standard error is about 1.04 / sqrt(2^precision): 1.6% at precision 12
+    (4 KiB).
+    """
+
+    def __init__(self, precision: int = 12, registers: np.ndarray = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.size, dtype=np.uint8)
+
+    def add(self, value):
+        h = hash64(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Union in place (both must have the same precision)"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        precision = data[0]
+        return cls(precision, np.frombuffer(data, dtype=np.uint8, offset=1).copy())
+
+
+class CountMinSketch:
+    """Mergeable frequency estimate (never under-counts) in depth x width counters"""
+
+    def __init__(self, width: int = 1024, depth: int = 4, table: np.ndarray = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+
+    def _columns(self, key) -> np.ndarray:
+        # Double hashing: row i uses h1 + i * h2
+        h = hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, key, count: int = 1):
+        self.table[self._rows, self._columns(key)] += count
+
+    def estimate(self, key) -> int:
+        return int(self.table[self._rows, self._columns(key)].min())
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Sum in place (both must have the same shape)"""
+        if other.table.shape != self.table.shape:
+            raise ValueError("Cannot merge Count-Min Sketches of different shape")
+        self.table += other.table
+        return self
+
+    def to_bytes(self) -> bytes:
+        return struct.pack("<II", self.width, self.depth) + self.table.astype("<u4").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountMinSketch":
+        width, depth = struct.unpack_from("<II", data)
+        table = np.frombuffer(data, dtype="<u4", offset=8).reshape(depth, width).astype(np.uint32)
+        return cls(width, depth, table)
+
+
+class HeavyHitters:
+    """Count-Min Sketch plus a min-heap of the k keys with the highest estimates
+
+    Merging sums the sketches and keeps the union of both candidate sets,
+    re-ranked against the merged sketch when next needed, so a key that is
+    heavy only across buckets is still found as long as it was a candidate
+    in one of them.
+    """
+
+    def __init__(self, k: int = 20, sketch: CountMinSketch = None, candidates=()):
+        self.k = k
+        self.sketch = sketch or CountMinSketch()
+        self._members = set(candidates)
+        self._heap = None
+
+    def _ranked_heap(self) -> list:
+        """The [estimate, key] min-heap of the k best candidates, rebuilt after a merge"""
+        if self._heap is None:
+            best = heapq.nlargest(self.k, ((self.sketch.estimate(key), key) for key in self._members))
+            self._heap = [[estimate, key] for estimate, key in best]
+            heapq.heapify(self._heap)
+            self._members = {key for _, key in self._heap}
+        return self._heap
+
+    def add(self, key, count: int = 1):
+        self.sketch.add(key, count)
+        heap = self._ranked_heap()
+        estimate = self.sketch.estimate(key)
+        if key in self._members:
+            # Estimates only grow: refresh the entry and restore heap order
+            for entry in heap:
+                if entry[1] == key:
+                    entry[0] = estimate
+            heapq.heapify(heap)
+        elif len(heap) < self.k:
+            heapq.heappush(heap, [estimate, key])
+            self._members.add(key)
+        elif estimate > heap[0][0]:
+            _, evicted = heapq.heapreplace(heap, [estimate, key])
+            self._members.discard(evicted)
+            self._members.add(key)
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        self.sketch.merge(other.sketch)
+        self._members |= other._members
+        self._heap = None
+        return self
+
+    def top(self, k: int = None) -> list:
+        """[(key, estimated count)], highest first"""
+        ranked = sorted(((key, estimate) for estimate, key in self._ranked_heap()),
+                        key=lambda item: (-item[1], item[0]))
+        return ranked[:k or self.k]
+
+    def to_bytes(self) -> bytes:
+        self._ranked_heap()
+        candidates = json.dumps(sorted(self._members)).encode()
+        return struct.pack("<II", self.k, len(candidates)) + candidates + self.sketch.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HeavyHitters":
+        k, length = struct.unpack_from("<II", data)
+        candidates = json.loads(data[8:8 + length])
+        return cls(k, CountMinSketch.from_bytes(data[8 + length:]), candidates)
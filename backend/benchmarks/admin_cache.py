@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Measure the single-flight admin analytics cache under concurrent admins
+
+Seeds the dashboard stats benchmark's scratch schema, then has --admins
+threads, each with its own connection, load the admin dashboard (stats and
+trending) --loads times, first uncached (TTL 0) and then through a
+SingleFlightCache. Reports per-load p50/p99, how many times the queries
+actually ran, the hit ratio, and how many computations a cold burst of
+simultaneous misses triggered.
+
+Usage (from backend/):
+    python -m benchmarks.admin_cache [--rows 2000000] [--admins 16] [--loads 50]
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from app.core.database import get_connection, get_db_cursor
+from app.core.response_cache import SingleFlightCache
+from app.routes.admin import _dashboard_stats, _trending_data
+from benchmarks.dashboard_stats import setup, SCHEMA
+
+
+def run_admins(cache: SingleFlightCache, connections: list, loads: int) -> list:
+    """Load the dashboard `loads` times from every connection at once; returns per-load ms"""
+    timings = []
+    lock = threading.Lock()
+    start = threading.Barrier(len(connections))
+
+    def admin(conn):
+        start.wait()
+        mine = []
+        for _ in range(loads):
+            started = time.perf_counter()
+            cache.get(("stats", 30), lambda c: _dashboard_stats(c, 30), conn)
+            cache.get(("trending", 5), lambda c: _trending_data(c, 5), conn)
+            mine.append((time.perf_counter() - started) * 1000)
+        with lock:
+            timings.extend(mine)
+
+    threads = [threading.Thread(target=admin, args=(conn,)) for conn in connections]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--admins", type=int, default=16)
+    parser.add_argument("--loads", type=int, default=50)
+    parser.add_argument("--ttl", type=float, default=30.0)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    connections = []
+    try:
+        setup(conn, args.rows)
+        # Every connection opened from here on, including the cache's
+        # background revalidation, reads the scratch tables first
+        os.environ["PGOPTIONS"] = f"-c search_path={SCHEMA},public"
+        connections = [get_connection() for _ in range(args.admins)]
+
+        print(f"{args.rows} uploads, {args.admins} admins x {args.loads} dashboard loads")
+        print(f"{'':12}{'loads/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'computed':>10}{'hit ratio':>11}")
+        for label, ttl in (("uncached", 0), ("cached", args.ttl)):
+            cache = SingleFlightCache(ttl, ttl * 10)
+            started = time.perf_counter()
+            timings = sorted(run_admins(cache, connections, args.loads))
+            elapsed = time.perf_counter() - started
+            computed = cache.computations if ttl else len(timings) * 2
+            print(f"{label:12}{len(timings) / elapsed:10.0f}{statistics.median(timings):10.2f}"
+                  f"{timings[max(int(len(timings) * 0.99) - 1, 0)]:10.2f}{computed:10}"
+                  f"{cache.to_dict()['hit_ratio']:11.3f}")
+
+        cache = SingleFlightCache(args.ttl, args.ttl * 10)
+        run_admins(cache, connections, 1)
+        metrics = cache.to_dict()
+        print(f"cold burst of {args.admins} admins: {metrics['computations']} computations "
+              f"({metrics['coalesced']} requests coalesced), avg recompute {metrics['avg_compute_ms']} ms")
+    finally:
+        for connection in connections:
+            connection.close()
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
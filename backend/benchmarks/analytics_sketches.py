@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Compare exact long-window analytics with merged day and month sketches
+
+Seeds a scratch schema with uploads and suggestions spread over two years,
+builds the day and month sketches with AnalyticsService, then times exact
+COUNT(DISTINCT user_id) and color/pattern GROUP BY queries over 30, 365 and
+730 day windows against merging the sketches of the same days, reporting
+the estimate error and whether the top colors and patterns agree.
+Sketches are merged per whole month plus the days at either end.
+
+Usage (from backend/):
+    python -m benchmarks.analytics_sketches [--rows 2000000] [--users 50000]
+"""
+
+import argparse
+import time
+from collections import Counter
+from datetime import date, timedelta
+from app.core.database import get_connection, get_db_cursor
+from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
+from app.services.analytics_service import AnalyticsService
+from app.services.trending_service import (
+    extract_terms, COLOR_TERMS, PATTERN_TERMS, _COLOR_PATTERN, _PATTERN_PATTERN
+)
+from app.services.upload_service import DesignSuggestionService
+
+SCHEMA = "bench_sketches"
+DAYS = 730
+
+# Rule-based suggestion text, picked with a skew so the rankings are clear
+COLORS = ["Royal blue and gold", "Maroon with gold zari", "Pastel pink with silver",
+          "Emerald green", "Ivory and cream", "Navy with white"]
+PATTERNS = ["Mirror work on the yoke", "Floral threadwork", "Zari border", "Sequin scatter",
+            "Block print", "Geometric cutwork"]
+
+
+def setup(conn, rows: int, users: int):
+    """Create the scratch schema and seed uploads and suggestions over DAYS days"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        for table in ("design_templates", "analytics_sketches"):
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+        for table in ("uploads", "design_suggestions"):
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING DEFAULTS INCLUDING GENERATED)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+
+    DesignSuggestionService.sync_templates(conn)
+
+    def values(enum) -> list:
+        return [member.value for member in enum]
+
+    with get_db_cursor(conn) as cursor:
+        # Each user is active on a band of days, so daily and long-window
+        # distinct counts differ
+        cursor.execute(
+            """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                   budget_range, created_at)
+               SELECT i, 1 + i %% %(users)s, './uploads/bench.jpg',
+                      (%(cloth_types)s::text[])[1 + i %% 8], (%(occasions)s::text[])[1 + i %% 5],
+                      (%(genders)s::text[])[1 + i %% 3], (%(age_groups)s::text[])[1 + i %% 3],
+                      (%(budgets)s::text[])[1 + i %% 3],
+                      now() - ((i %% %(users)s) * %(days)s / %(users)s + i %% 7) * interval '1 day'
+                            - (i %% 86400) * interval '1 second'
+               FROM generate_series(1, %(rows)s) i""",
+            {"rows": rows, "users": users, "days": DAYS - 7, "cloth_types": values(ClothType),
+             "occasions": values(Occasion), "genders": values(Gender), "age_groups": values(AgeGroup),
+             "budgets": values(BudgetRange)}
+        )
+        # Every fourth suggestion references a catalog template
+        cursor.execute(
+            """WITH catalog AS (SELECT array_agg(id ORDER BY id) AS ids FROM design_templates)
+               INSERT INTO design_suggestions (id, upload_id, user_id, template_id, color_combination,
+                                               embroidery_pattern, created_at)
+               SELECT u.id, u.id, u.user_id,
+                      CASE WHEN u.id %% 4 = 0 THEN catalog.ids[1 + u.id %% cardinality(catalog.ids)] END,
+                      CASE WHEN u.id %% 4 <> 0 THEN (%(colors)s::text[])[1 + floor(sqrt(u.id %% 36))::int] END,
+                      CASE WHEN u.id %% 4 <> 0 THEN (%(patterns)s::text[])[1 + floor(sqrt(u.id %% 35 + 1))::int %% 6] END,
+                      u.created_at
+               FROM uploads u, catalog""",
+            {"colors": COLORS, "patterns": PATTERNS}
+        )
+        cursor.execute("CREATE INDEX ON uploads (created_at DESC)")
+        cursor.execute("CREATE INDEX ON design_suggestions (created_at)")
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE uploads")
+        cursor.execute("VACUUM ANALYZE design_suggestions")
+    conn.autocommit = False
+
+
+def exact_uploaders(conn, start: date, end: date) -> int:
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """SELECT COUNT(DISTINCT user_id) AS count FROM uploads
+               WHERE created_at >= %s AND created_at < %s""",
+            (start, end + timedelta(days=1))
+        )
+        return cursor.fetchone()['count']
+
+
+def exact_heavy_hitters(conn, start: date, end: date) -> tuple:
+    """(color Counter, pattern Counter) counted exactly over the range"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """SELECT COALESCE(ds.color_combination, t.color) AS color,
+                      COALESCE(ds.embroidery_pattern, t.embroidery) AS pattern, COUNT(*) AS count
+               FROM design_suggestions ds
+               LEFT JOIN design_templates t ON t.id = ds.template_id
+               WHERE ds.created_at >= %s AND ds.created_at < %s
+               GROUP BY 1, 2""",
+            (start, end + timedelta(days=1))
+        )
+        colors, patterns = Counter(), Counter()
+        for r in cursor.fetchall():
+            for label in extract_terms(r['color'], _COLOR_PATTERN, COLOR_TERMS):
+                colors[label] += r['count']
+            for label in extract_terms(r['pattern'], _PATTERN_PATTERN, PATTERN_TERMS):
+                patterns[label] += r['count']
+    return colors, patterns
+
+
+def timed(function) -> tuple:
+    """(result, milliseconds) of one call"""
+    started = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        setup(conn, args.rows, args.users)
+        end = date.today()
+        _, build_ms = timed(lambda: AnalyticsService.build(conn, end - timedelta(days=DAYS), end))
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("SELECT pg_total_relation_size('analytics_sketches') AS size")
+            size = cursor.fetchone()['size']
+        print(f"{args.rows} uploads and suggestions by {args.users} users over {DAYS} days")
+        print(f"sketches built in {build_ms / 1000:.1f} s, {size / 1024 / 1024:.1f} MB stored")
+
+        print(f"{'window':>8}{'exact':>10}{'ms':>9}{'sketch':>10}{'ms':>9}{'error':>8}"
+              f"{'hh exact ms':>13}{'hh sketch ms':>14}  top {args.top} match")
+        for days in (30, 365, DAYS):
+            start = end - timedelta(days=days - 1)
+            exact, exact_ms = timed(lambda: exact_uploaders(conn, start, end))
+            (estimate, _), sketch_ms = timed(lambda: AnalyticsService.distinct_uploaders(conn, start, end))
+            (exact_colors, exact_patterns), hh_exact_ms = timed(
+                lambda: exact_heavy_hitters(conn, start, end)
+            )
+            (colors, patterns), hh_sketch_ms = timed(lambda: (
+                AnalyticsService.heavy_hitters(conn, "colors", start, end, args.top),
+                AnalyticsService.heavy_hitters(conn, "patterns", start, end, args.top),
+            ))
+            # Same counts in the same order (labels of tied counts may swap)
+            match = all(
+                [count for _, count in top] == [count for _, count in exact.most_common(args.top)]
+                and all(exact[label] == count for label, count in top)
+                for top, exact in ((colors, exact_colors), (patterns, exact_patterns))
+            )
+            error = (estimate - exact) / exact * 100 if exact else 0.0
+            print(f"{days:>7}d{exact:10}{exact_ms:9.1f}{estimate:10}{sketch_ms:9.1f}{error:7.1f}%"
+                  f"{hh_exact_ms:13.1f}{hh_sketch_ms:14.1f}  {'yes' if match else 'no'}")
+    finally:
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Compare the dashboard request fan-out with the /api/dashboard bootstrap
+
+Seeds a throwaway user with uploads, suggestions and saves, then loads the
+dashboard both ways through the ASGI app: the old fan-out (/auth/me,
+/uploads/my-uploads, one /suggestions call per upload, /saved/list) and the
+single bootstrap endpoint. Reports requests, connections and queries per
+page load plus wall-clock latency.
+
+Usage (from backend/):
+    python -m benchmarks.dashboard_bootstrap [--uploads 10] [--loads 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import psycopg2.extras
+from fastapi.testclient import TestClient
+from app.core import database
+from app.core.database import get_connection, get_db_cursor
+from app.core.security import create_access_token
+from app.services.template_index import get_template_index
+from main import app
+
+EMAIL = "bench-dashboard@example.com"
+
+
+class Counters:
+    """Connections opened and queries executed while patched in"""
+
+    def __init__(self):
+        self.connections = 0
+        self.queries = 0
+
+    def install(self):
+        original_connect = database.get_connection
+        original_execute = psycopg2.extras.RealDictCursor.execute
+
+        def counting_connect():
+            self.connections += 1
+            return original_connect()
+
+        def counting_execute(cursor, query, vars=None):
+            self.queries += 1
+            return original_execute(cursor, query, vars)
+
+        database.get_connection = counting_connect
+        psycopg2.extras.RealDictCursor.execute = counting_execute
+        return lambda: (
+            setattr(database, "get_connection", original_connect),
+            setattr(psycopg2.extras.RealDictCursor, "execute", original_execute),
+        )
+
+
+def setup(conn, uploads: int) -> int:
+    """Create the benchmark user with uploads, suggestions and a few saves"""
+    teardown(conn)
+    index = get_template_index()
+    random.seed(0)
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """INSERT INTO users (email, username, hashed_password, full_name)
+               VALUES (%s, %s, 'x', 'Dashboard Bench') RETURNING id""",
+            (EMAIL, EMAIL)
+        )
+        user_id = cursor.fetchone()['id']
+
+        rows = []
+        for _ in range(uploads):
+            position = random.randrange(len(index))
+            cloth_type, occasion = index.keys[position]
+            rows.append((user_id, "./uploads/bench.jpg", cloth_type, occasion, "female", "adult", "3000-8000",
+                         index.template_ids[position]))
+        cursor.execute("CREATE TEMP TABLE bench_rows (LIKE uploads INCLUDING DEFAULTS, template_id VARCHAR(64)) ON COMMIT DROP")
+        psycopg2.extras.execute_values(
+            cursor,
+            """INSERT INTO bench_rows (user_id, file_path, cloth_type, occasion, gender, age_group, budget_range, template_id)
+               VALUES %s""",
+            rows
+        )
+        cursor.execute(
+            """WITH new_uploads AS (
+                   INSERT INTO uploads (user_id, file_path, cloth_type, occasion, gender, age_group, budget_range)
+                   SELECT user_id, file_path, cloth_type, occasion, gender, age_group, budget_range
+                   FROM bench_rows ORDER BY cloth_type, occasion
+                   RETURNING id, user_id, cloth_type, occasion
+               )
+               INSERT INTO design_suggestions (upload_id, user_id, template_id, confidence_score)
+               SELECT DISTINCT ON (n.id) n.id, n.user_id, b.template_id, 'High'
+               FROM new_uploads n
+               JOIN bench_rows b ON b.cloth_type = n.cloth_type AND b.occasion = n.occasion
+               ORDER BY n.id"""
+        )
+        cursor.execute(
+            """INSERT INTO saved_designs (user_id, design_suggestion_id)
+               SELECT user_id, id FROM design_suggestions WHERE user_id = %s AND id %% 3 = 0""",
+            (user_id,)
+        )
+    return user_id
+
+
+def teardown(conn):
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("SELECT id FROM users WHERE email = %s", (EMAIL,))
+        result = cursor.fetchone()
+        if result:
+            cursor.execute("DELETE FROM saved_designs WHERE user_id = %s", (result['id'],))
+            cursor.execute("DELETE FROM design_suggestions WHERE user_id = %s", (result['id'],))
+            cursor.execute("DELETE FROM uploads WHERE user_id = %s", (result['id'],))
+            cursor.execute("DELETE FROM users WHERE id = %s", (result['id'],))
+
+
+def fan_out(client: TestClient, uploads: int) -> int:
+    """Load the dashboard the way UserDashboard.tsx used to; returns requests made"""
+    client.get("/api/auth/me").raise_for_status()
+    response = client.get("/api/uploads/my-uploads", params={"limit": uploads})
+    response.raise_for_status()
+    for upload in response.json():
+        client.get(f"/api/uploads/{upload['id']}/suggestions").raise_for_status()
+    client.get("/api/design-suggestions/saved/list", params={"limit": 100}).raise_for_status()
+    return 3 + len(response.json())
+
+
+def bootstrap(client: TestClient, uploads: int) -> int:
+    client.get("/api/dashboard", params={"uploads_limit": uploads}).raise_for_status()
+    return 1
+
+
+def measure(client: TestClient, load, uploads: int, loads: int) -> dict:
+    """Per page load request/connection/query counts and latency"""
+    load(client, uploads)
+
+    counters = Counters()
+    restore = counters.install()
+    try:
+        requests = load(client, uploads)
+    finally:
+        restore()
+
+    timings = []
+    for _ in range(loads):
+        started = time.perf_counter()
+        load(client, uploads)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    return {
+        "requests": requests,
+        "connections": counters.connections,
+        "queries": counters.queries,
+        "p50_ms": statistics.median(timings),
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=10, help="uploads shown on the dashboard")
+    parser.add_argument("--loads", type=int, default=200, help="timed page loads per variant")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark user")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    conn.commit()
+    try:
+        user_id = setup(conn, args.uploads)
+        token = create_access_token(data={"sub": str(user_id), "email": EMAIL})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+        results = {
+            "fan-out": measure(client, fan_out, args.uploads, args.loads),
+            "bootstrap": measure(client, bootstrap, args.uploads, args.loads),
+        }
+
+        print(f"{args.uploads} uploads, {args.loads} page loads")
+        print(f"{'':10}{'requests':>10}{'conns':>8}{'queries':>9}{'p50 ms':>10}{'p99 ms':>10}")
+        for label, result in results.items():
+            print(f"{label:10}{result['requests']:10}{result['connections']:8}{result['queries']:9}"
+                  f"{result['p50_ms']:10.2f}{result['p99_ms']:10.2f}")
+    finally:
+        if not args.keep:
+            teardown(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Compare admin dashboard stats from full scans with the upload rollups
+
+Seeds a scratch schema with uploads, then times the queries the stats and
+trending endpoints used to run (COUNT(*) and GROUP BY over uploads)
+against RollupService reads, and the cost the rollup triggers add to
+single-row and batch upload inserts.
+
+Usage (from backend/):
+    python -m benchmarks.dashboard_stats [--rows 2000000]
+"""
+
+import argparse
+import statistics
+import time
+from app.core.database import get_connection, get_db_cursor, ROLLUP_DIMENSIONS
+from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
+from app.services.rollup_service import RollupService
+
+SCHEMA = "bench_stats"
+
+
+def setup(conn, rows: int):
+    """Create scratch uploads and rollup tables, seed uploads, build the rollups"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        for table in ("uploads", "upload_counts", "upload_daily_counts"):
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.execute(
+            """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                   budget_range, created_at)
+               SELECT i, 1 + i %% 50000, './uploads/bench.jpg',
+                      (%(cloth_types)s::text[])[1 + i %% 8], (%(occasions)s::text[])[1 + i %% 5],
+                      (%(genders)s::text[])[1 + i %% 3], (%(age_groups)s::text[])[1 + i %% 3],
+                      (%(budgets)s::text[])[1 + (i / 7) %% 3],
+                      now() - (i %% 730) * interval '1 day'
+               FROM generate_series(1, %(rows)s) i""",
+            {"rows": rows, "cloth_types": [m.value for m in ClothType], "occasions": [m.value for m in Occasion],
+             "genders": [m.value for m in Gender], "age_groups": [m.value for m in AgeGroup],
+             "budgets": [m.value for m in BudgetRange]}
+        )
+    RollupService.rebuild(conn)
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE uploads")
+    conn.autocommit = False
+
+
+def set_triggers(conn, enabled: bool):
+    """Attach the public rollup trigger function to the scratch uploads table, or detach it"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("DROP TRIGGER IF EXISTS uploads_rollup_insert ON uploads")
+        cursor.execute("DROP TRIGGER IF EXISTS uploads_rollup_delete ON uploads")
+        if enabled:
+            cursor.execute(
+                """CREATE TRIGGER uploads_rollup_insert AFTER INSERT ON uploads
+                   REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.uploads_rollup()"""
+            )
+            cursor.execute(
+                """CREATE TRIGGER uploads_rollup_delete AFTER DELETE ON uploads
+                   REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.uploads_rollup()"""
+            )
+
+
+def full_scan_stats(conn):
+    """What the stats and trending endpoints used to query"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("SELECT COUNT(*) FROM uploads")
+        cursor.fetchall()
+        for column in ("cloth_type", "occasion"):
+            cursor.execute(f"SELECT {column}, COUNT(*) AS count FROM uploads GROUP BY {column} ORDER BY count DESC")
+            cursor.fetchall()
+
+
+def rollup_stats(conn):
+    RollupService.get_total(conn)
+    for dimension in ROLLUP_DIMENSIONS:
+        RollupService.get_counts_by(conn, dimension)
+    RollupService.get_daily(conn, 30)
+
+
+def timed(function, runs: int) -> tuple:
+    """p50/p99 milliseconds over `runs` calls, after one warm-up call"""
+    function()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.99) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        setup(conn, args.rows)
+        next_id = [args.rows]
+
+        def insert(count: int):
+            def run():
+                with get_db_cursor(conn) as cursor:
+                    cursor.execute(
+                        """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                               budget_range)
+                           SELECT i, 1, './uploads/bench.jpg', 'saree', 'wedding', 'female', 'adult', '10000+'
+                           FROM generate_series(%s, %s) i""",
+                        (next_id[0] + 1, next_id[0] + count)
+                    )
+                next_id[0] += count
+            return run
+
+        print(f"{args.rows} uploads")
+        print(f"{'':28}{'p50 ms':>10}{'p99 ms':>10}")
+        for label, function in (("stats, full scans", lambda: full_scan_stats(conn)),
+                                ("stats, rollups", lambda: rollup_stats(conn))):
+            p50, p99 = timed(function, args.runs)
+            print(f"{label:28}{p50:10.2f}{p99:10.2f}")
+
+        for enabled in (False, True):
+            set_triggers(conn, enabled)
+            for count in (1, 1000):
+                p50, p99 = timed(insert(count), args.runs)
+                print(f"{f'insert {count}, triggers ' + ('on' if enabled else 'off'):28}{p50:10.2f}{p99:10.2f}")
+
+        drift = RollupService.rebuild(conn)
+        print(f"rollup rows out of date after the trigger runs: {drift} (expected: the rows inserted with triggers off)")
+    finally:
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Suggestion engine throughput and coverage benchmark
+
+Sweeps every combination of the upload enums (cloth type, occasion, gender,
+age group, budget) through each engine backend and reports latency
+percentiles, calls/s, template-vs-fallback coverage and the distribution of
+every suggestion field. Results are compared with the stored baseline and
+the run fails (exit code 1) when throughput drops by more than --threshold.
+Throughput is compared relative to a fixed calibration loop timed before
+every round, so a slower or faster (or busier) machine doesn't read as a
+regression; the comparison is skipped when the CPU architecture or Python
+version differs from the baseline's.
+
+Usage (from backend/):
+    python -m benchmarks.engine_throughput [--backend similarity] [--rounds 20]
+    python -m benchmarks.engine_throughput --update-baseline
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from PIL import Image
+from app.models.upload import Upload, ClothType, Occasion, Gender, AgeGroup, BudgetRange
+from app.services.engine_registry import get_engine_registry
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "engine_throughput.json")
+
+FIELDS = ("neck_design", "sleeve_style", "embroidery_pattern", "color_combination", "border_style")
+
+# Iterations of the calibration loop timed before every round
+CALIBRATION_ITERATIONS = 20000
+
+
+def machine() -> str:
+    return f"{platform.machine()} / Python {'.'.join(platform.python_version_tuple()[:2])}"
+
+
+def calibrate(repeats: int = 3) -> float:
+    """Iterations/s of a fixed pure-Python loop (dict lookups, string formatting), best of `repeats`"""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        table = {}
+        for i in range(CALIBRATION_ITERATIONS):
+            key = f"{i % 97}:{i % 13}"
+            table[key] = table.get(key, 0) + 1
+        best = min(best, time.perf_counter() - started)
+    return CALIBRATION_ITERATIONS / best
+
+
+def attribute_space(file_path: str = None) -> list:
+    """One upload per combination of the enum attributes"""
+    return [
+        Upload(id=i, user_id=1, file_path=file_path, cloth_type=c.value, occasion=o.value,
+               gender=g.value, age_group=a.value, budget_range=b.value)
+        for i, (c, o, g, a, b) in enumerate(itertools.product(ClothType, Occasion, Gender, AgeGroup, BudgetRange))
+    ]
+
+
+def run_backend(name: str, uploads: list, rounds: int) -> dict:
+    """Time every upload `rounds` times against one backend"""
+    backend = get_engine_registry().backends[name].backend
+
+    # Warm caches (template index, description renderer)
+    for upload in uploads:
+        backend.generate(upload)
+
+    timings = []
+    coverage = Counter()
+    fields = {field: Counter() for field in FIELDS}
+    rounds_elapsed = []
+    relative = []
+    for round_number in range(rounds):
+        # Timed next to the round, so both see the same machine state
+        calibration = calibrate()
+        started = time.perf_counter()
+        for upload in uploads:
+            call_started = time.perf_counter()
+            suggestions = backend.generate(upload)
+            timings.append((time.perf_counter() - call_started) * 1e6)
+
+            if round_number == 0:
+                if suggestions.get("template_id") is None:
+                    coverage["rule_fallback"] += 1
+                elif suggestions["confidence_score"] == "High":
+                    coverage["template_exact"] += 1
+                else:
+                    coverage["template_nearest"] += 1
+                for field in FIELDS:
+                    fields[field][suggestions[field]] += 1
+        rounds_elapsed.append(time.perf_counter() - started)
+        relative.append(len(uploads) / rounds_elapsed[-1] / calibration)
+    timings.sort()
+
+    return {
+        "calls": len(timings),
+        # Of the fastest round: other load on the machine only slows rounds down
+        "calls_per_s": round(len(uploads) / min(rounds_elapsed), 1),
+        # Calls per calibration loop iteration, median over rounds: comparable across machines
+        "relative": round(statistics.median(relative), 5),
+        "p50_us": round(statistics.median(timings), 1),
+        "p99_us": round(timings[int(len(timings) * 0.99) - 1], 1),
+        "coverage": {key: round(count / len(uploads), 4) for key, count in sorted(coverage.items())},
+        "distinct_values": {field: len(counter) for field, counter in fields.items()},
+        "top_values": {field: counter.most_common(3) for field, counter in fields.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", action="append",
+                        help="backend to run (repeatable, default: every registered backend)")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--image", action="store_true",
+                        help="attach a synthetic image so color extraction is included")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed fractional drop in calls/s before failing")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print full results as JSON")
+    args = parser.parse_args()
+
+    file_path = None
+    if args.image:
+        handle, file_path = tempfile.mkstemp(suffix=".png")
+        os.close(handle)
+        Image.new("RGB", (640, 480), (120, 20, 40)).save(file_path)
+
+    uploads = attribute_space(file_path)
+    backends = args.backend or get_engine_registry().names()
+    results = {name: run_backend(name, uploads, args.rounds) for name in backends}
+
+    if file_path:
+        os.remove(file_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    print(f"{len(uploads)} attribute combinations x {args.rounds} rounds{' (with image)' if args.image else ''}")
+    print(f"{'backend':12}{'calls/s':>12}{'relative':>10}{'p50 us':>10}{'p99 us':>10}  coverage")
+    for name, result in results.items():
+        coverage = ", ".join(f"{key}={value:.0%}" for key, value in result["coverage"].items())
+        print(f"{name:12}{result['calls_per_s']:12.1f}{result['relative']:10.4f}{result['p50_us']:10.1f}"
+              f"{result['p99_us']:10.1f}  {coverage}")
+
+    key = "with_image" if args.image else "no_image"
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline[key] = {
+            "machine": machine(),
+            "rounds": args.rounds,
+            "results": {
+                name: {k: v for k, v in result.items() if k != "top_values"}
+                for name, result in results.items()
+            },
+        }
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {BASELINE_PATH}")
+        return
+
+    expected_run = baseline.get(key, {})
+    if expected_run.get("machine", machine()) != machine():
+        print(f"Warning: baseline recorded on {expected_run['machine']}, this is {machine()}; "
+              f"not comparing (refresh with --update-baseline)")
+        return
+
+    regressions = []
+    for name, result in results.items():
+        expected = expected_run.get("results", {}).get(name)
+        if not expected or "relative" not in expected:
+            continue
+        floor = expected["relative"] * (1 - args.threshold)
+        change = result["relative"] / expected["relative"] - 1
+        print(f"{name}: {change:+.1%} calls/s vs baseline, relative to the calibration loop")
+        if result["relative"] < floor:
+            regressions.append(f"{name}: {result['relative']:.4f} calls per calibration loop < {floor:.4f} "
+                               f"(baseline {expected['relative']:.4f})")
+
+    if regressions:
+        print("Throughput regression:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
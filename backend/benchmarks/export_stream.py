@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Measure streaming admin exports over millions of rows
+
+Seeds a scratch schema with uploads and suggestions (half catalog-based),
+then streams each export (uploads and suggestions, NDJSON and CSV) through
+ExportService into a byte counter, reporting rows/s, MB/s and the peak
+resident memory growth while streaming. For comparison, loads a slice of
+uploads with fetchall() the way /api/admin/uploads/by-type does.
+
+Usage (from backend/):
+    python -m benchmarks.export_stream [--rows 3000000] [--fetchall-rows 1000000]
+"""
+
+import argparse
+import os
+import time
+from app.core.database import get_connection, get_db_cursor
+from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
+from app.services.export_service import ExportService
+from app.services.upload_service import DesignSuggestionService, UPLOAD_COLUMNS
+
+SCHEMA = "bench_export"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss() -> int:
+    """Current resident set size in bytes"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+def setup(conn, rows: int, users: int):
+    """Create the scratch schema and seed uploads and suggestions in SQL"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"CREATE TABLE {SCHEMA}.design_templates (LIKE public.design_templates INCLUDING ALL)")
+        for table in ("uploads", "design_suggestions"):
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING DEFAULTS INCLUDING GENERATED)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+
+    DesignSuggestionService.sync_templates(conn)
+
+    def values(enum) -> list:
+        return [member.value for member in enum]
+
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                   budget_range, size_info, created_at)
+               SELECT i, 1 + i %% %(users)s, './uploads/bench.jpg',
+                      (%(cloth_types)s::text[])[1 + i %% 8], (%(occasions)s::text[])[1 + i %% 5],
+                      (%(genders)s::text[])[1 + i %% 3], (%(age_groups)s::text[])[1 + i %% 3],
+                      (%(budgets)s::text[])[1 + i %% 3],
+                      CASE WHEN i %% 3 = 0 THEN 'pure silk with zari border' END,
+                      now() - i * interval '10 seconds'
+               FROM generate_series(1, %(rows)s) i""",
+            {"rows": rows, "users": users, "cloth_types": values(ClothType), "occasions": values(Occasion),
+             "genders": values(Gender), "age_groups": values(AgeGroup), "budgets": values(BudgetRange)}
+        )
+        cursor.execute("ALTER TABLE uploads ADD PRIMARY KEY (id)")
+        # Even ids reference a catalog template, odd ids carry rule-based text
+        cursor.execute(
+            """WITH catalog AS (SELECT array_agg(id ORDER BY id) AS ids FROM design_templates)
+               INSERT INTO design_suggestions (id, upload_id, user_id, template_id, neck_design, sleeve_style,
+                                               embroidery_pattern, color_combination, border_style, description)
+               SELECT u.id, u.id, u.user_id,
+                      CASE WHEN u.id % 2 = 0 THEN catalog.ids[1 + u.id % cardinality(catalog.ids)] END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Boat neck with piping' END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Three-quarter sleeves' END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Light thread work on the yoke' END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Pastel pink with silver' END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Thin contrast border' END,
+                      CASE WHEN u.id % 2 = 1 THEN 'Rule-based suggestion' END
+               FROM uploads u, catalog"""
+        )
+        cursor.execute("ALTER TABLE design_suggestions ADD PRIMARY KEY (id)")
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE uploads")
+        cursor.execute("VACUUM ANALYZE design_suggestions")
+    conn.autocommit = False
+
+
+def measure_stream(conn, query: str, params: tuple, columns: tuple, format: str) -> dict:
+    """Drain one export, tracking bytes, wall time and peak RSS growth"""
+    baseline = rss()
+    peak = baseline
+    size = 0
+    chunks = 0
+    started = time.perf_counter()
+    for chunk in ExportService.stream(conn, query, params, columns, format):
+        size += len(chunk)
+        chunks += 1
+        if chunks % 20 == 0:
+            peak = max(peak, rss())
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "mb": size / 1024 / 1024, "rss_mb": (max(peak, rss()) - baseline) / 1024 / 1024}
+
+
+def measure_fetchall(conn, rows: int) -> dict:
+    """Load uploads into memory at once, as the by-type endpoint does"""
+    baseline = rss()
+    started = time.perf_counter()
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"SELECT {UPLOAD_COLUMNS} FROM uploads ORDER BY id LIMIT %s", (rows,))
+        results = cursor.fetchall()
+        peak = rss()
+    elapsed = time.perf_counter() - started
+    del results
+    return {"seconds": elapsed, "rss_mb": (peak - baseline) / 1024 / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3000000, help="uploads (one suggestion each)")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--fetchall-rows", type=int, default=1000000, help="rows for the fetchall comparison")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        started = time.perf_counter()
+        setup(conn, args.rows, args.users)
+        print(f"seeded {args.rows} uploads/suggestions in {time.perf_counter() - started:.0f} s")
+
+        print(f"{'export':24}{'rows':>10}{'s':>8}{'rows/s':>10}{'MB':>9}{'MB/s':>8}{'RSS +MB':>9}")
+        exports = (("uploads", ExportService.uploads_query()), ("suggestions", ExportService.suggestions_query()))
+        for name, (query, params, columns) in exports:
+            for format in ("ndjson", "csv"):
+                # The search_path of `conn` points at the scratch schema
+                result = measure_stream(conn, query, params, columns, format)
+                print(f"{name + ' ' + format:24}{args.rows:10}{result['seconds']:8.1f}"
+                      f"{args.rows / result['seconds']:10.0f}{result['mb']:9.0f}"
+                      f"{result['mb'] / result['seconds']:8.1f}{result['rss_mb']:9.1f}")
+
+        rows = min(args.fetchall_rows, args.rows)
+        result = measure_fetchall(conn, rows)
+        print(f"{'uploads fetchall()':24}{rows:10}{result['seconds']:8.1f}"
+              f"{rows / result['seconds']:10.0f}{'':9}{'':8}{result['rss_mb']:9.1f}")
+    finally:
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Compare Python-built and Postgres-rendered JSON for list endpoints
+
+Seeds a throwaway user (see dashboard_bootstrap) with uploads and a long
+suggestion history on one upload, checks that both paths return the same
+data, then reports CPU time (process_time, client included) and wall time
+per request for each endpoint in settings.db_json_endpoints.
+
+Usage (from backend/):
+    python -m benchmarks.list_rendering [--uploads 100] [--suggestions 50] [--requests 300]
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.core.config import get_settings
+from app.core.database import get_connection, get_db_cursor
+from app.core.security import create_access_token
+from app.models.upload import Upload
+from app.services.design_suggestion_service import DesignSuggestionEngine
+from benchmarks.dashboard_bootstrap import EMAIL, setup, teardown
+from main import app
+
+settings = get_settings()
+
+
+def seed_history(conn, user_id: int, suggestions: int) -> int:
+    """Add template and rule suggestions to one upload; returns its id"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("UPDATE users SET role = 'admin' WHERE id = %s", (user_id,))
+        cursor.execute("SELECT * FROM uploads WHERE user_id = %s ORDER BY id LIMIT 1", (user_id,))
+        row = cursor.fetchone()
+        upload = Upload(cloth_type=row['cloth_type'], occasion=row['occasion'], budget_range=row['budget_range'])
+        for i in range(suggestions):
+            if i % 2:
+                data = DesignSuggestionEngine.rule_suggestions(upload)
+            else:
+                data = DesignSuggestionEngine.template_suggestions(upload, i % 5)
+            cursor.execute(
+                """INSERT INTO design_suggestions (upload_id, user_id, neck_design, sleeve_style, embroidery_pattern,
+                                                  color_combination, border_style, description, confidence_score, template_id)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                (row['id'], user_id,
+                 *((data['neck_design'], data['sleeve_style'], data['embroidery_pattern'], data['color_combination'],
+                    data['border_style'], data['description']) if not data.get('template_id') else (None,) * 6),
+                 data['confidence_score'], data.get('template_id'))
+            )
+    return row['id']
+
+
+def normalized(body: list) -> list:
+    """Parse timestamps so both paths' formatting compares equal"""
+    return [
+        {key: datetime.fromisoformat(value) if key.endswith("_at") else value for key, value in item.items()}
+        for item in body
+    ]
+
+
+def measure(client: TestClient, path: str, params: dict, requests: int) -> dict:
+    client.get(path, params=params).raise_for_status()
+
+    cpu = []
+    wall = []
+    for _ in range(requests):
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        response = client.get(path, params=params)
+        wall.append((time.perf_counter() - started) * 1000)
+        cpu.append((time.process_time() - cpu_started) * 1000)
+    response.raise_for_status()
+
+    return {
+        "bytes": len(response.content),
+        "cpu_ms": statistics.mean(cpu),
+        "p50_ms": statistics.median(wall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=100, help="uploads per list response")
+    parser.add_argument("--suggestions", type=int, default=50, help="suggestions on the listed upload")
+    parser.add_argument("--requests", type=int, default=300, help="timed requests per endpoint and path")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark user")
+    args = parser.parse_args()
+
+    configured = settings.db_json_endpoints
+    conn = get_connection()
+    try:
+        user_id = setup(conn, args.uploads)
+        upload_id = seed_history(conn, user_id, args.suggestions)
+        token = create_access_token(data={"sub": str(user_id), "email": EMAIL})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+        endpoints = {
+            "my_uploads": ("/api/uploads/my-uploads", {"limit": args.uploads}),
+            "upload_suggestions": (f"/api/uploads/{upload_id}/suggestions", {}),
+            "admin_uploads": ("/api/admin/uploads", {"limit": args.uploads}),
+        }
+
+        print(f"{'endpoint':20}{'path':>10}{'bytes':>9}{'cpu ms':>9}{'p50 ms':>9}")
+        for name, (path, params) in endpoints.items():
+            settings.db_json_endpoints = ""
+            expected = client.get(path, params=params).json()
+            python = measure(client, path, params, args.requests)
+
+            settings.db_json_endpoints = name
+            rendered = client.get(path, params=params).json()
+            postgres = measure(client, path, params, args.requests)
+
+            if normalized(rendered) != normalized(expected):
+                raise SystemExit(f"{name}: Postgres-rendered body differs from the response model body")
+
+            for label, result in (("python", python), ("postgres", postgres)):
+                print(f"{name:20}{label:>10}{result['bytes']:9}{result['cpu_ms']:9.3f}{result['p50_ms']:9.3f}")
+            print(f"{'':20}{'cpu change':>10}{postgres['cpu_ms'] / python['cpu_ms'] - 1:+18.1%}")
+    finally:
+        settings.db_json_endpoints = configured
+        if not args.keep:
+            teardown(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
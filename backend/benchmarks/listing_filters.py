@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Check that every upload listing filter combination is served by an index
+
+Seeds a scratch schema with uploads spread over two years, copies
+public's upload indexes, then EXPLAIN ANALYZEs UploadService.listing_query
+for every combination of the cloth type, occasion, budget and date range
+filters, for one user and for the admin listing. Prints the indexes each
+plan uses and its execution time; exits non-zero if any plan reads
+uploads with a sequential scan.
+
+Usage (from backend/):
+    python -m benchmarks.listing_filters [--rows 500000] [--users 5000]
+"""
+
+import argparse
+import itertools
+import random
+import sys
+from datetime import date, datetime, timedelta
+import psycopg2.extras
+from app.core.database import get_connection, get_db_cursor
+from app.models.upload import ClothType, Occasion, Gender, AgeGroup, BudgetRange
+from app.schemas.upload import UploadFilters
+from app.services.upload_service import UploadService, UPLOAD_COLUMNS
+
+SCHEMA = "bench_filters"
+
+FILTERS = {
+    "cloth_type": ClothType.SAREE,
+    "occasion": Occasion.WEDDING,
+    "budget_range": BudgetRange.HIGH,
+    "created_from": date.today() - timedelta(days=90),
+    "created_to": date.today() - timedelta(days=30),
+}
+
+
+def setup(conn, rows: int, users: int):
+    """Create the scratch uploads table, seed it, then copy public's indexes"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"CREATE TABLE {SCHEMA}.uploads (LIKE public.uploads INCLUDING ALL EXCLUDING INDEXES)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+
+    random.seed(0)
+    now = datetime.now()
+    batch = 10000
+    for start in range(0, rows, batch):
+        uploads = [
+            (i, random.randint(1, users), "./uploads/bench.jpg", random.choice(list(ClothType)).value,
+             random.choice(list(Occasion)).value, random.choice(list(Gender)).value,
+             random.choice(list(AgeGroup)).value, random.choice(list(BudgetRange)).value,
+             now - timedelta(seconds=random.randint(0, 2 * 365 * 86400)))
+            for i in range(start + 1, min(start + batch, rows) + 1)
+        ]
+        with get_db_cursor(conn) as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                       budget_range, created_at)
+                   VALUES %s""",
+                uploads
+            )
+
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("SELECT indexdef FROM pg_indexes WHERE schemaname = 'public' AND tablename = 'uploads'")
+        for row in cursor.fetchall():
+            cursor.execute(row['indexdef'].replace(" ON public.", f" ON {SCHEMA}.", 1))
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE uploads")
+    conn.autocommit = False
+
+
+def scans(plan: dict) -> list:
+    """(node type, index or relation) of every scan node in a JSON plan"""
+    found = []
+    if "Scan" in plan["Node Type"]:
+        found.append((plan["Node Type"], plan.get("Index Name") or plan.get("Relation Name")))
+    for child in plan.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    failures = 0
+    try:
+        setup(conn, args.rows, args.users)
+
+        print(f"{'scope':7}{'filters':60}{'ms':>8}  scans")
+        for scope, user_id in (("user", 1), ("admin", None)):
+            for size in range(len(FILTERS) + 1):
+                for names in itertools.combinations(FILTERS, size):
+                    filters = UploadFilters(**{name: FILTERS[name] for name in names})
+                    query, params = UploadService.listing_query(UPLOAD_COLUMNS, user_id, filters)
+                    with get_db_cursor(conn) as cursor:
+                        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", params)
+                        explained = cursor.fetchone()['QUERY PLAN'][0]
+                    used = scans(explained["Plan"])
+                    sequential = any(node == "Seq Scan" for node, _ in used)
+                    failures += sequential
+                    print(f"{scope:7}{','.join(names) or '-':60}{explained['Execution Time']:8.2f}  "
+                          f"{'SEQ ' if sequential else ''}{', '.join(sorted({name for _, name in used}))}")
+    finally:
+        if not args.keep:
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+    if failures:
+        print(f"{failures} filter combinations scan uploads sequentially", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
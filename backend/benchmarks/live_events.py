@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Measure live dashboard event latency and fan-out to connected admins
+
+Serves the app with uvicorn on a local port, opens --clients concurrent
+/api/admin/events streams as an admin, then commits --writes single-upload
+transactions (and a save every fifth) at --rate per second. Reports how
+many notifications were coalesced into pushed events, the commit-to-client
+latency p50/p99 across all clients, that every client's summed deltas match
+what was written (and unwritten again on cleanup), and how many LISTEN
+connections the database saw for all of them.
+
+Usage (from backend/):
+    python -m benchmarks.live_events [--clients 50] [--writes 500] [--rate 100]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+import httpx
+import uvicorn
+from app.core.database import get_connection, get_db_cursor, DASHBOARD_CHANNEL
+from app.core.security import create_access_token
+from benchmarks.dashboard_bootstrap import setup, teardown
+from main import app
+
+
+def write(conn, user_id: int, writes: int, rate: float, commits: list):
+    """Commit one upload per transaction (a save with every fifth); records commit times"""
+    for i in range(writes):
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                """INSERT INTO uploads (user_id, file_path, cloth_type, occasion, gender, age_group, budget_range)
+                   VALUES (%s, './uploads/bench.jpg', 'kurti', 'casual', 'female', 'adult', '3000-8000')
+                   RETURNING id""",
+                (user_id,)
+            )
+            upload_id = cursor.fetchone()['id']
+            if i % 5 == 0:
+                cursor.execute(
+                    """INSERT INTO design_suggestions (upload_id, user_id, neck_design, sleeve_style,
+                           embroidery_pattern, color_combination, border_style, description)
+                       VALUES (%s, %s, 'Round', 'Short', 'None', 'Red', 'Plain', 'Bench') RETURNING id""",
+                    (upload_id, user_id)
+                )
+                cursor.execute(
+                    "INSERT INTO saved_designs (user_id, design_suggestion_id) VALUES (%s, %s)",
+                    (user_id, cursor.fetchone()['id'])
+                )
+        commits.append(time.perf_counter())
+        time.sleep(1 / rate)
+
+
+async def client(url: str, token: str, ready: asyncio.Event, totals: dict, arrivals: list):
+    """Follow the event stream until cancelled, recording (arrival time, cumulative uploads) per deltas event"""
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(timeout=None) as http:
+        async with http.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: ") and event == "deltas":
+                    data = json.loads(line[6:])
+                    totals["uploads"] += sum(item["count"] for item in data["uploads"])
+                    totals["saves"] += data["saves"]
+                    arrivals.append((time.perf_counter(), totals["uploads"]))
+                elif line.startswith("data: ") and event == "resync":
+                    # The first one is sent once the stream is subscribed
+                    if ready.is_set():
+                        totals["resyncs"] += 1
+                    ready.set()
+
+
+async def run(args, token: str, user_id: int, conn) -> None:
+    url = f"http://127.0.0.1:{args.port}/api/admin/events"
+    readies = [asyncio.Event() for _ in range(args.clients)]
+    totals = [{"uploads": 0, "saves": 0, "resyncs": 0} for _ in range(args.clients)]
+    results = [[] for _ in range(args.clients)]
+    tasks = [
+        asyncio.create_task(client(url, token, ready, total, arrivals))
+        for ready, total, arrivals in zip(readies, totals, results)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in readies))
+
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            "SELECT count(*) AS n FROM pg_stat_activity WHERE query = %s", (f"LISTEN {DASHBOARD_CHANNEL}",)
+        )
+        listeners = cursor.fetchone()['n']
+
+    commits = []
+    started = time.perf_counter()
+    await asyncio.to_thread(write, conn, user_id, args.writes, args.rate, commits)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(1)
+    written = [dict(total) for total in totals]
+
+    # Deleting everything again should arrive as negative deltas
+    await asyncio.to_thread(teardown, conn)
+    await asyncio.sleep(1)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies = []
+    for arrivals in results:
+        position = 0
+        for i, committed in enumerate(commits, start=1):
+            while position < len(arrivals) and arrivals[position][1] < i:
+                position += 1
+            if position < len(arrivals):
+                latencies.append((arrivals[position][0] - committed) * 1000)
+    latencies.sort()
+    events = statistics.mean(len(arrivals) for arrivals in results)
+
+    print(f"{args.clients} clients, {args.writes} commits in {elapsed:.1f} s; "
+          f"{listeners} LISTEN connection(s) in the database")
+    print(f"~{events:.0f} deltas events per client (notifications coalesced every flush window)")
+    print(f"commit -> client latency over {len(latencies)} deliveries: "
+          f"p50 {statistics.median(latencies):.1f} ms, p99 {latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.1f} ms")
+    saves = (args.writes + 4) // 5
+    complete = all(total["uploads"] == args.writes and total["saves"] == saves for total in written)
+    print(f"every client summed {args.writes} uploads / {saves} saves: {complete}; "
+          f"back to zero after delete: {all(total['uploads'] == 0 and total['saves'] == 0 for total in totals)}; "
+          f"resyncs: {sum(total['resyncs'] for total in totals)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100.0, help="commits per second")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    thread = threading.Thread(target=server.run)
+    try:
+        user_id = setup(conn, 0)
+        with get_db_cursor(conn) as cursor:
+            cursor.execute("UPDATE users SET role = 'admin' WHERE id = %s", (user_id,))
+        token = create_access_token({"sub": str(user_id)})
+
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        asyncio.run(run(args, token, user_id, conn))
+    finally:
+        server.should_exit = True
+        if thread.is_alive():
+            thread.join()
+        teardown(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Measure suggestion search latency on a large synthetic dataset
+
+Seeds a scratch schema with uploads and suggestions (half catalog-based,
+half rule-based text, a share of uploads with fabric notes), builds the
+same indexes as public, then times SearchService.search for long
+(full-text) and short (fuzzy, or prefix without pg_trgm) queries, first
+page and keyset page 2, for one user and across all users.
+
+Usage (from backend/):
+    python -m benchmarks.search_latency [--rows 1000000] [--users 20000]
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Uploaded files go to a scratch directory (read when the app is imported)
+_uploads_dir = tempfile.TemporaryDirectory()
+os.environ["UPLOADS_DIR"] = _uploads_dir.name
+
+import psycopg2.extras
+from fastapi.testclient import TestClient
+from PIL import Image
+from app.core.database import get_connection, get_db_cursor
+from app.core.security import create_access_token
+from app.services.search_service import SearchService
+from app.services.template_index import get_template_index
+from app.services.upload_service import DesignSuggestionService
+from benchmarks.dashboard_bootstrap import setup as setup_user, teardown as teardown_user
+from main import app
+
+SCHEMA = "bench_search"
+BULK_TABLES = ("uploads", "design_suggestions")
+
+LONG_QUERIES = ["zari border", "mirror work", "contrast piping", "thread embroidery", "pastel pink"]
+SHORT_QUERIES = ["zari", "silk", "boat", "gold", "lace"]
+NOTES = [
+    "pure silk with zari border", "soft cotton, pastel print", "georgette with mirror work",
+    "heavy banarasi brocade", "linen blend for office wear", "chiffon with lace trim",
+]
+
+
+def check_upload_notes(conn) -> bool:
+    """Post an upload with fabric notes through the API and search for them"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 30, 45)).save(buffer, "JPEG")
+    user_id = setup_user(conn, 0)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/uploads",
+                headers=headers,
+                files={"file": ("bench.jpg", buffer.getvalue(), "image/jpeg")},
+                data={"cloth_type": "kurti", "occasion": "casual", "gender": "female", "age_group": "adult",
+                      "budget_range": "3000-8000", "fabric_description": "handwoven ikat weave"},
+            )
+            response.raise_for_status()
+            found = True
+            for query in ("ikat", "handwoven ikat weave"):
+                hits = client.get("/api/design-suggestions/search", params={"q": query}, headers=headers).json()
+                found = found and any(hit["upload_id"] == response.json()["id"] for hit in hits)
+        return response.json()["fabric_description"] == "handwoven ikat weave" and found
+    finally:
+        teardown_user(conn)
+
+
+def setup(conn, rows: int, users: int):
+    """Create the scratch schema, seed rows, then copy public's indexes"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"CREATE TABLE {SCHEMA}.design_templates (LIKE public.design_templates INCLUDING ALL)")
+        # The big tables get their indexes after loading
+        for table in BULK_TABLES:
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL EXCLUDING INDEXES)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+
+    DesignSuggestionService.sync_templates(conn)
+
+    index = get_template_index()
+    random.seed(0)
+    batch = 10000
+    for start in range(0, rows, batch):
+        uploads = []
+        suggestions = []
+        for i in range(start + 1, min(start + batch, rows) + 1):
+            position = random.randrange(len(index))
+            cloth_type, occasion = index.keys[position]
+            user_id = random.randint(1, users)
+            notes = random.choice(NOTES) if random.random() < 0.3 else None
+            uploads.append((i, user_id, "./uploads/bench.jpg", cloth_type, occasion, "female", "adult",
+                            "3000-8000", notes))
+            if i % 2:
+                # Rule-based rows keep their own text
+                template = index.templates[random.randrange(len(index))]
+                suggestions.append((i, i, user_id, None, template["neck"], template["sleeve"],
+                                    template["embroidery"], template["color"], template["border"], "rule-based"))
+            else:
+                suggestions.append((i, i, user_id, index.template_ids[position], None, None, None, None, None, None))
+        with get_db_cursor(conn) as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group,
+                                       budget_range, size_info)
+                   VALUES %s""",
+                uploads
+            )
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO design_suggestions (id, upload_id, user_id, template_id, neck_design, sleeve_style,
+                                                  embroidery_pattern, color_combination, border_style, description)
+                   VALUES %s""",
+                suggestions
+            )
+
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = 'public' AND tablename = ANY(%s)",
+            (list(BULK_TABLES),)
+        )
+        for row in cursor.fetchall():
+            cursor.execute(row['indexdef'].replace(" ON public.", f" ON {SCHEMA}.", 1))
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        for table in BULK_TABLES + ("design_templates",):
+            cursor.execute(f"VACUUM ANALYZE {table}")
+    conn.autocommit = False
+
+
+def measure(conn, queries: list, user_ids: list, repeats: int) -> dict:
+    """p50/p99 of the first page and of keyset page 2"""
+    first, second = [], []
+    for _ in range(repeats):
+        for query in queries:
+            user_id = random.choice(user_ids)
+            started = time.perf_counter()
+            page = SearchService.search(conn, query, user_id, 20)
+            first.append((time.perf_counter() - started) * 1000)
+            if len(page) == 20:
+                last, rank = page[-1]
+                started = time.perf_counter()
+                SearchService.search(conn, query, user_id, 20, (rank, last.id))
+                second.append((time.perf_counter() - started) * 1000)
+
+    def percentiles(timings: list) -> tuple:
+        if not timings:
+            return float("nan"), float("nan")
+        timings.sort()
+        return statistics.median(timings), timings[max(int(len(timings) * 0.99) - 1, 0)]
+
+    return {"page1": percentiles(first), "page2": percentiles(second), "pages2": len(second)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000, help="uploads (one suggestion each)")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=20, help="timed runs of each query per scope")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        print(f"upload notes stored and found by search: {check_upload_notes(conn)}")
+        started = time.perf_counter()
+        setup(conn, args.rows, args.users)
+        print(f"seeded {args.rows} uploads/suggestions in {time.perf_counter() - started:.0f} s")
+
+        with get_db_cursor(conn) as cursor:
+            fuzzy = "pg_trgm" if SearchService._has_trigram(cursor) else "prefix"
+
+        random.seed(1)
+        scopes = (("one user", list(range(1, args.users + 1))), ("all users", [None]))
+        kinds = (("long", LONG_QUERIES), (f"short ({fuzzy})", SHORT_QUERIES))
+        # Warm the buffer cache
+        for _, user_ids in scopes:
+            for _, queries in kinds:
+                measure(conn, queries, user_ids, 1)
+
+        print(f"{'':12}{'query':>18}{'p50 ms':>10}{'p99 ms':>10}{'p2 p50':>10}{'p2 p99':>10}")
+        for scope, user_ids in scopes:
+            for kind, queries in kinds:
+                result = measure(conn, queries, user_ids, args.repeats)
+                print(f"{scope:12}{kind:>18}{result['page1'][0]:10.2f}{result['page1'][1]:10.2f}"
+                      f"{result['page2'][0]:10.2f}{result['page2'][1]:10.2f}")
+    finally:
+        if not args.keep:
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+        _uploads_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
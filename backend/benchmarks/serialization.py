@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Response serialization cost for 1k-item lists
+
+Times the three ways a route's dict output can become a response body:
+response_model validation + stdlib JSONResponse (the old default),
+validation + ORJSONResponse (the app default), and trusted_response
+(orjson, no validation). Bodies are checked to decode to the same data.
+No database needed.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--items 1000] [--rounds 50]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.schemas.design_suggestion import DesignSuggestionResponse
+from app.schemas.upload import UploadResponse
+from app.services.template_index import get_template_index
+from app.services.design_suggestion_service import DesignSuggestionEngine
+from app.utils.responses import trusted_response
+
+
+def suggestion_items(count: int) -> list:
+    index = get_template_index()
+    created_at = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    items = []
+    for i in range(count):
+        position = i % len(index)
+        template = index.templates[position]
+        cloth_type, occasion = index.keys[position]
+        items.append({
+            "id": i + 1,
+            "upload_id": i + 1,
+            "user_id": 7,
+            "neck_design": template["neck"],
+            "sleeve_style": template["sleeve"],
+            "embroidery_pattern": template["embroidery"],
+            "color_combination": template["color"],
+            "border_style": template["border"],
+            "description": DesignSuggestionEngine.render_template_description(
+                cloth_type, occasion, template["neck"], template["sleeve"], template["embroidery"],
+                template["color"], template["border"]
+            ),
+            "confidence_score": "High",
+            "template_id": index.template_ids[position],
+            "created_at": created_at + timedelta(seconds=i),
+        })
+    return items
+
+
+def upload_items(count: int) -> list:
+    index = get_template_index()
+    created_at = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    return [
+        {
+            "id": i + 1,
+            "user_id": 7,
+            "file_path": f"./uploads/7/{i + 1}.jpg",
+            "cloth_type": index.keys[i % len(index)][0],
+            "occasion": index.keys[i % len(index)][1],
+            "gender": "female",
+            "age_group": "adult",
+            "budget_range": "3000-8000",
+            "fabric_description": "soft cotton" if i % 2 else None,
+            "created_at": created_at + timedelta(seconds=i),
+        } for i in range(count)
+    ]
+
+
+def validated(field, items: list, response_class) -> bytes:
+    """What FastAPI does with a dict return value and a response_model"""
+    content = asyncio.run(serialize_response(field=field, response_content=items))
+    return response_class(content).body
+
+
+def timed(render, rounds: int) -> tuple:
+    body = render()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - started) * 1000)
+    return body, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = {
+        "DesignSuggestionResponse": (DesignSuggestionResponse, suggestion_items(args.items)),
+        "UploadResponse": (UploadResponse, upload_items(args.items)),
+    }
+
+    print(f"{args.items} items, median of {args.rounds} rounds")
+    print(f"{'model':26}{'path':>22}{'ms':>9}{'bytes':>10}")
+    for name, (model, items) in cases.items():
+        field = create_response_field(name="response", type_=list[model])
+        paths = {
+            "validate + json": lambda: validated(field, items, JSONResponse),
+            "validate + orjson": lambda: validated(field, items, ORJSONResponse),
+            "trusted orjson": lambda: trusted_response(items).body,
+        }
+
+        reference = None
+        for label, render in paths.items():
+            body, median_ms = timed(render, args.rounds)
+            if reference is None:
+                reference = json.loads(body)
+            elif json.loads(body) != reference:
+                raise SystemExit(f"{name}: {label} body differs from the validated body")
+            print(f"{name:26}{label:>22}{median_ms:9.3f}{len(body):10}")
+
+
+if __name__ == "__main__":
+    main()
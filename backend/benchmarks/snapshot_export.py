@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Measure Parquet snapshot export throughput, memory and size
+
+Seeds the export benchmark's scratch schema (uploads and suggestions) plus
+saved designs, writes a snapshot with SnapshotService into a temporary
+directory, and reports rows/s, peak resident memory growth and on-disk size
+next to the NDJSON export of the same tables. Reads the snapshot back with
+pyarrow to check row counts and that enum columns come back as
+dictionaries. Needs the optional pyarrow package.
+
+Usage (from backend/):
+    python -m benchmarks.snapshot_export [--rows 3000000]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import pyarrow.dataset as ds
+from app.core.database import get_connection, get_db_cursor
+from app.services.export_service import ExportService
+from app.services.snapshot_service import SnapshotService
+from benchmarks.export_stream import setup, rss, SCHEMA
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3000000, help="uploads (one suggestion each)")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        setup(conn, args.rows, args.users)
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(f"CREATE TABLE {SCHEMA}.saved_designs (LIKE public.saved_designs INCLUDING ALL)")
+            cursor.execute(
+                """INSERT INTO saved_designs (user_id, design_suggestion_id, saved_at)
+                   SELECT user_id, id, created_at + interval '1 day' FROM design_suggestions WHERE id % 5 = 0"""
+            )
+
+        ndjson_bytes = 0
+        for query, params, columns in (ExportService.uploads_query(), ExportService.suggestions_query()):
+            for chunk in ExportService.stream(conn, query, params, columns, "ndjson"):
+                ndjson_bytes += len(chunk)
+
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = rss()
+            peak = [baseline]
+            done = threading.Event()
+
+            def sample():
+                while not done.wait(0.05):
+                    peak[0] = max(peak[0], rss())
+
+            sampler = threading.Thread(target=sample)
+            sampler.start()
+            started = time.perf_counter()
+            manifest = SnapshotService.write(conn, directory, args.batch_size)
+            elapsed = time.perf_counter() - started
+            done.set()
+            sampler.join()
+
+            snapshot = os.path.join(directory, manifest["snapshot"])
+            rows = sum(table["rows"] for table in manifest["tables"].values())
+            print(f"snapshot of {rows} rows in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s), "
+                  f"RSS +{(peak[0] - baseline) / 1024 / 1024:.1f} MB")
+            print(f"{'table':22}{'rows':>10}{'months':>8}{'MB':>9}")
+            for table, counts in manifest["tables"].items():
+                size = directory_size(os.path.join(snapshot, table)) / 1024 / 1024
+                print(f"{table:22}{counts['rows']:10}{len(counts['months']):8}{size:9.1f}")
+            print(f"uploads + suggestions: Parquet "
+                  f"{(directory_size(os.path.join(snapshot, 'uploads')) + directory_size(os.path.join(snapshot, 'design_suggestions'))) / 1024 / 1024:.1f} MB"
+                  f" vs NDJSON {ndjson_bytes / 1024 / 1024:.1f} MB")
+
+            for table, counts in manifest["tables"].items():
+                dataset = ds.dataset(os.path.join(snapshot, table), format="parquet", partitioning="hive")
+                assert dataset.count_rows() == counts["rows"], table
+            uploads = ds.dataset(os.path.join(snapshot, "uploads"), format="parquet", partitioning="hive")
+            print(f"read back: row counts match; uploads.cloth_type is {uploads.schema.field('cloth_type').type}")
+    finally:
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
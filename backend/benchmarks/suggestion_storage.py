@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Compare legacy (full text) and normalized (template id) suggestion storage
+
+Seeds a scratch schema with legacy rows, measures table size and listing
+latency, runs the normalize backfill, then measures again.
+
+Usage (from backend/):
+    python -m benchmarks.suggestion_storage [--rows 200000] [--users 2000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import psycopg2.extras
+from app.core.database import get_connection, get_db_cursor
+from app.services.design_suggestion_service import DesignSuggestionEngine
+from app.services.template_index import get_template_index
+from app.services.upload_service import DesignSuggestionService
+
+SCHEMA = "bench_storage"
+
+
+def setup(conn, rows: int, users: int):
+    """Create the scratch schema and seed legacy suggestion rows"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        for table in ("uploads", "design_suggestions", "design_templates"):
+            cursor.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+
+    DesignSuggestionService.sync_templates(conn)
+
+    index = get_template_index()
+    random.seed(0)
+    batch = 10000
+    for start in range(0, rows, batch):
+        uploads = []
+        suggestions = []
+        for i in range(start + 1, min(start + batch, rows) + 1):
+            position = random.randrange(len(index))
+            cloth_type, occasion = index.keys[position]
+            template = index.templates[position]
+            user_id = random.randint(1, users)
+            uploads.append((i, user_id, f"./uploads/{i}.jpg", cloth_type, occasion, "female", "adult", "3000-8000"))
+            suggestions.append((
+                i, user_id, template["neck"], template["sleeve"], template["embroidery"],
+                template["color"], template["border"],
+                DesignSuggestionEngine.render_template_description(
+                    cloth_type, occasion, template["neck"], template["sleeve"], template["embroidery"],
+                    template["color"], template["border"]
+                ),
+            ))
+        with get_db_cursor(conn) as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO uploads (id, user_id, file_path, cloth_type, occasion, gender, age_group, budget_range)
+                   VALUES %s""",
+                uploads
+            )
+            psycopg2.extras.execute_values(
+                cursor,
+                """INSERT INTO design_suggestions (upload_id, user_id, neck_design, sleeve_style, embroidery_pattern,
+                                                  color_combination, border_style, description)
+                   VALUES %s""",
+                suggestions
+            )
+
+    with get_db_cursor(conn) as cursor:
+        cursor.execute("CREATE INDEX ON design_suggestions (user_id, created_at DESC)")
+    vacuum(conn)
+
+
+def vacuum(conn):
+    """Rewrite the table so sizes reflect live data only"""
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM FULL ANALYZE design_suggestions")
+    conn.autocommit = False
+
+
+def measure(conn, users: int, queries: int) -> dict:
+    """Table size and get_user_suggestions latency"""
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """SELECT pg_relation_size('design_suggestions') AS heap,
+                      pg_total_relation_size('design_suggestions') AS total"""
+        )
+        sizes = cursor.fetchone()
+
+    # Warm the buffer cache and the description cache
+    for user_id in range(1, min(users, 200) + 1):
+        DesignSuggestionService.get_user_suggestions(conn, user_id)
+
+    timings = []
+    for _ in range(queries):
+        user_id = random.randint(1, users)
+        started = time.perf_counter()
+        DesignSuggestionService.get_user_suggestions(conn, user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    return {
+        "heap_mb": sizes['heap'] / 1024 / 1024,
+        "total_mb": sizes['total'] / 1024 / 1024,
+        "p50_ms": statistics.median(timings),
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        setup(conn, args.rows, args.users)
+        before = measure(conn, args.users, args.queries)
+
+        DesignSuggestionService.normalize_existing(conn, batch_size=5000)
+        vacuum(conn)
+        after = measure(conn, args.users, args.queries)
+
+        print(f"{'':10}{'heap MB':>10}{'total MB':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for label, result in (("legacy", before), ("normalized", after)):
+            print(f"{label:10}{result['heap_mb']:10.1f}{result['total_mb']:10.1f}"
+                  f"{result['p50_ms']:10.3f}{result['p99_ms']:10.3f}")
+    finally:
+        if not args.keep:
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Measure the trending tracker's refresh and read cost
+
+Seeds a scratch schema with suggestions and saves (via the export
+benchmark's seeding), then times a cold TrendTracker load, incremental
+refreshes after small batches of new saves, and top-k reads, next to the
+GROUP BY scan a per-request computation would need. Then commits a save
+after one with a higher id was already folded in, and checks the
+incremental counts still match a cold load.
+
+Usage (from backend/):
+    python -m benchmarks.trending_refresh [--rows 1000000] [--saves 200000]
+"""
+
+import argparse
+import statistics
+import time
+from app.core.database import get_connection, get_db_cursor
+from app.services.trending_service import TrendTracker
+from benchmarks.export_stream import setup as seed_suggestions
+
+SCHEMA = "bench_export"
+
+
+def add_saves(conn, count: int):
+    with get_db_cursor(conn) as cursor:
+        cursor.execute(
+            """INSERT INTO saved_designs (user_id, design_suggestion_id)
+               SELECT user_id, id FROM design_suggestions ORDER BY random() LIMIT %s""",
+            (count,)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000, help="suggestions")
+    parser.add_argument("--saves", type=int, default=200000)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        seed_suggestions(conn, args.rows, max(args.rows // 20, 1))
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(f"CREATE TABLE {SCHEMA}.saved_designs (LIKE public.saved_designs INCLUDING ALL)")
+            cursor.execute(
+                """INSERT INTO saved_designs (user_id, design_suggestion_id, saved_at)
+                   SELECT user_id, id, now() - (id %% 500) * interval '1 hour'
+                   FROM design_suggestions ORDER BY id LIMIT %s""",
+                (args.saves,)
+            )
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE saved_designs")
+        conn.autocommit = False
+
+        started = time.perf_counter()
+        with get_db_cursor(conn) as cursor:
+            cursor.execute(
+                """SELECT COALESCE(ds.color_combination, t.color) AS color, COUNT(*)
+                   FROM design_suggestions ds LEFT JOIN design_templates t ON t.id = ds.template_id
+                   GROUP BY 1"""
+            )
+            cursor.fetchall()
+        scan_ms = (time.perf_counter() - started) * 1000
+
+        tracker = TrendTracker(72.0, 3.0)
+        tracker.refresh(conn)
+        cold_ms = tracker.refresh_ms
+
+        incremental = []
+        for _ in range(20):
+            add_saves(conn, 100)
+            tracker.refresh(conn)
+            incremental.append(tracker.refresh_ms)
+
+        reads = []
+        for _ in range(10000):
+            started = time.perf_counter()
+            tracker.top_colors(5)
+            tracker.top_patterns(5)
+            reads.append((time.perf_counter() - started) * 1000)
+
+        print(f"{args.rows} suggestions, {args.saves} saves")
+        print(f"GROUP BY scan of suggestion colors      {scan_ms:10.1f} ms")
+        print(f"cold tracker load                       {cold_ms:10.1f} ms")
+        print(f"incremental refresh (+100 saves) p50     {statistics.median(incremental):10.2f} ms")
+        print(f"top-5 colors + patterns p50             {statistics.median(reads) * 1000:10.1f} us")
+        print(f"top colors: {[color for color, _ in tracker.top_colors(5)]}")
+        print(f"top patterns: {[pattern for pattern, _ in tracker.top_patterns(5)]}")
+
+        # A save whose id is allocated first but committed last
+        late = get_connection()
+        try:
+            with late.cursor() as cursor:
+                cursor.execute(f"SET search_path TO {SCHEMA}")
+                cursor.execute(
+                    """INSERT INTO saved_designs (user_id, design_suggestion_id)
+                       SELECT user_id, id FROM design_suggestions ORDER BY random() LIMIT 1"""
+                )
+            add_saves(conn, 100)
+            tracker.refresh(conn)
+            late.commit()
+        finally:
+            late.close()
+        tracker.refresh(conn)
+        cold = TrendTracker(72.0, 3.0)
+        cold.refresh(conn)
+        now = time.time()
+        matches = all(
+            abs(sum(value for _, value in ours.top(100, now)) - sum(value for _, value in theirs.top(100, now)))
+            < 1e-6 * sum(value for _, value in theirs.top(100, now))
+            for ours, theirs in ((tracker.colors, cold.colors), (tracker.patterns, cold.patterns))
+        )
+        print(f"incremental counts match a cold load after a late commit: {matches}")
+    finally:
+        if not args.keep:
+            conn.rollback()
+            with get_db_cursor(conn) as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
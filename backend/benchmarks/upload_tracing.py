@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Measure upload tracing overhead and check the exported span trees
+
+Posts --uploads uploads through the app (TestClient, similarity engine so
+the engine runs in its thread pool) with tracing off, then with every
+request sampled and exported to a JSON lines file and to a stand-in OTLP
+collector on a local port. Reports upload latency for each, the estimated
+cost of the instrumentation when sampling is off (span() calls per upload
+times their cost, against upload latency), and checks every trace is one
+tree with the engine span, opened in the engine's worker thread, under
+EngineRegistry.generate.
+
+Usage (from backend/):
+    python -m benchmarks.upload_tracing [--uploads 200]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Uploaded files go to a scratch directory (read when the app is imported)
+_uploads_dir = tempfile.TemporaryDirectory()
+os.environ["UPLOADS_DIR"] = _uploads_dir.name
+
+from fastapi.testclient import TestClient
+from PIL import Image
+from app.core import tracing
+from app.core.database import get_connection
+from app.core.security import create_access_token
+from benchmarks.dashboard_bootstrap import setup, teardown
+from main import app
+
+
+class Collector(BaseHTTPRequestHandler):
+    """Stand-in OTLP/HTTP collector keeping every posted span"""
+
+    spans = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        for resource in body["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                Collector.spans.extend(scope["spans"])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def tracing_middleware(client: TestClient) -> tracing.TracingMiddleware:
+    client.get("/health")
+    layer = app.middleware_stack
+    while not isinstance(layer, tracing.TracingMiddleware):
+        layer = layer.app
+    return layer
+
+
+def post_uploads(client: TestClient, token: str, image: bytes, n: int) -> list:
+    timings = []
+    for _ in range(n):
+        started = time.perf_counter()
+        response = client.post(
+            "/api/uploads",
+            headers={"Authorization": f"Bearer {token}"},
+            files={"file": ("bench.jpg", image, "image/jpeg")},
+            data={"cloth_type": "kurti", "occasion": "casual", "gender": "female", "age_group": "adult",
+                  "budget_range": "3000-8000", "engine": "similarity"},
+        )
+        response.raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def check_trees(spans: list, parent_key: str, id_key: str, name_key: str) -> tuple:
+    """(traces, all single-rooted trees with the engine span under EngineRegistry.generate)"""
+    traces = {}
+    for span in spans:
+        traces.setdefault(span["trace_id" if "trace_id" in span else "traceId"], []).append(span)
+    ok = True
+    for members in traces.values():
+        by_id = {span[id_key]: span for span in members}
+        roots = [span for span in members if not span.get(parent_key)]
+        orphans = [span for span in members if span.get(parent_key) and span[parent_key] not in by_id]
+        engine = [span for span in members if span[name_key] == "engine.similarity"]
+        ok = ok and len(roots) == 1 and not orphans and len(engine) == 1 \
+            and by_id[engine[0][parent_key]][name_key] == "EngineRegistry.generate"
+    return len(traces), ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--port", type=int, default=4318)
+    args = parser.parse_args()
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 800), (200, 30, 45)).save(buffer, "JPEG")
+    image = buffer.getvalue()
+
+    collector = HTTPServer(("127.0.0.1", args.port), Collector)
+    threading.Thread(target=collector.serve_forever, daemon=True).start()
+
+    conn = get_connection()
+    try:
+        user_id = setup(conn, 0)
+        token = create_access_token({"sub": str(user_id)})
+        with TestClient(app) as client, tempfile.TemporaryDirectory() as directory:
+            middleware = tracing_middleware(client)
+            post_uploads(client, token, image, 20)
+
+            # Count the instrumentation points one upload passes through
+            calls = [0]
+            original = tracing.span
+
+            def counting(name, **attributes):
+                calls[0] += 1
+                return original(name, **attributes)
+
+            tracing.span = counting
+            middleware.sample_rate = 0.0
+            post_uploads(client, token, image, 1)
+            tracing.span = original
+            started = time.perf_counter()
+            for _ in range(100000):
+                with tracing.span("bench", key=1):
+                    pass
+            off_ns = (time.perf_counter() - started) / 100000 * 1e9
+
+            results = {}
+            exporter = tracing.get_exporter()
+            for label, rate, kind in (("off", 0.0, None), ("sampled, file", 1.0, "file"),
+                                      ("sampled, OTLP", 1.0, "otlp"), ("off again", 0.0, None)):
+                middleware.sample_rate = rate
+                if kind:
+                    exporter.kind = kind
+                    exporter.path = os.path.join(directory, "traces.jsonl")
+                    exporter.endpoint = f"http://127.0.0.1:{args.port}/v1/traces"
+                results[label] = post_uploads(client, token, image, args.uploads)
+                exporter.flush()
+
+            with open(os.path.join(directory, "traces.jsonl")) as f:
+                file_spans = [json.loads(line) for line in f]
+
+        off = statistics.median(results["off"] + results["off again"])
+        print(f"{args.uploads} uploads per run, median ms:")
+        for label, timings in results.items():
+            print(f"  {label:16}{statistics.median(timings):8.2f}")
+        print(f"sampling off: {calls[0]} span() calls per upload x {off_ns:.0f} ns = "
+              f"{calls[0] * off_ns / 1000:.1f} us, {calls[0] * off_ns / 1e6 / off * 100:.3f}% of {off:.2f} ms")
+        traces, ok = check_trees(file_spans, "parent_span_id", "span_id", "name")
+        print(f"file: {len(file_spans)} spans in {traces} traces, trees intact: {ok}")
+        traces, ok = check_trees(Collector.spans, "parentSpanId", "spanId", "name")
+        print(f"OTLP collector: {len(Collector.spans)} spans in {traces} traces, trees intact: {ok}")
+        print(f"exporter: {exporter.to_dict()}")
+
+        sample = [span for span in file_spans if span["trace_id"] == file_spans[-1]["trace_id"]]
+        print("slowest spans of one traced upload:")
+        for span in sorted(sample, key=lambda span: -span["duration_ms"])[:8]:
+            print(f"  {span['name']:42}{span['duration_ms']:8.3f} ms")
+    finally:
+        collector.shutdown()
+        teardown(conn)
+        conn.close()
+        _uploads_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Maintenance jobs for the Boutique Suggestion API
+
+Usage:
+    python jobs.py refresh-related [--rebuild]
+    python jobs.py normalize-suggestions [--batch-size N]
+    python jobs.py rebuild-rollups
+    python jobs.py build-sketches [--days N]
+    python jobs.py export-snapshot [--dir DIR]
+"""
+
+import argparse
+from datetime import date, timedelta
+from app.core.database import get_connection
+from app.services.analytics_service import AnalyticsService
+from app.services.recommendation_service import RecommendationService
+from app.services.rollup_service import RollupService
+from app.services.snapshot_service import SnapshotService
+from app.services.upload_service import DesignSuggestionService
+
+
+def refresh_related(conn, args):
+    """Refresh the "saved this also saved" neighbor table"""
+    if args.rebuild:
+        RecommendationService.rebuild_cooccurrence(conn)
+        print("Co-occurrence matrix rebuilt from saved designs")
+    if RecommendationService.refresh_neighbors(conn):
+        print("Related designs refreshed")
+    else:
+        print("Another worker is refreshing related designs, skipped")
+
+
+def normalize_suggestions(conn, args):
+    """Backfill catalog-identical suggestions to template references"""
+    DesignSuggestionService.sync_templates(conn)
+    count = DesignSuggestionService.normalize_existing(conn, args.batch_size)
+    print(f"Normalized {count} suggestions")
+
+
+def rebuild_rollups(conn, args):
+    """Recompute the admin dashboard upload rollups from uploads"""
+    drift = RollupService.rebuild(conn)
+    print(f"Upload rollups rebuilt ({drift} daily rows were out of date)")
+
+
+def build_sketches(conn, args):
+    """Build the per-day analytics sketches of the last N days"""
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    if AnalyticsService.build(conn, start, end):
+        print(f"Analytics sketches built for {start} to {end}")
+    else:
+        print("Another worker is building analytics sketches, skipped")
+
+
+def export_snapshot(conn, args):
+    """Write a Parquet snapshot of uploads, suggestions and saves, partitioned by month"""
+    manifest = SnapshotService.write(conn, args.dir, args.batch_size)
+    if manifest is None:
+        print("Another worker is writing a snapshot, skipped")
+        return
+    for table, counts in manifest["tables"].items():
+        print(f"{table}: {counts['rows']} rows in {len(counts['months'])} month partitions")
+    print(f"Snapshot {manifest['snapshot']} written")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boutique Suggestion maintenance jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    related = commands.add_parser("refresh-related", help=refresh_related.__doc__)
+    related.add_argument("--rebuild", action="store_true",
+                         help="recompute co-occurrence counts from saved_designs first")
+    related.set_defaults(func=refresh_related)
+
+    normalize = commands.add_parser("normalize-suggestions", help=normalize_suggestions.__doc__)
+    normalize.add_argument("--batch-size", type=int, default=1000)
+    normalize.set_defaults(func=normalize_suggestions)
+
+    rollups = commands.add_parser("rebuild-rollups", help=rebuild_rollups.__doc__)
+    rollups.set_defaults(func=rebuild_rollups)
+
+    sketches = commands.add_parser("build-sketches", help=build_sketches.__doc__)
+    sketches.add_argument("--days", type=int, default=365,
+                          help="days to (re)build, ending today")
+    sketches.set_defaults(func=build_sketches)
+
+    snapshot = commands.add_parser("export-snapshot", help=export_snapshot.__doc__)
+    snapshot.add_argument("--dir", help="output directory (default SNAPSHOT_DIR)")
+    snapshot.add_argument("--batch-size", type=int, help="rows per cursor fetch (default SNAPSHOT_BATCH_SIZE)")
+    snapshot.set_defaults(func=export_snapshot)
+
+    args = parser.parse_args()
+    conn = get_connection()
+    try:
+        args.func(conn, args)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import get_settings
-from app.core.database import init_db
-from app.routes import auth, upload, design_suggestion, admin
+from app.core.database import init_db, get_connection
+from app.core import scheduler
+from app.core.compression import CompressionMiddleware
+from app.core.admission import AdmissionControlMiddleware, get_limiters
+from app.core.live_events import get_broadcaster
+from app.core.metrics import REGISTRY, MetricsMiddleware, monitor_event_loop
+from app.core.tracing import TracingMiddleware, get_exporter
+from app.routes import auth, upload, design_suggestion, admin, dashboard
+from app.services.recommendation_service import RecommendationService
+from app.services.upload_service import DesignSuggestionService
+from app.services.trending_service import get_trend_tracker
+from app.services.analytics_service import AnalyticsService
+from app.services.snapshot_service import SnapshotService
 import os
 import uvicorn
 
 settings = get_settings()
 
-# Initialize database tables
+# Initialize database tables and mirror the template catalog
 try:
     init_db()
+    conn = get_connection()
+    try:
+        DesignSuggestionService.sync_templates(conn)
+    finally:
+        conn.close()
 except Exception as e:
     print(f"Database initialization error: {e}")
 
@@ -19,9 +37,13 @@ except Exception as e:
 app = FastAPI(
     title="Boutique Suggestion API",
     description="AI-powered boutique design suggestion system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Admission control (added before CORS so shed 503s still carry CORS headers)
+app.add_middleware(AdmissionControlMiddleware, limiters=get_limiters())
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,19 +51,74 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "X-Cache"],
+)
+
+# Compression (added after CORS so it wraps the final response)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    offload_size=settings.compression_offload_size,
+    cache_bytes=settings.compression_cache_bytes,
 )
 
+# Request tracing (root span around everything but the metrics)
+app.add_middleware(TracingMiddleware, sample_rate=settings.tracing_sample_rate)
+
+# Request metrics (outermost, so latency includes admission queueing)
+app.add_middleware(MetricsMiddleware, router=app.router)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(upload.router)
 app.include_router(design_suggestion.router)
 app.include_router(admin.router)
+app.include_router(dashboard.router)
 
 # Static files for uploads
 os.makedirs(settings.uploads_dir, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=settings.uploads_dir), name="uploads")
 
 
+@app.on_event("startup")
+async def start_background_jobs():
+    """Start periodic maintenance jobs"""
+    scheduler.schedule(
+        "refresh-related",
+        settings.related_refresh_interval_seconds,
+        RecommendationService.refresh_neighbors
+    )
+    scheduler.schedule(
+        "refresh-trending",
+        settings.trending_refresh_interval_seconds,
+        get_trend_tracker().refresh
+    )
+    scheduler.schedule(
+        "refresh-sketches",
+        settings.analytics_refresh_interval_seconds,
+        AnalyticsService.refresh
+    )
+    scheduler.schedule(
+        "export-snapshot",
+        settings.snapshot_interval_seconds,
+        SnapshotService.write
+    )
+    await get_broadcaster().start()
+    REGISTRY.start()
+    app.state.loop_monitor = asyncio.create_task(monitor_event_loop(settings.event_loop_lag_interval_seconds))
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    """Stop periodic maintenance jobs"""
+    scheduler.cancel_all()
+    await get_broadcaster().stop()
+    app.state.loop_monitor.cancel()
+    REGISTRY.stop()
+    if settings.tracing_sample_rate > 0:
+        get_exporter().flush()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint"""
@@ -59,5 +136,11 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus metrics of every worker process"""
+    return PlainTextResponse(REGISTRY.exposition(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
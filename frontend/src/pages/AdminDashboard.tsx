@@ -1,22 +1,77 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { api } from '@/services/api';
-import { DashboardStats, TrendingData } from '@/types';
+import { DashboardDeltas, DashboardStats, TrendingData } from '@/types';
 import { DashboardCharts } from '@/components/DashboardCharts';
 
+// Add pushed upload deltas to the loaded stats (types or occasions seen for
+// the first time are appended)
+const applyDeltas = (stats: DashboardStats, deltas: DashboardDeltas): DashboardStats => {
+  const clothTypes = stats.cloth_types.map((item) => ({ ...item }));
+  const occasions = stats.occasions.map((item) => ({ ...item }));
+  let total = stats.total_uploads;
+  for (const { cloth_type, occasion, count } of deltas.uploads) {
+    total += count;
+    const clothType = clothTypes.find((item) => item.type === cloth_type);
+    if (clothType) clothType.count += count;
+    else clothTypes.push({ type: cloth_type, count });
+    const occasionItem = occasions.find((item) => item.occasion === occasion);
+    if (occasionItem) occasionItem.count += count;
+    else occasions.push({ occasion, count });
+  }
+  return {
+    ...stats,
+    total_uploads: total,
+    cloth_types: clothTypes.filter((item) => item.count > 0),
+    occasions: occasions.filter((item) => item.count > 0),
+  };
+};
+
 export const AdminDashboard: React.FC = () => {
   const [stats, setStats] = useState<DashboardStats | null>(null);
   const [trending, setTrending] = useState<TrendingData | null>(null);
   const [loading, setLoading] = useState(true);
+  const [live, setLive] = useState(false);
+  const [newSaves, setNewSaves] = useState(0);
 
   useEffect(() => {
     loadDashboardData();
   }, []);
 
-  const loadDashboardData = async () => {
+  const onDeltas = useCallback((deltas: DashboardDeltas) => {
+    setStats((current) => (current ? applyDeltas(current, deltas) : current));
+    setNewSaves((current) => current + deltas.saves);
+  }, []);
+
+  // Follow live counter deltas; reconnects after a dropped stream. Every
+  // (re)subscribe and every missed-events resync reloads the stats uncached,
+  // so deltas are never added to a cached snapshot
+  useEffect(() => {
+    const controller = new AbortController();
+    const resync = () => loadDashboardData(true);
+    const follow = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          setLive(true);
+          await api.streamDashboardEvents(onDeltas, resync, controller.signal);
+        } catch (error) {
+          if (controller.signal.aborted) return;
+          console.error('Dashboard event stream failed:', error);
+        }
+        setLive(false);
+        await new Promise((resolve) => setTimeout(resolve, 5000));
+        // Cached is enough while disconnected: reconnecting resyncs uncached
+        if (!controller.signal.aborted) loadDashboardData();
+      }
+    };
+    follow();
+    return () => controller.abort();
+  }, []);
+
+  const loadDashboardData = async (fresh = false) => {
     try {
       const [statsResponse, trendingResponse] = await Promise.all([
-        api.getDashboardStats(),
+        api.getDashboardStats(fresh),
         api.getTrendingData(),
       ]);
       setStats(statsResponse.data);
@@ -35,7 +90,13 @@ export const AdminDashboard: React.FC = () => {
   return (
     <div className="min-h-screen bg-gray-50">
       <div className="max-w-7xl mx-auto px-4 py-8">
-        <h1 className="text-3xl font-bold text-gray-800 mb-8">👨‍💼 Admin Dashboard</h1>
+        <div className="flex items-center justify-between mb-8">
+          <h1 className="text-3xl font-bold text-gray-800">👨‍💼 Admin Dashboard</h1>
+          <span className={`text-sm font-medium ${live ? 'text-green-600' : 'text-gray-400'}`}>
+            {live ? '● Live' : '○ Reconnecting'}
+            {newSaves !== 0 && ` · ${newSaves > 0 ? '+' : ''}${newSaves} saves`}
+          </span>
+        </div>
 
         {/* Key Metrics */}
         <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
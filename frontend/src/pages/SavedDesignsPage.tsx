@@ -2,24 +2,26 @@ import React, { useState, useEffect } from 'react';
 import { Heart, Download } from 'lucide-react';
 import { useAuth } from '@/context/AuthContext';
 import { api } from '@/services/api';
-import { DesignSuggestion } from '@/types';
+import { DesignSuggestion, SavedDesignFeedItem } from '@/types';
 import html2canvas from 'html2canvas';
 import jsPDF from 'jspdf';
 
 export const SavedDesignsPage: React.FC = () => {
   const { user } = useAuth();
-  const [savedDesigns, setSavedDesigns] = useState<DesignSuggestion[]>([]);
+  const [savedDesigns, setSavedDesigns] = useState<SavedDesignFeedItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | undefined>(undefined);
   const [loading, setLoading] = useState(true);
-  const [selectedDesign, setSelectedDesign] = useState<DesignSuggestion | null>(null);
+  const [selectedDesign, setSelectedDesign] = useState<SavedDesignFeedItem | null>(null);
 
   useEffect(() => {
     loadSavedDesigns();
   }, []);
 
-  const loadSavedDesigns = async () => {
+  const loadSavedDesigns = async (cursor?: string) => {
     try {
-      const response = await api.getSavedDesigns();
-      setSavedDesigns(response.data);
+      const response = await api.getSavedDesigns(20, cursor);
+      setSavedDesigns(cursor ? [...savedDesigns, ...response.data] : response.data);
+      setNextCursor(response.headers['x-next-cursor']);
       setLoading(false);
     } catch (error) {
       console.error('Error loading saved designs:', error);
@@ -27,11 +29,11 @@ export const SavedDesignsPage: React.FC = () => {
     }
   };
 
-  const handleUnsave = async (designId: number) => {
+  const handleUnsave = async (design: SavedDesignFeedItem) => {
     try {
-      await api.unsaveDesign(designId);
-      setSavedDesigns(savedDesigns.filter(d => d.id !== designId));
-      if (selectedDesign?.id === designId) {
+      await api.unsaveDesign(design.saved_design_id);
+      setSavedDesigns(savedDesigns.filter(d => d.saved_design_id !== design.saved_design_id));
+      if (selectedDesign?.saved_design_id === design.saved_design_id) {
         setSelectedDesign(null);
       }
     } catch (error) {
@@ -91,10 +93,10 @@ export const SavedDesignsPage: React.FC = () => {
                 <div className="space-y-2">
                   {savedDesigns.map((design) => (
                     <button
-                      key={design.id}
+                      key={design.saved_design_id}
                       onClick={() => setSelectedDesign(design)}
                       className={`w-full text-left p-3 rounded-lg border transition ${
-                        selectedDesign?.id === design.id
+                        selectedDesign?.saved_design_id === design.saved_design_id
                           ? 'bg-red-100 border-red-600'
                           : 'border-gray-200 hover:bg-gray-50'
                       }`}
@@ -104,6 +106,14 @@ export const SavedDesignsPage: React.FC = () => {
                     </button>
                   ))}
                 </div>
+                {nextCursor && (
+                  <button
+                    onClick={() => loadSavedDesigns(nextCursor)}
+                    className="w-full mt-4 text-sm text-red-600 hover:underline"
+                  >
+                    Load more
+                  </button>
+                )}
               </div>
             </div>
 
@@ -129,7 +139,7 @@ export const SavedDesignsPage: React.FC = () => {
                         <Download size={20} />
                       </button>
                       <button
-                        onClick={() => handleUnsave(selectedDesign.id)}
+                        onClick={() => handleUnsave(selectedDesign)}
                         className="p-2 bg-red-100 text-red-600 rounded-lg hover:bg-red-200 transition"
                         title="Remove from Saved"
                       >
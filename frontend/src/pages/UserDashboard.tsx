@@ -3,7 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { Upload, Eye, Download, Heart, Share2 } from 'lucide-react';
 import { useAuth } from '@/context/AuthContext';
 import { api } from '@/services/api';
-import { Upload as UploadType, DesignSuggestion } from '@/types';
+import { Upload as UploadType, DesignSuggestion, DashboardUpload } from '@/types';
 import html2canvas from 'html2canvas';
 import jsPDF from 'jspdf';
 
@@ -23,31 +23,30 @@ export const UserDashboard: React.FC = () => {
   const [budgetRange, setBudgetRange] = useState('3000-8000');
   const [fabricDescription, setFabricDescription] = useState('');
   const [uploading, setUploading] = useState(false);
-  const [savedDesigns, setSavedDesigns] = useState<Set<number>>(new Set());
+  // suggestion id -> saved design id
+  const [savedDesigns, setSavedDesigns] = useState<Map<number, number>>(new Map());
 
   useEffect(() => {
-    loadUploads();
-    loadSavedDesigns();
+    loadDashboard();
   }, []);
 
-  const loadUploads = async () => {
+  // One request for uploads and saved state instead of fanning out per upload
+  const loadDashboard = async () => {
     try {
-      const response = await api.getMyUploads();
-      setUploads(response.data);
-      setLoading(false);
-    } catch (error) {
-      console.error('Error loading uploads:', error);
-      setLoading(false);
-    }
-  };
-
-  const loadSavedDesigns = async () => {
-    try {
-      const response = await api.getSavedDesigns();
-      const saved = new Set(response.data.map((d: DesignSuggestion) => d.id));
+      const response = await api.getDashboard();
+      const items: DashboardUpload[] = response.data.uploads;
+      setUploads(items);
+      const saved = new Map<number, number>();
+      items.forEach((item) => {
+        if (item.latest_suggestion && item.saved_design_id !== null) {
+          saved.set(item.latest_suggestion.id, item.saved_design_id);
+        }
+      });
       setSavedDesigns(saved);
     } catch (error) {
-      console.error('Error loading saved designs:', error);
+      console.error('Error loading dashboard:', error);
+    } finally {
+      setLoading(false);
     }
   };
 
@@ -103,8 +102,8 @@ export const UserDashboard: React.FC = () => {
 
   const handleSaveDesign = async (suggestion: DesignSuggestion) => {
     try {
-      await api.saveDesign(suggestion.id);
-      setSavedDesigns(new Set([...savedDesigns, suggestion.id]));
+      const response = await api.saveDesign(suggestion.id);
+      setSavedDesigns(new Map(savedDesigns).set(suggestion.id, response.data.id));
     } catch (error) {
       console.error('Error saving design:', error);
       alert('Design already saved or error occurred');
@@ -113,8 +112,12 @@ export const UserDashboard: React.FC = () => {
 
   const handleUnsaveDesign = async (suggestion: DesignSuggestion) => {
     try {
-      await api.unsaveDesign(suggestion.id);
-      setSavedDesigns(new Set([...savedDesigns].filter(id => id !== suggestion.id)));
+      const savedDesignId = savedDesigns.get(suggestion.id);
+      if (savedDesignId === undefined) return;
+      await api.unsaveDesign(savedDesignId);
+      const next = new Map(savedDesigns);
+      next.delete(suggestion.id);
+      setSavedDesigns(next);
     } catch (error) {
       console.error('Error unsaving design:', error);
     }
@@ -1,4 +1,5 @@
 import axios, { AxiosInstance } from 'axios';
+import { DashboardDeltas, UploadFilters } from '../types';
 
 class APIClient {
   private client: AxiosInstance;
@@ -70,6 +71,13 @@ class APIClient {
     });
   }
 
+  // Dashboard
+  getDashboard(uploadsLimit: number = 10) {
+    return this.client.get('/dashboard', {
+      params: { uploads_limit: uploadsLimit },
+    });
+  }
+
   // Uploads
   uploadCloth(formData: FormData) {
     return this.client.post('/uploads', formData, {
@@ -79,9 +87,9 @@ class APIClient {
     });
   }
 
-  getMyUploads(skip: number = 0, limit: number = 10) {
+  getMyUploads(skip: number = 0, limit: number = 10, filters: UploadFilters = {}) {
     return this.client.get('/uploads/my-uploads', {
-      params: { skip, limit },
+      params: { skip, limit, ...filters },
     });
   }
 
@@ -98,26 +106,34 @@ class APIClient {
     return this.client.get(`/design-suggestions/${suggestionId}`);
   }
 
+  getRelatedDesigns(suggestionId: number) {
+    return this.client.get(`/design-suggestions/${suggestionId}/related`);
+  }
+
   saveDesign(suggestionId: number) {
     return this.client.post(`/design-suggestions/${suggestionId}/save`);
   }
 
-  getSavedDesigns() {
-    return this.client.get('/design-suggestions/saved/list');
+  // Next page cursor is returned in the X-Next-Cursor response header
+  getSavedDesigns(limit: number = 20, cursor?: string) {
+    return this.client.get('/design-suggestions/saved/list', {
+      params: { limit, cursor },
+    });
   }
 
-  unsaveDesign(suggestionId: number) {
-    return this.client.delete(`/design-suggestions/${suggestionId}/save`);
+  unsaveDesign(savedDesignId: number) {
+    return this.client.delete(`/design-suggestions/${savedDesignId}/save`);
   }
 
   // Admin
-  getDashboardStats() {
-    return this.client.get('/admin/dashboard/stats');
+  // fresh skips the server's analytics cache (needed before applying live deltas)
+  getDashboardStats(fresh = false) {
+    return this.client.get('/admin/dashboard/stats', { params: fresh ? { fresh: true } : undefined });
   }
 
-  getAllUploads(skip: number = 0, limit: number = 10) {
+  getAllUploads(skip: number = 0, limit: number = 10, filters: UploadFilters = {}) {
     return this.client.get('/admin/uploads', {
-      params: { skip, limit },
+      params: { skip, limit, ...filters },
     });
   }
 
@@ -128,6 +144,50 @@ class APIClient {
   getTrendingData() {
     return this.client.get('/admin/trending');
   }
+
+  // Server-sent events over fetch (EventSource cannot send the Authorization
+  // header). Resolves when the stream ends; abort the signal to close it
+  async streamDashboardEvents(
+    onDeltas: (deltas: DashboardDeltas) => void,
+    onResync: () => void,
+    signal: AbortSignal
+  ) {
+    const token = localStorage.getItem('token');
+    const response = await fetch('/api/admin/events', {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+      signal,
+    });
+    if (response.status === 401) {
+      localStorage.removeItem('token');
+      localStorage.removeItem('user');
+      window.location.href = '/login';
+      return;
+    }
+    if (!response.ok || !response.body) {
+      throw new Error(`Event stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) >= 0) {
+        const message = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of message.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        if (event === 'deltas') onDeltas(JSON.parse(data));
+        else if (event === 'resync') onResync();
+      }
+    }
+  }
 }
 
 export const api = new APIClient();
@@ -36,6 +36,15 @@ export interface Upload {
   created_at: string;
 }
 
+// Upload listing filters; dates are inclusive YYYY-MM-DD
+export interface UploadFilters {
+  cloth_type?: ClothType;
+  occasion?: Occasion;
+  budget_range?: BudgetRange;
+  created_from?: string;
+  created_to?: string;
+}
+
 export interface DesignSuggestion {
   id: number;
   upload_id: number;
@@ -47,9 +56,43 @@ export interface DesignSuggestion {
   border_style: string;
   description: string;
   confidence_score: string;
+  template_id?: string | null;
   created_at: string;
 }
 
+export interface DashboardUpload extends Upload {
+  file_path: string;
+  size_info?: string | null;
+  latest_suggestion: DesignSuggestion | null;
+  saved_design_id: number | null;
+}
+
+export interface SavedDesignFeedItem extends DesignSuggestion {
+  saved_design_id: number;
+  saved_at: string;
+  upload: {
+    id: number;
+    file_path: string;
+    cloth_type: ClothType;
+    occasion: Occasion;
+    gender: Gender;
+    age_group: AgeGroup;
+    budget_range: BudgetRange;
+    size_info?: string | null;
+    created_at: string;
+  };
+}
+
+export interface RelatedDesign {
+  template_id: string;
+  neck_design: string;
+  sleeve_style: string;
+  embroidery_pattern: string;
+  color_combination: string;
+  border_style: string;
+  score: number;
+}
+
 export interface SavedDesign {
   id: number;
   user_id: number;
@@ -61,6 +104,15 @@ export interface DashboardStats {
   total_uploads: number;
   cloth_types: Array<{ type: string; count: number }>;
   occasions: Array<{ occasion: string; count: number }>;
+  genders: Array<{ gender: string; count: number }>;
+  budget_ranges: Array<{ budget_range: string; count: number }>;
+  daily_uploads: Array<{ day: string; count: number }>;
+}
+
+// Pushed by /admin/events; counts are negative after deletes
+export interface DashboardDeltas {
+  uploads: Array<{ cloth_type: string; occasion: string; count: number }>;
+  saves: number;
 }
 
 export interface TrendingData {
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Test design suggestion generation"""
 
+import os
 import sys
-sys.path.insert(0, '/Users/bpantala/Desktop/suprith/botique-suggestion-app/backend')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
 
 from app.models.upload import Upload
 from app.services.design_suggestion_service import DesignSuggestionEngine